@@ -0,0 +1,114 @@
+"""
+Compare resolving and rendering dimensions (thread size, material, finish, category) from Postgres with the
+two-tier dimension cache, reporting queries and wall time of:
+
+- standardizing the dimension columns of CSV rows, with a get_or_create() or upsert per row, or cache lookups;
+- serializing the fastener list, joining the dimensions with select_related() or attaching cached rows.
+
+Everything runs inside a transaction that is rolled back at the end, so the benchmark leaves no data behind.
+
+    python -m benchmarks.bench_dimension_cache --rows 5000 --fasteners 50000
+"""
+import argparse
+import time
+from benchmarks.common import print_table, setup_django
+from benchmarks.bench_offboard import seed
+
+MATERIALS = ['Steel', 'Stainless Steel', 'Brass', 'Nylon', 'Aluminum']
+THREAD_SIZES = ['M6-1', 'M8-1.25', 'M10-1.5', '1/4-20', '3/8-16']
+
+
+def standardize(rows):
+    from fastener_app.standardizers import (
+        standardize_category, standardize_finish, standardize_material, standardize_thread_size,
+    )
+
+    for row in rows:
+        standardized = {}
+        standardize_thread_size(row, standardized)
+        standardize_material(row, standardized)
+        standardize_finish(row, standardized)
+        standardize_category(row, standardized)
+
+
+def list_joined(fieldset):
+    from fastener_app.models import Fastener
+    from fastener_app.serializers import FastenerSerializer
+
+    fasteners = Fastener.objects.select_related('thread_size', 'material', 'finish', 'category').order_by('id')
+    return len(FastenerSerializer(fasteners, many=True, fields=fieldset).data)
+
+
+def list_cached(fieldset):
+    from fastener_app.dimension_cache import get_dimension_cache
+    from fastener_app.models import Fastener
+    from fastener_app.serializers import FastenerSerializer
+
+    dimensions = ['thread_size', 'material', 'finish', 'category']
+    fasteners = get_dimension_cache().attach(Fastener.objects.order_by('id'), dimensions)
+    return len(FastenerSerializer(fasteners, many=True, fields=fieldset).data)
+
+
+def measure_queries(func, *args):
+    from django.db import connection
+
+    queries = []
+    start = time.perf_counter()
+    with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+        func(*args)
+    return len(queries), f"{time.perf_counter() - start:.2f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=5000, help="CSV rows standardized")
+    parser.add_argument('--fasteners', type=int, default=50_000, help="Fasteners listed")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import transaction
+    from fastener_app.catalog_version import bump_dimension_version
+    from fastener_app.dimension_cache import get_dimension_cache
+
+    rows = [
+        {'thread_size': THREAD_SIZES[index % len(THREAD_SIZES)], 'material': MATERIALS[index % len(MATERIALS)],
+         'finish': 'Plain', 'category': 'Hex Bolt'}
+        for index in range(args.rows)
+    ]
+    results = []
+    with transaction.atomic():
+        seed(args.fasteners)
+        # Create the dimensions of the rows, as an earlier ingest would have
+        standardize(rows[:len(MATERIALS) * len(THREAD_SIZES)])
+        dimension_cache = get_dimension_cache()
+
+        # A cache that never finds anything falls back to the database for every row, as before the cache
+        dimension_cache.lookup = lambda dimension, key: None
+        results.append(('standardize, database', *measure_queries(standardize, rows)))
+        del dimension_cache.lookup
+        bump_dimension_version()
+        dimension_cache.reset()
+        results.append(('standardize, cold cache', *measure_queries(standardize, rows)))
+        results.append(('standardize, warm cache', *measure_queries(standardize, rows)))
+
+        results.append(('list, select_related()', *measure_queries(list_joined, None)))
+        bump_dimension_version()
+        dimension_cache.reset()
+        results.append(('list, cold cache', *measure_queries(list_cached, None)))
+        results.append(('list, warm cache', *measure_queries(list_cached, None)))
+        # A new worker at the same version reads the tables from the shared cache
+        dimension_cache.reset()
+        results.append(('list, shared cache', *measure_queries(list_cached, None)))
+        stats = dimension_cache.stats()
+        transaction.set_rollback(True)
+    # The cached tables hold rolled back rows
+    bump_dimension_version()
+
+    print(f"Standardizing {args.rows} rows and listing {args.fasteners} fasteners")
+    print_table(('case', 'queries', 'wall s'), results)
+    print(f"Last worker: hit ratio {stats['hit_ratio']:.4f}, {stats['shared_hits']} shared hits, "
+          f"{stats['loads']} loads")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,111 @@
+"""
+Replay a mix of category-filtered GET /fasteners/ requests under a steady drip of single-row uploads and
+compare no result cache, a cache that every upload flushes entirely and the tag-based list cache, reporting
+the hit ratio and requests per second.
+
+An upload changes the description of one fastener of a random category and invalidates the cache as the
+ingest view does once it commits. Everything runs inside a transaction that is rolled back at the end, so the
+benchmark leaves no data behind.
+
+    python -m benchmarks.bench_list_cache --categories 20 --fasteners 200 --requests 2000 --upload-every 10
+"""
+import argparse
+import random
+import time
+from unittest.mock import patch
+from benchmarks.common import api_client, print_table, setup_django
+
+
+def seed(categories, fasteners):
+    from django.db import connection
+    from fastener_app.models import Category, Fastener, Finish, Material, ThreadSize
+
+    material = Material.objects.create(name='Bench Material')
+    finish = Finish.objects.create(name='Bench Finish')
+    thread_size = ThreadSize.objects.create(name='M99-1', metric_size_str='M99-1', metric_size_num=99,
+                                            thread_per_unit=1)
+    category_ids = [Category.objects.create(name=f'Bench Category {index}').id for index in range(categories)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {connection.ops.quote_name(Fastener._meta.db_table)} "
+            f"(product_id, description, thread_size_id, material_id, finish_id, category_id) "
+            f"SELECT 'L' || i, 'BENCH FASTENER ' || i, %s, %s, %s, (%s::bigint[])[1 + i %% %s] "
+            f"FROM generate_series(1, %s) i",
+            [thread_size.id, material.id, finish.id, category_ids, categories, categories * fasteners],
+        )
+    return category_ids
+
+
+def upload(category_ids, rng, invalidate):
+    """
+    Change one fastener of a random category and invalidate the cache with `invalidate(facet keys)`.
+    """
+    from django.db.models import Value
+    from django.db.models.functions import Concat
+    from fastener_app.facets import FACET_FIELDS
+    from fastener_app.models import Fastener
+
+    fastener = Fastener.objects.filter(category_id=rng.choice(category_ids)).order_by('?').first()
+    Fastener.objects.filter(id=fastener.id).update(description=Concat('description', Value('.')))
+    invalidate({tuple(getattr(fastener, f"{field}_id") for field in FACET_FIELDS)})
+
+
+def run(client, category_ids, args, invalidate):
+    from django.urls import reverse
+
+    rng = random.Random(0)
+    start = time.perf_counter()
+    for step in range(1, args.requests + 1):
+        if step % args.upload_every == 0:
+            upload(category_ids, rng, invalidate)
+        name = f'bench category {rng.randrange(len(category_ids))}'
+        response = client.get(reverse('fastener-list'), {'filter': f'category:{name}', 'fields': 'id,product_id'})
+        assert response.status_code == 200
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--categories', type=int, default=20)
+    parser.add_argument('--fasteners', type=int, default=200, help="Fasteners per category")
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--upload-every', type=int, default=10, help="Requests between two uploads")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.conf import settings
+    from django.db import transaction
+    from fastener_app.catalog_version import bump_dimension_version
+    from fastener_app.list_cache import change_tags, entry_tags, get_list_cache, invalidate_tags
+
+    client = api_client()
+    strategies = [
+        ('no result cache', False, lambda keys: None, entry_tags),
+        # Every entry carries one global tag that every upload bumps
+        ('flush all on upload', True, lambda keys: invalidate_tags({'global'}), lambda *args, **kwargs: ['global']),
+        ('tag-based', True, lambda keys: invalidate_tags(change_tags(keys)), entry_tags),
+    ]
+    results = []
+    with transaction.atomic():
+        category_ids = seed(args.categories, args.fasteners)
+        for name, enabled, invalidate, tags in strategies:
+            settings.LIST_CACHE_ENABLED = enabled
+            # A new dimension version starts every strategy with an empty cache
+            bump_dimension_version()
+            get_list_cache().reset()
+            with patch('fastener_app.views.fastener.entry_tags', tags):
+                wall = run(client, category_ids, args, invalidate)
+            stats = get_list_cache().stats()
+            hit_ratio = f"{stats['hit_ratio']:.3f}" if enabled else '-'
+            results.append((name, hit_ratio, stats['stale'], f"{args.requests / wall:.0f}"))
+        transaction.set_rollback(True)
+    # The cached tables and lists hold rolled back rows
+    bump_dimension_version()
+
+    print(f"{args.requests} requests over {args.categories} categories of {args.fasteners} fasteners, "
+          f"an upload every {args.upload_every} requests")
+    print_table(('strategy', 'hit ratio', 'stale', 'requests/s'), results)
+
+
+if __name__ == '__main__':
+    main()
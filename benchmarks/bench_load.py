@@ -0,0 +1,77 @@
+"""
+Closed-loop load test of a running deployment: `--concurrency` clients each send requests back to back
+for `--duration` seconds and the throughput and latency percentiles are reported per URL.
+
+Compare the sync list under WSGI with the async list under ASGI at equal worker counts, e.g.
+
+    gunicorn -w 2 -b 127.0.0.1:8001 fastener_manager.wsgi
+    gunicorn -w 2 -k uvicorn.workers.UvicornWorker -b 127.0.0.1:8002 fastener_manager.asgi
+    python -m benchmarks.bench_load --concurrency 64 \\
+        http://127.0.0.1:8001/fasteners/?fields=product_id http://127.0.0.1:8002/async/fasteners/?fields=product_id
+"""
+import argparse
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from benchmarks.common import print_table
+
+
+def run_client(url, deadline, timeout):
+    latencies, errors = [], 0
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=timeout) as response:
+                response.read()
+        except (urllib.error.URLError, OSError):
+            errors += 1
+        else:
+            latencies.append(time.perf_counter() - start)
+    return latencies, errors
+
+
+def load(url, concurrency, duration, timeout):
+    """
+    Return (requests per second, p50 ms, p95 ms, p99 ms, errors) for `concurrency` clients hitting url.
+    """
+    barrier = threading.Barrier(concurrency)
+
+    def client():
+        barrier.wait()
+        return run_client(url, time.perf_counter() + duration, timeout)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(lambda _: client(), range(concurrency)))
+
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    errors = sum(client_errors for _, client_errors in results)
+    if len(latencies) < 2:
+        return 0, '-', '-', '-', errors
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    return (
+        f"{len(latencies) / duration:.0f}",
+        f"{percentiles[49] * 1000:.1f}",
+        f"{percentiles[94] * 1000:.1f}",
+        f"{percentiles[98] * 1000:.1f}",
+        errors,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('urls', nargs='+')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--timeout', type=float, default=30.0)
+    args = parser.parse_args()
+
+    results = [(url, *load(url, args.concurrency, args.duration, args.timeout)) for url in args.urls]
+    print_table(('url', 'req/s', 'p50 ms', 'p95 ms', 'p99 ms', 'errors'), results)
+
+
+if __name__ == '__main__':
+    main()
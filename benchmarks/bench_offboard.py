@@ -0,0 +1,87 @@
+"""
+Compare deleting a seller with many offers through the ORM cascade (Seller.delete()) with offboard_seller(),
+reporting wall time, queries and the peak Python memory of each.
+
+Each run seeds one seller offering every fastener of a synthetic catalog with generate_series, inside a
+transaction that is rolled back at the end, so the benchmark leaves no data behind.
+
+    python -m benchmarks.bench_offboard --offers 200000
+"""
+import argparse
+import time
+import tracemalloc
+from benchmarks.common import print_table, setup_django
+
+
+def seed(offers):
+    from django.db import connection
+    from fastener_app.models import Category, Fastener, Finish, Material, Seller, SellerFastener, ThreadSize
+    from fastener_app.offers import refresh_best_offers
+
+    def table(model):
+        return connection.ops.quote_name(model._meta.db_table)
+
+    material = Material.objects.create(name='Bench Material')
+    finish = Finish.objects.create(name='Bench Finish')
+    category = Category.objects.create(name='Bench Category')
+    thread_size = ThreadSize.objects.create(name='M99-1', metric_size_str='M99-1', metric_size_num=99, thread_per_unit=1)
+    seller = Seller.objects.create(name='Bench Seller', contact_email='bench@example.com')
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table(Fastener)} (product_id, description, thread_size_id, material_id, finish_id, category_id) "
+            f"SELECT 'B' || i, 'BENCH FASTENER ' || i, %s, %s, %s, %s FROM generate_series(1, %s) i",
+            [thread_size.id, material.id, finish.id, category.id, offers],
+        )
+        cursor.execute(
+            f"INSERT INTO {table(SellerFastener)} (seller_id, fastener_id, price, quantity, last_updated) "
+            f"SELECT %s, f.id, round((random() * 100)::numeric, 2), (random() * 1000)::int, now() "
+            f"FROM {table(Fastener)} f WHERE f.product_id LIKE 'B%%'",
+            [seller.id],
+        )
+        cursor.execute(f"ANALYZE {table(SellerFastener)}")
+    refresh_best_offers()
+    return seller
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--offers', type=int, default=200_000)
+    parser.add_argument('--batch-size', type=int, default=10_000)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection, transaction
+    from fastener_app.offboarding import offboard_seller
+
+    strategies = [
+        # Leaves the best offers of the seller's fasteners stale
+        ('Seller.delete()', lambda seller: seller.delete()),
+        ('offboard_seller()', lambda seller: offboard_seller(seller.id, batch_size=args.batch_size)),
+    ]
+    results = []
+    for name, delete in strategies:
+        # Time without tracing, then trace a second run for the peak memory, as tracing slows Python down
+        with transaction.atomic():
+            seller = seed(args.offers)
+            queries = []
+            start = time.perf_counter()
+            with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+                delete(seller)
+            wall = time.perf_counter() - start
+            transaction.set_rollback(True)
+        with transaction.atomic():
+            seller = seed(args.offers)
+            tracemalloc.start()
+            delete(seller)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            transaction.set_rollback(True)
+        results.append((name, len(queries), f"{wall:.2f}", f"{peak / 2 ** 20:.1f}"))
+
+    print(f"Deleting a seller with {args.offers} offers")
+    print_table(('strategy', 'queries', 'wall s', 'peak MB'), results)
+
+
+if __name__ == '__main__':
+    main()
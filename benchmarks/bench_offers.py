@@ -0,0 +1,89 @@
+"""
+Time GET /fasteners/<id>/offers/, GET /fasteners/?offers=true and GET /fasteners/?sort=price:asc against a
+seeded catalog.
+
+Sellers, fasteners and their offers are generated with generate_series in the configured database
+inside a transaction that is rolled back at the end, so the benchmark leaves no data behind.
+
+    python -m benchmarks.bench_offers --sellers 100 --fasteners 10000    # 1M offers
+"""
+import argparse
+import random
+from benchmarks.common import api_client, measure, print_table, setup_django
+
+
+def seed(sellers, fasteners):
+    from django.db import connection
+    from fastener_app.models import Category, Fastener, Finish, Material, Seller, SellerFastener, ThreadSize
+    from fastener_app.offers import refresh_best_offers
+
+    def table(model):
+        return connection.ops.quote_name(model._meta.db_table)
+
+    material = Material.objects.create(name='Bench Material')
+    finish = Finish.objects.create(name='Bench Finish')
+    category = Category.objects.create(name='Bench Category')
+    thread_size = ThreadSize.objects.create(name='M99-1', metric_size_str='M99-1', metric_size_num=99, thread_per_unit=1)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table(Seller)} (name, contact_email, csv_mapping) "
+            f"SELECT 'Bench Seller ' || i, 'bench' || i || '@example.com', '{{}}' FROM generate_series(1, %s) i",
+            [sellers],
+        )
+        cursor.execute(
+            f"INSERT INTO {table(Fastener)} (product_id, description, thread_size_id, material_id, finish_id, category_id) "
+            f"SELECT 'B' || i, 'BENCH FASTENER ' || i, %s, %s, %s, %s FROM generate_series(1, %s) i",
+            [thread_size.id, material.id, finish.id, category.id, fasteners],
+        )
+        cursor.execute(
+            f"INSERT INTO {table(SellerFastener)} (seller_id, fastener_id, price, quantity, last_updated) "
+            f"SELECT s.id, f.id, round((random() * 100)::numeric, 2), (random() * 1000)::int, now() "
+            f"FROM {table(Seller)} s CROSS JOIN {table(Fastener)} f "
+            f"WHERE s.name LIKE 'Bench Seller %%' AND f.product_id LIKE 'B%%'"
+        )
+        cursor.execute(f"ANALYZE {table(SellerFastener)}")
+    refresh_best_offers()
+    return list(Fastener.objects.filter(product_id__startswith='B').values_list('id', flat=True))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sellers', type=int, default=100)
+    parser.add_argument('--fasteners', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection, transaction
+
+    client = api_client()
+    with transaction.atomic():
+        fastener_ids = seed(args.sellers, args.fasteners)
+        print(f"Seeded {args.sellers} sellers x {len(fastener_ids)} fasteners")
+
+        def offers():
+            return client.get(f"/fasteners/{random.choice(fastener_ids)}/offers/")
+
+        def offer_list():
+            return client.get('/fasteners/', {'offers': 'true', 'fields': 'product_id,min_price,seller_count'})
+
+        def price_list():
+            return client.get('/fasteners/', {'sort': 'price:asc', 'fields': 'product_id'})
+
+        results = []
+        for name, func, repeat in [('offers', offers, args.repeat), ('list?offers=true', offer_list, 3),
+                                   ('list?sort=price', price_list, 3)]:
+            queries = []
+            with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+                func()
+            cpu, wall, response = measure(func, repeat=repeat)
+            results.append((name, response.status_code, len(queries),
+                            f"{cpu * 1000:.1f}", f"{wall * 1000:.1f}"))
+
+        print_table(('endpoint', 'status', 'queries', 'cpu ms', 'wall ms'), results)
+        transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Time "price as of T" and "price series" lookups on a seeded price history spread over twelve monthly partitions.
+
+Sellers, fasteners and their history are generated with generate_series in the configured database inside a
+transaction that is rolled back at the end, so the benchmark leaves no data behind.
+
+    python -m benchmarks.bench_price_history --sellers 100 --fasteners 1000 --changes 12    # 1.2M rows
+"""
+import argparse
+import datetime
+import random
+from benchmarks.common import api_client, measure, print_table, setup_django
+
+START = datetime.datetime(2025, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def seed(sellers, fasteners, changes):
+    from django.db import connection
+    from fastener_app.models import Category, Fastener, Finish, Material, PriceHistory, Seller, ThreadSize
+    from fastener_app.price_history import ensure_price_history_partition
+
+    def table(model):
+        return connection.ops.quote_name(model._meta.db_table)
+
+    material = Material.objects.create(name='Bench Material')
+    finish = Finish.objects.create(name='Bench Finish')
+    category = Category.objects.create(name='Bench Category')
+    thread_size = ThreadSize.objects.create(name='M99-1', metric_size_str='M99-1', metric_size_num=99, thread_per_unit=1)
+    for month in range(12):
+        ensure_price_history_partition(START + datetime.timedelta(days=31 * month))
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table(Seller)} (name, contact_email, csv_mapping, mapping_version) "
+            f"SELECT 'Bench Seller ' || i, 'bench' || i || '@example.com', '{{}}', 0 FROM generate_series(1, %s) i",
+            [sellers],
+        )
+        cursor.execute(
+            f"INSERT INTO {table(Fastener)} (product_id, description, thread_size_id, material_id, finish_id, category_id) "
+            f"SELECT 'B' || i, 'BENCH FASTENER ' || i, %s, %s, %s, %s FROM generate_series(1, %s) i",
+            [thread_size.id, material.id, finish.id, category.id, fasteners],
+        )
+        # `changes` price changes per offer at random times of the year
+        cursor.execute(
+            f"INSERT INTO {table(PriceHistory)} (seller_id, fastener_id, price, quantity, valid_from) "
+            f"SELECT s.id, f.id, round((random() * 100)::numeric, 2), (random() * 1000)::int, "
+            f"%s::timestamptz + random() * interval '360 days' "
+            f"FROM {table(Seller)} s CROSS JOIN {table(Fastener)} f CROSS JOIN generate_series(1, %s) "
+            f"WHERE s.name LIKE 'Bench Seller %%' AND f.product_id LIKE 'B%%'",
+            [START, changes],
+        )
+        cursor.execute(f"ANALYZE {table(PriceHistory)}")
+    seller_ids = list(Seller.objects.filter(name__startswith='Bench Seller').values_list('id', flat=True))
+    fastener_ids = list(Fastener.objects.filter(product_id__startswith='B').values_list('id', flat=True))
+    return seller_ids, fastener_ids
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sellers', type=int, default=100)
+    parser.add_argument('--fasteners', type=int, default=1000)
+    parser.add_argument('--changes', type=int, default=12)
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection, transaction
+    from fastener_app.models import PriceHistory
+
+    client = api_client()
+    with transaction.atomic():
+        seller_ids, fastener_ids = seed(args.sellers, args.fasteners, args.changes)
+        print(f"Seeded {len(seller_ids) * len(fastener_ids) * args.changes} price history rows")
+
+        def as_of():
+            moment = START + datetime.timedelta(days=random.uniform(0, 365))
+            return client.get(f"/fasteners/{random.choice(fastener_ids)}/price-history/as-of",
+                              {'seller': random.choice(seller_ids), 'at': moment.isoformat()})
+
+        def series():
+            return client.get(f"/fasteners/{random.choice(fastener_ids)}/price-history/",
+                              {'seller': random.choice(seller_ids)})
+
+        results = []
+        for name, func in [('as-of', as_of), ('series (one seller)', series)]:
+            queries = []
+            with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+                func()
+            cpu, wall, response = measure(func, repeat=args.repeat)
+            results.append((name, response.status_code, len(queries), f"{cpu * 1000:.2f}", f"{wall * 1000:.2f}"))
+        print_table(('endpoint', 'status', 'queries', 'cpu ms', 'wall ms'), results)
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"EXPLAIN ANALYZE SELECT * FROM {connection.ops.quote_name(PriceHistory._meta.db_table)} "
+                f"WHERE seller_id = %s AND fastener_id = %s AND valid_from <= %s ORDER BY valid_from DESC LIMIT 1",
+                [seller_ids[0], fastener_ids[0], START + datetime.timedelta(days=200)],
+            )
+            print('\n'.join(row[0] for row in cursor.fetchall()))
+        transaction.set_rollback(True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""
+Compare payload size and server CPU time of the GET /fasteners/ encodings against JSONRenderer.
+
+JSON and MessagePack go through FastenerSerializer like the view does; CSV and Arrow are fed the
+tuples values_list() would return. No database is needed: the rows are synthetic.
+
+    python -m benchmarks.bench_renderers --rows 100000
+"""
+import argparse
+from benchmarks.common import measure, print_table, setup_django
+
+
+def build_fasteners(count):
+    from fastener_app.models import Category, Fastener, Finish, Material, ThreadSize
+
+    materials = [Material(id=i, name=f"Material {i}") for i in range(1, 21)]
+    finishes = [Finish(id=i, name=f"Finish {i}") for i in range(1, 11)]
+    categories = [Category(id=i, name=f"Category {i}") for i in range(1, 31)]
+    thread_sizes = [
+        ThreadSize(id=i, name=f"M{i}-1.5", thread_type='metric', unit='millimeter', metric_size_str=f"M{i}-1.5",
+                   metric_size_num=float(i), imperial_size_str='1/4-20', imperial_size_num=0.25, thread_per_unit=1.5)
+        for i in range(1, 41)
+    ]
+    return [
+        Fastener(
+            id=i, product_id=f"F{i:07}", description=f"M{i % 40 + 1}/1.5 X {i % 300} HCS DIN 931 10.9 PLN",
+            thread_size=thread_sizes[i % 40], material=materials[i % 20], finish=finishes[i % 10],
+            category=categories[i % 30],
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from rest_framework.renderers import JSONRenderer
+    from fastener_app.renderers import ArrowRenderer, ColumnarData, CSVRenderer, MessagePackRenderer
+    from fastener_app.serializers import FastenerSerializer
+    from fastener_app.views import FastenerListView
+
+    fasteners = build_fasteners(args.rows)
+
+    # Column names and tuples as FastenerListView.get_columnar_data would read them with values_list()
+    view = FastenerListView()
+    nested = view.get_nested_serializers()
+    names = [
+        f"{field}.{subfield}" if field in nested else field
+        for field in FastenerSerializer.Meta.fields
+        for subfield in (nested[field].Meta.fields if field in nested else [None])
+    ]
+    rows = [
+        tuple(
+            getattr(getattr(fastener, name.split('.')[0]), name.split('.')[1]) if '.' in name
+            else getattr(fastener, name)
+            for name in names
+        )
+        for fastener in fasteners
+    ]
+
+    def serialized(renderer):
+        return lambda: renderer.render(FastenerSerializer(fasteners, many=True).data)
+
+    def columnar(renderer):
+        return lambda: renderer.render(ColumnarData.from_rows(names, rows))
+
+    cases = [
+        ('json', serialized(JSONRenderer())),
+        ('msgpack', serialized(MessagePackRenderer())),
+        ('csv', columnar(CSVRenderer())),
+        ('arrow', columnar(ArrowRenderer())),
+    ]
+
+    results = []
+    json_cpu = json_size = None
+    for name, func in cases:
+        cpu, wall, payload = measure(func, repeat=args.repeat)
+        json_cpu, json_size = json_cpu or cpu, json_size or len(payload)
+        results.append((
+            name, f"{len(payload) / 1024:.0f}", f"{len(payload) / json_size:.2f}",
+            f"{cpu * 1000:.0f}", f"{cpu / json_cpu:.2f}", f"{wall * 1000:.0f}",
+        ))
+
+    print(f"{args.rows} fasteners, median of {args.repeat} runs")
+    print_table(('format', 'KiB', 'size/json', 'cpu ms', 'cpu/json', 'wall ms'), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Race worker threads reserving single units of a few hot offers and compare an ORM read-modify-write,
+the same under select_for_update() and reserve_stock()'s conditional UPDATE, reporting throughput and
+how many units were sold beyond the stock.
+
+Threads need committed rows, so the seeded seller, fasteners and offers are deleted again at the end.
+
+    python -m benchmarks.bench_reservations --workers 32 --reservations 200 --offers 4
+"""
+import argparse
+import threading
+import time
+from benchmarks.common import print_table, setup_django
+
+
+def seed(offers, stock):
+    from fastener_app.models import Category, Fastener, Finish, Material, Seller, SellerFastener, ThreadSize
+
+    material, _ = Material.objects.get_or_create(name='Bench Material')
+    finish, _ = Finish.objects.get_or_create(name='Bench Finish')
+    category, _ = Category.objects.get_or_create(name='Bench Category')
+    thread_size = ThreadSize.objects.filter(canonical_key='M99-1|').first() or ThreadSize.objects.create(
+        name='M99-1', metric_size_str='M99-1', metric_size_num=99, thread_per_unit=1
+    )
+    seller = Seller.objects.create(name='Bench Seller', contact_email='bench@example.com')
+    for index in range(offers):
+        fastener = Fastener.objects.create(product_id=f'R{index}', description='BENCH', thread_size=thread_size,
+                                           material=material, finish=finish, category=category)
+        SellerFastener.objects.create(seller=seller, fastener=fastener, price=1, quantity=stock)
+    return seller
+
+
+def orm_read_modify_write(seller_id, fastener_id):
+    from fastener_app.models import SellerFastener
+
+    offer = SellerFastener.objects.get(seller_id=seller_id, fastener_id=fastener_id)
+    if offer.quantity < 1:
+        return False
+    offer.quantity -= 1
+    offer.save(update_fields=['quantity'])
+    return True
+
+
+def orm_select_for_update(seller_id, fastener_id):
+    from django.db import transaction
+    from fastener_app.models import SellerFastener
+
+    with transaction.atomic():
+        offer = SellerFastener.objects.select_for_update().get(seller_id=seller_id, fastener_id=fastener_id)
+        if offer.quantity < 1:
+            return False
+        offer.quantity -= 1
+        offer.save(update_fields=['quantity'])
+        return True
+
+
+def conditional_update(seller_id, fastener_id):
+    from fastener_app.reservations import InsufficientStock, reserve_stock
+
+    try:
+        reserve_stock([(seller_id, fastener_id, 1)])
+        return True
+    except InsufficientStock:
+        return False
+
+
+def race(reserve, offers, workers, reservations):
+    """
+    Run `workers` threads each attempting `reservations` single-unit reservations spread over the offers.
+    Return (wall seconds, units reserved).
+    """
+    from django.db import connection
+
+    barrier = threading.Barrier(workers + 1)
+    counts = [0] * workers
+
+    def work(worker):
+        try:
+            barrier.wait()
+            for attempt in range(reservations):
+                offer = offers[(worker + attempt) % len(offers)]
+                counts[worker] += reserve(offer.seller_id, offer.fastener_id)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=work, args=(worker,)) for worker in range(workers)]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, sum(counts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=32)
+    parser.add_argument('--reservations', type=int, default=200, help="Attempts per worker")
+    parser.add_argument('--offers', type=int, default=4, help="Number of hot offers shared by all workers")
+    args = parser.parse_args()
+
+    setup_django()
+    from fastener_app.models import Fastener, SellerFastener
+
+    # Enough stock for about 90% of the attempts, so the stock runs out near the end of a run
+    stock = args.workers * args.reservations * 9 // 10 // args.offers
+    strategies = [
+        ('ORM read-modify-write', orm_read_modify_write),
+        ('select_for_update()', orm_select_for_update),
+        ('reserve_stock()', conditional_update),
+    ]
+    seller = seed(args.offers, stock)
+    offers = list(SellerFastener.objects.filter(seller=seller))
+    results = []
+    try:
+        for name, reserve in strategies:
+            SellerFastener.objects.filter(seller=seller).update(quantity=stock)
+            wall, reserved = race(reserve, offers, args.workers, args.reservations)
+            sold = args.offers * stock - sum(SellerFastener.objects.filter(seller=seller).values_list('quantity', flat=True))
+            attempts = args.workers * args.reservations
+            results.append((name, f"{attempts / wall:.0f}", reserved, sold, max(reserved - sold, 0)))
+    finally:
+        seller.delete()
+        Fastener.objects.filter(product_id__in=[f'R{index}' for index in range(args.offers)]).delete()
+
+    print(f"{args.workers} workers x {args.reservations} single-unit reservations on {args.offers} offers "
+          f"of {stock} units")
+    print_table(('strategy', 'attempts/s', 'reserved', 'stock taken', 'oversold'), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Time validating and saving a batch of sellers through POST /sellers, comparing the bulk path of
+SellerListSerializer with validating and saving the sellers one by one.
+
+Each run happens inside a transaction that is rolled back, so the benchmark leaves no data behind.
+
+    python -m benchmarks.bench_sellers --sellers 10000
+"""
+import argparse
+from benchmarks.common import api_client, measure, print_table, setup_django
+
+CSV_MAPPING = {
+    'item_number': 'product_id', 'product_name': 'description', 'threading': 'thread_size',
+    'composition': 'material', 'surface_treatment': 'finish', 'product_category': 'category',
+    'unit_cost': 'price', 'stock': 'quantity',
+}
+
+
+def sellers_payload(sellers):
+    return [
+        {'name': f'Bench Seller {i}', 'contact_email': f'bench{i}@example.com', 'phone_number': '+123456789',
+         'address': f'{i} Bench Street', 'csv_mapping': CSV_MAPPING}
+        for i in range(sellers)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sellers', type=int, default=10_000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection, transaction
+    from rest_framework import serializers
+    from fastener_app.serializers import SellerSerializer
+
+    payload = sellers_payload(args.sellers)
+    client = api_client()
+
+    def rolled_back(func):
+        def run():
+            queries = []
+            with transaction.atomic(), connection.execute_wrapper(
+                lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)
+            ):
+                result = func()
+                transaction.set_rollback(True)
+            return result, len(queries)
+        return run
+
+    def bulk():
+        response = client.post('/sellers', payload, format='json')
+        assert response.status_code == 201, response.content[:200]
+        return response
+
+    def one_by_one():
+        # A plain ListSerializer validates each seller's unique fields and saves each seller separately
+        serializer = serializers.ListSerializer(child=SellerSerializer(), data=payload)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    results = []
+    for name, func in [('bulk (POST /sellers)', bulk), ('one by one', one_by_one)]:
+        cpu, wall, (_, queries) = measure(rolled_back(func), repeat=args.repeat)
+        results.append((name, queries, f"{cpu:.2f}", f"{wall:.2f}", f"{args.sellers / wall:.0f}"))
+    print_table(('path', 'queries', 'cpu s', 'wall s', 'sellers/s'), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Build an in-memory catalog snapshot from synthetic fasteners and report its memory and query times.
+No database is needed; text orderings are sorted in Python instead of by Postgres.
+
+    python -m benchmarks.bench_snapshot --fasteners 1000000
+"""
+import argparse
+import random
+import time
+import tracemalloc
+from benchmarks.common import measure, print_table, setup_django
+
+
+def synthetic_catalog(fasteners, seed=0):
+    rng = random.Random(seed)
+    dimensions = {
+        'thread_size': [
+            (i, size, {'id': i, 'name': f'M{size:g}', 'thread_type': 'metric', 'unit': 'mm',
+                       'metric_size_str': f'M{size:g}-1.5', 'metric_size_num': size,
+                       'imperial_size_str': None, 'imperial_size_num': None})
+            for i, size in enumerate(sorted(rng.uniform(1, 64) for _ in range(80)))
+        ],
+        'material': [(i, f'Material {i:02}', {'id': i, 'name': f'Material {i:02}'}) for i in range(20)],
+        'finish': [(i, f'Finish {i:02}', {'id': i, 'name': f'Finish {i:02}'}) for i in range(15)],
+        'category': [(i, f'Category {i:02}', {'id': i, 'name': f'Category {i:02}'}) for i in range(40)],
+    }
+    words = ['HEX', 'BOLT', 'SCREW', 'DIN', '931', '10.9', 'PLN', 'ZINC', 'WOOD', 'CAP', 'X', '220']
+
+    def rows():
+        for fastener_id in range(1, fasteners + 1):
+            yield (
+                fastener_id, f'P{fastener_id:08}', ' '.join(rng.choices(words, k=8)),
+                rng.randrange(80), rng.randrange(20), rng.randrange(15), rng.randrange(40),
+            )
+    return rows(), dimensions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--fasteners', type=int, default=1_000_000)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--trace', action='store_true', help="Also trace allocations during the build (much slower)")
+    args = parser.parse_args()
+
+    setup_django('fastener_manager.test_settings')
+    from fastener_app.snapshot import CatalogSnapshot
+
+    rows, dimensions = synthetic_catalog(args.fasteners)
+    start = time.perf_counter()
+    snapshot = CatalogSnapshot(version=1, rows=rows, dimensions=dimensions)
+    print(f"Built {len(snapshot)} fasteners in {time.perf_counter() - start:.1f} s")
+    sizes = [('snapshot.memory_usage()', snapshot.memory_usage())]
+
+    if args.trace:
+        rows, dimensions = synthetic_catalog(args.fasteners)
+        del snapshot
+        tracemalloc.start()
+        snapshot = CatalogSnapshot(version=1, rows=rows, dimensions=dimensions)
+        traced, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        sizes += [('tracemalloc retained', traced), ('tracemalloc build peak', peak)]
+
+    per_million = 1_000_000 / args.fasteners
+    print_table(('measure', 'MB', 'MB per 1M fasteners', 'bytes per fastener'), [
+        (name, f"{size / 2 ** 20:.1f}", f"{size * per_million / 2 ** 20:.1f}", f"{size / args.fasteners:.0f}")
+        for name, size in sizes
+    ])
+
+    queries = [
+        ('sort=thread_size:asc', {}, [('thread_size', 'asc')]),
+        ('filter=material (1/20)', {'material': ['material 03']}, [('description', 'asc')]),
+        ('filter=material,finish (1/300)', {'material': ['material 03'], 'finish': ['finish 07']},
+         [('thread_size', 'desc')]),
+        ('3 filters, multi-key sort', {'material': ['material 03'], 'finish': ['finish 07', 'finish 08'],
+                                       'category': ['category 11']}, [('material', 'asc'), ('product_id', 'desc')]),
+    ]
+    results = []
+    for name, filters, sort_keys in queries:
+        cpu, wall, rows = measure(lambda: snapshot.query(filters, sort_keys), repeat=args.repeat)
+        _, serialize_wall, _ = measure(lambda: snapshot.records(rows[:100], [
+            ('id', None), ('product_id', None), ('thread_size', ['name']), ('material', ['name'])
+        ]), repeat=args.repeat)
+        results.append((name, len(rows), f"{wall * 1000:.2f}", f"{serialize_wall * 1000:.3f}"))
+    print_table(('query', 'rows', 'query ms', 'first 100 records ms'), results)
+
+
+if __name__ == '__main__':
+    main()
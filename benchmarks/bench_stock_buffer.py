@@ -0,0 +1,91 @@
+"""
+Replay bursts of stock ticks, several per offer within each flush window, and compare writing every tick
+with its own ORM update against the write-behind StockBuffer, reporting statements, offer rows written and
+wall time. The buffer's flushes also refresh best offers, price history and seller stats, which the per-tick
+updates leave stale.
+
+Each run seeds one seller offering a synthetic catalog inside a transaction that is rolled back at the end,
+so the benchmark leaves no data behind.
+
+    python -m benchmarks.bench_stock_buffer --offers 5000 --ticks 10 --windows 3
+"""
+import argparse
+import random
+import time
+from benchmarks.common import print_table, setup_django
+from benchmarks.bench_offboard import seed
+
+
+def ticks(offers, ticks_per_window, rng):
+    """
+    Yield the ticks of one flush window in arrival order, quantities wandering around the previous ones.
+    """
+    for _ in range(ticks_per_window):
+        for offer in offers:
+            offer[2] = max(offer[2] + rng.choice((-1, 0, 0, 1)), 0)
+            yield tuple(offer)
+
+
+def per_tick(offers, args, rng):
+    from django.utils import timezone
+    from fastener_app.models import SellerFastener
+
+    written = 0
+    for _ in range(args.windows):
+        for seller_id, fastener_id, quantity in ticks(offers, args.ticks, rng):
+            written += SellerFastener.objects.filter(seller_id=seller_id, fastener_id=fastener_id).update(
+                quantity=quantity, last_updated=timezone.now())
+    return written
+
+
+def buffered(offers, args, rng):
+    from fastener_app.stock_buffer import StockBuffer
+
+    buffer = StockBuffer(max_size=args.max_size)
+    for _ in range(args.windows):
+        window = list(ticks(offers, args.ticks, rng))
+        # As posted to /offers/stock, then flushed when the window's delay runs out
+        for start in range(0, len(window), args.request_size):
+            buffer.add(window[start:start + args.request_size])
+        buffer.flush()
+    return buffer.written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--offers', type=int, default=5000)
+    parser.add_argument('--ticks', type=int, default=10, help="Ticks per offer within a flush window")
+    parser.add_argument('--windows', type=int, default=3, help="Number of flush windows")
+    parser.add_argument('--request-size', type=int, default=100, help="Updates per POST /offers/stock")
+    parser.add_argument('--max-size', type=int, default=100_000, help="StockBuffer max_size")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection, transaction
+    from fastener_app.models import SellerFastener
+
+    strategies = [
+        ('update per tick', per_tick),
+        ('StockBuffer', buffered),
+    ]
+    results = []
+    for name, run in strategies:
+        with transaction.atomic():
+            seller = seed(args.offers)
+            offers = [list(offer) for offer in
+                      SellerFastener.objects.filter(seller=seller).values_list('seller_id', 'fastener_id', 'quantity')]
+            queries = []
+            start = time.perf_counter()
+            with connection.execute_wrapper(lambda execute, sql, *rest: queries.append(sql) or execute(sql, *rest)):
+                written = run(offers, args, random.Random(0))
+            wall = time.perf_counter() - start
+            transaction.set_rollback(True)
+        results.append((name, len(queries), written, f"{wall:.2f}"))
+
+    print(f"{args.windows} flush windows of {args.ticks} ticks on each of {args.offers} offers "
+          f"({args.windows * args.ticks * args.offers} ticks)")
+    print_table(('strategy', 'statements', 'rows written', 'wall s'), results)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Helpers shared by the benchmark scripts. Run a benchmark from the repository root, e.g.
+
+    python -m benchmarks.bench_renderers --rows 100000
+"""
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+
+def setup_django(settings_module='fastener_manager.settings'):
+    sys.path.insert(0, str(ROOT_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+    import django
+    django.setup()
+
+
+def measure(func, repeat=5):
+    """
+    Run func `repeat` times and return (median CPU seconds, median wall seconds, last result).
+    """
+    cpu_times, wall_times = [], []
+    result = None
+    for _ in range(repeat):
+        cpu_start, wall_start = time.process_time(), time.perf_counter()
+        result = func()
+        cpu_times.append(time.process_time() - cpu_start)
+        wall_times.append(time.perf_counter() - wall_start)
+    return statistics.median(cpu_times), statistics.median(wall_times), result
+
+
+def print_table(headers, rows):
+    widths = [max(len(str(value)) for value in column) for column in zip(headers, *rows)]
+    for row in [headers, *rows]:
+        print('  '.join(str(value).rjust(width) for value, width in zip(row, widths)))
+
+
+def api_client():
+    """
+    Return an in-process APIClient, allowing its default host whatever ALLOWED_HOSTS is configured.
+    """
+    from django.conf import settings
+    from rest_framework.test import APIClient
+
+    settings.ALLOWED_HOSTS = [*settings.ALLOWED_HOSTS, 'testserver']
+    return APIClient()
@@ -0,0 +1,95 @@
+import hashlib
+import time
+from urllib.parse import urlencode
+from django.core.cache import cache
+
+CATALOG_VERSION_KEY = 'fastener_app:catalog_version'
+
+DIMENSION_VERSION_KEY = 'fastener_app:dimension_version'
+DIMENSION_BUMPED_AT_KEY = 'fastener_app:dimension_bumped_at'
+
+
+def get_version(key):
+    """
+    Return the current value of a version counter with a single cache lookup.
+    A missing counter (cold or flushed cache) is re-seeded from the clock so it never repeats an old version.
+    """
+    version = cache.get(key)
+    if version is None:
+        version = time.time_ns()
+        if not cache.add(key, version, timeout=None):
+            version = cache.get(key, version)
+    return version
+
+
+def bump_version(key):
+    """
+    Advance a version counter after what it versions has changed.
+    """
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = time.time_ns()
+        cache.set(key, version, timeout=None)
+        return version
+
+
+def get_catalog_version():
+    """
+    Return the current catalog version with a single cache lookup.
+    """
+    return get_version(CATALOG_VERSION_KEY)
+
+
+async def aget_catalog_version():
+    """
+    Async variant of get_catalog_version() for views served on the ASGI stack.
+    """
+    version = await cache.aget(CATALOG_VERSION_KEY)
+    if version is None:
+        version = time.time_ns()
+        if not await cache.aadd(CATALOG_VERSION_KEY, version, timeout=None):
+            version = await cache.aget(CATALOG_VERSION_KEY, version)
+    return version
+
+
+def bump_catalog_version():
+    """
+    Advance the catalog version after the catalog has changed, e.g. at the end of an ingest.
+    """
+    return bump_version(CATALOG_VERSION_KEY)
+
+
+def bump_dimension_version():
+    """
+    Advance the dimension version after a thread size, material, finish or category was inserted, renamed
+    or deleted, recording when so that workers can measure how long they served the previous one.
+    The catalog version advances too: list ETags and the catalog snapshot render and filter by the names.
+    """
+    version = bump_version(DIMENSION_VERSION_KEY)
+    cache.set(DIMENSION_BUMPED_AT_KEY, time.time(), timeout=None)
+    bump_catalog_version()
+    return version
+
+
+def normalize_query(query_dict):
+    """
+    Serialize query parameters independently of their order in the URL.
+    Values of a repeated parameter keep their order because it can be meaningful (e.g. sort keys).
+    """
+    return urlencode([(key, value) for key, values in sorted(query_dict.lists()) for value in values])
+
+
+def catalog_etag(version, query_dict, media_type):
+    """
+    Strong ETag derived from the catalog version, the normalized query and the negotiated media type.
+    """
+    key = f"{version}|{normalize_query(query_dict)}|{media_type}"
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()
+
+
+def fastener_list_etag(request, *args, **kwargs):
+    """
+    ETag of GET /fasteners/ for the negotiated media type of a DRF request.
+    """
+    return catalog_etag(get_catalog_version(), request.GET, getattr(request, 'accepted_media_type', ''))
@@ -0,0 +1,118 @@
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+logger = logging.getLogger(__name__)
+
+# Replication lag in seconds, 0 on a primary or a replica that has replayed everything it received
+REPLICA_LAG_QUERY = (
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+# Set while the current request or task may read from a replica; reads go to the primary otherwise
+_replica_reads_allowed = ContextVar('replica_reads_allowed', default=False)
+
+# alias -> (monotonic time of the check, lag in seconds or None if unreachable)
+_replica_lag_checks = {}
+
+
+@contextmanager
+def use_replicas():
+    """
+    Let reads made inside the block go to a healthy replica, e.g. for a read-only request.
+    """
+    token = _replica_reads_allowed.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads_allowed.reset(token)
+
+
+@contextmanager
+def use_primary():
+    """
+    Route every read made inside the block to the primary, e.g. to read data that was just written.
+    """
+    token = _replica_reads_allowed.set(False)
+    try:
+        yield
+    finally:
+        _replica_reads_allowed.reset(token)
+
+
+def replica_reads_allowed():
+    return _replica_reads_allowed.get()
+
+
+def replica_lag(alias):
+    """
+    Return the replication lag of a replica in seconds, or None if it cannot be reached.
+    """
+    try:
+        with connections[alias].cursor() as cursor:
+            cursor.execute(REPLICA_LAG_QUERY)
+            return float(cursor.fetchone()[0] or 0)
+    except DatabaseError as e:
+        logger.warning(f"Replica '{alias}' is unavailable: {e}")
+        return None
+
+
+def get_replica_lag(alias):
+    """
+    Return the lag of a replica, measured at most once per REPLICA_LAG_CHECK_INTERVAL seconds per process.
+    """
+    now = time.monotonic()
+    checked_at, lag = _replica_lag_checks.get(alias, (None, None))
+    if checked_at is None or now - checked_at >= settings.REPLICA_LAG_CHECK_INTERVAL:
+        lag = replica_lag(alias)
+        _replica_lag_checks[alias] = (now, lag)
+    return lag
+
+
+def healthy_replicas():
+    """
+    Return the replica aliases that are reachable and within REPLICA_MAX_LAG seconds of the primary.
+    """
+    return [
+        alias for alias in settings.DATABASE_REPLICAS
+        if (lag := get_replica_lag(alias)) is not None and lag <= settings.REPLICA_MAX_LAG
+    ]
+
+
+class PrimaryReplicaRouter:
+    """
+    Send writes to the primary (`default`), and reads made inside use_replicas() to a healthy replica from
+    DATABASE_REPLICAS. Every other read stays on the primary: migrations, management commands, background
+    threads, and the writing requests the primary_replica_middleware does not opt into replicas. Reads also
+    stay on the primary when no replica is configured or healthy.
+    """
+
+    def db_for_read(self, model, **hints):
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            # Related objects are read from the database their instance came from
+            return instance._state.db
+
+        if not replica_reads_allowed():
+            return DEFAULT_DB_ALIAS
+
+        replicas = healthy_replicas()
+        return random.choice(replicas) if replicas else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same data as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # Replicas receive the schema through replication
+        if db in settings.DATABASE_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,190 @@
+import threading
+import time
+from django.core.cache import cache
+from django.db import router
+from fastener_app.catalog_version import DIMENSION_BUMPED_AT_KEY, DIMENSION_VERSION_KEY, get_version
+from fastener_app.models import Category, Finish, Material, ThreadSize
+
+# Dimension models by fastener field, with the field ingest looks their rows up by
+CACHED_DIMENSIONS = {
+    'thread_size': (ThreadSize, 'canonical_key'),
+    'material': (Material, 'name'),
+    'finish': (Finish, 'name'),
+    'category': (Category, 'name'),
+}
+
+# Seconds a dimension table stays in the shared cache. A version bump makes it unreachable sooner.
+DIMENSION_TABLE_TIMEOUT = 24 * 60 * 60
+
+
+class DimensionTable:
+    """
+    The rows of one dimension model, indexed by id, by lookup field and by lowercased name.
+    """
+
+    def __init__(self, rows, key_field):
+        self.by_id = {row.id: row for row in rows}
+        self.by_key = {getattr(row, key_field): row for row in rows}
+        self.ids_by_name = {}
+        for row in rows:
+            self.ids_by_name.setdefault(row.name.lower(), []).append(row.id)
+
+
+class DimensionCache:
+    """
+    Two-tier cache of the thread size, material, finish and category tables: dicts in this process in front
+    of the configured Django cache, which holds each table pickled under the current dimension version.
+
+    revalidate() compares the local version with the shared one, once per request, and drops the local tables
+    when a dimension was inserted, renamed or deleted since. They are then reloaded on first use from the shared
+    cache, or from the primary database by the first worker to need them. Code running outside requests calls
+    revalidate() itself.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.version = None
+        self.tables = {}
+        self.checks = self.invalidations = 0
+        self.lookups = self.misses = self.shared_hits = self.loads = 0
+        self.staleness = self.max_staleness = 0.0
+
+    def revalidate(self):
+        """
+        Check the shared dimension version with one cache round trip.
+        """
+        values = cache.get_many([DIMENSION_VERSION_KEY, DIMENSION_BUMPED_AT_KEY])
+        version = values.get(DIMENSION_VERSION_KEY)
+        if version is None:
+            version = get_version(DIMENSION_VERSION_KEY)
+        self.set_version(version, values.get(DIMENSION_BUMPED_AT_KEY))
+
+    async def arevalidate(self):
+        """
+        Async variant of revalidate() for requests served on the ASGI stack.
+        """
+        values = await cache.aget_many([DIMENSION_VERSION_KEY, DIMENSION_BUMPED_AT_KEY])
+        version = values.get(DIMENSION_VERSION_KEY)
+        if version is None:
+            version = time.time_ns()
+            if not await cache.aadd(DIMENSION_VERSION_KEY, version, timeout=None):
+                version = await cache.aget(DIMENSION_VERSION_KEY, version)
+        self.set_version(version, values.get(DIMENSION_BUMPED_AT_KEY))
+
+    def set_version(self, version, bumped_at):
+        with self.lock:
+            self.checks += 1
+            if version == self.version:
+                return
+            if self.version is not None:
+                self.invalidations += 1
+                if bumped_at is not None:
+                    # How long this worker could have served the previous dimensions
+                    self.staleness = max(time.time() - bumped_at, 0.0)
+                    self.max_staleness = max(self.max_staleness, self.staleness)
+            self.version, self.tables = version, {}
+
+    def table(self, dimension):
+        """
+        Return the DimensionTable of a dimension field, loading it from the shared cache or the database
+        if this process does not hold it at the current version.
+        """
+        if self.version is None:
+            self.revalidate()
+        version, tables = self.version, self.tables
+        table = tables.get(dimension)
+        if table is not None:
+            return table
+
+        model, key_field = CACHED_DIMENSIONS[dimension]
+        key = f"fastener_app:dimensions:{dimension}:{version}"
+        rows = cache.get(key)
+        if rows is None:
+            # The version is read before the rows, so a table is never stored under a newer version than its rows
+            rows = list(model.objects.using(router.db_for_write(model)).order_by('id'))
+            cache.set(key, rows, DIMENSION_TABLE_TIMEOUT)
+            self.loads += 1
+        else:
+            self.shared_hits += 1
+        table = tables[dimension] = DimensionTable(rows, key_field)
+        return table
+
+    def lookup(self, dimension, key):
+        """
+        Return the row of a dimension by its lookup field (canonical_key for thread sizes, name otherwise),
+        or None if it is not cached, e.g. because it does not exist yet.
+        """
+        row = self.table(dimension).by_key.get(key)
+        self.lookups += 1
+        self.misses += row is None
+        return row
+
+    def ids_named(self, dimension, names):
+        """
+        Return the ids of the rows of a dimension whose lowercased name is one of `names`.
+        """
+        ids_by_name = self.table(dimension).ids_by_name
+        self.lookups += len(names)
+        return [row_id for name in names for row_id in ids_by_name.get(name, ())]
+
+    def rows(self, dimension, ids):
+        """
+        Return {id: row} for the given ids of a dimension. Rows newer than the cached table are read from the
+        database.
+        """
+        by_id = self.table(dimension).by_id
+        rows = {row_id: by_id[row_id] for row_id in ids if row_id in by_id}
+        missing = [row_id for row_id in ids if row_id not in rows and row_id is not None]
+        self.lookups += len(ids)
+        if missing:
+            self.misses += len(missing)
+            model, _ = CACHED_DIMENSIONS[dimension]
+            rows.update(model.objects.using(router.db_for_write(model)).in_bulk(missing))
+        return rows
+
+    def attach(self, objects, dimensions):
+        """
+        Set the given dimension fields of fasteners (or other objects with the same foreign keys) to the cached
+        rows, in place of select_related() joins. Return the objects as a list.
+        """
+        objects = list(objects)
+        if not objects:
+            return objects
+        for dimension in dimensions:
+            field = objects[0]._meta.get_field(dimension)
+            rows = self.rows(dimension, {getattr(obj, field.attname) for obj in objects})
+            for obj in objects:
+                field.set_cached_value(obj, rows.get(getattr(obj, field.attname)))
+        return objects
+
+    def stats(self):
+        """
+        Return the version checks and invalidations of this process, its lookups with the share answered
+        without querying the database, and the staleness in seconds of the last and worst invalidations.
+        """
+        lookups = self.lookups
+        return {
+            "version": self.version,
+            "checks": self.checks,
+            "invalidations": self.invalidations,
+            "lookups": lookups,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "loads": self.loads,
+            "hit_ratio": 1 - (self.misses + self.loads) / lookups if lookups else None,
+            "staleness": self.staleness,
+            "max_staleness": self.max_staleness,
+        }
+
+
+dimension_cache = DimensionCache()
+
+
+def get_dimension_cache():
+    """
+    Return this process's DimensionCache.
+    """
+    return dimension_cache
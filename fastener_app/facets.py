@@ -0,0 +1,67 @@
+from collections import Counter
+from django.db import connection
+from django.db.models import Count, Sum
+from fastener_app.models import Fastener, FacetCount
+
+# Dimensions that are stored in the facet_count table, in facet_count column order
+FACET_FIELDS = ['thread_size', 'material', 'finish', 'category']
+
+
+def facet_key(fastener):
+    """
+    Return the facet_count key of a fastener, e.g. (thread_size_id, material_id, finish_id, category_id).
+    """
+    return tuple(getattr(fastener, f"{field}_id") for field in FACET_FIELDS)
+
+
+def adjust_facet_counts(deltas):
+    """
+    Apply a {facet_key: delta} mapping to the facet_count table with a single upsert.
+    """
+    deltas = {key: delta for key, delta in Counter(deltas).items() if delta}
+    if not deltas:
+        return
+
+    table = connection.ops.quote_name(FacetCount._meta.db_table)
+    columns = ', '.join(f"{field}_id" for field in FACET_FIELDS)
+    placeholders = ', '.join(['(%s, %s, %s, %s, %s)'] * len(deltas))
+    params = [value for key, delta in deltas.items() for value in (*key, delta)]
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}, count) VALUES {placeholders} "
+            f"ON CONFLICT ({columns}) DO UPDATE SET count = {table}.count + EXCLUDED.count",
+            params,
+        )
+
+
+def rebuild_facet_counts():
+    """
+    Recompute the whole facet_count table from the fastener table.
+    """
+    FacetCount.objects.all().delete()
+    rows = Fastener.objects.values(*(f"{field}_id" for field in FACET_FIELDS)).annotate(count=Count('id'))
+    FacetCount.objects.bulk_create(FacetCount(**row) for row in rows.order_by())
+
+
+def get_facet_counts(annotation_dict, filter_dict, live=False):
+    """
+    Return the fastener counts per value of every facet for the given filters.
+    Counts are summed from facet_count unless `live` is set, in which case they are aggregated from fastener.
+    """
+    if live:
+        queryset, aggregate = Fastener.objects.all(), Count('id')
+    else:
+        queryset, aggregate = FacetCount.objects.all(), Sum('count')
+    queryset = queryset.alias(**annotation_dict).filter(**filter_dict)
+
+    facets = {}
+    for field in FACET_FIELDS:
+        rows = queryset.values(f"{field}_id", f"{field}__name").annotate(
+            count=aggregate
+        ).filter(count__gt=0).order_by(f"{field}__name")
+        facets[field] = [
+            {'id': row[f"{field}_id"], 'name': row[f"{field}__name"], 'count': row['count']}
+            for row in rows
+        ]
+    return facets
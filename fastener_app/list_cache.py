@@ -0,0 +1,166 @@
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from fastener_app.catalog_version import normalize_query
+from fastener_app.dimension_cache import get_dimension_cache
+from fastener_app.facets import FACET_FIELDS
+from fastener_app.models import Fastener
+
+LIST_CACHE_KEY_PREFIX = 'fastener_app:list'
+LIST_TAG_KEY_PREFIX = 'fastener_app:list_tag'
+
+# Kinds of entries: lists of fasteners, and lists that also read their offers (offer summary, price sort)
+FASTENERS = 'fasteners'
+OFFERS = 'offers'
+
+# Dimension an entry filtering on several is tagged by, the one with the most distinct values first
+TAG_DIMENSIONS = ('thread_size', 'category', 'material', 'finish')
+
+
+def entry_tags(filters, offers=False, equivalent=False):
+    """
+    Return the tags of a list entry from its parsed `filter` parameters ({key: [lowercased values]}).
+
+    An entry filtered on a dimension is tagged with the values of that one dimension: a fastener entering,
+    leaving or changing in the list has one of them, before or after the change. Other entries are tagged
+    with '<kind>:*', which every change invalidates. Equivalent thread size searches are also tagged
+    '<kind>:equivalent', for rebuilds of the equivalence index.
+    """
+    kind = OFFERS if offers else FASTENERS
+    tags = [f"{kind}:equivalent"] if equivalent else []
+    for dimension in TAG_DIMENSIONS:
+        # An equivalent search lists other thread sizes than the filtered ones
+        if dimension in filters and not (equivalent and dimension == 'thread_size'):
+            return tags + [f"{kind}:{dimension}:{name}" for name in filters[dimension]]
+    return tags + [f"{kind}:*"]
+
+
+def change_tags(keys, offers_only=False):
+    """
+    Return the tags invalidated by changes to fasteners with the given facet keys
+    (thread_size_id, material_id, finish_id, category_id), or only to their offers.
+    """
+    kinds = (OFFERS,) if offers_only else (FASTENERS, OFFERS)
+    if not keys:
+        return set()
+    tags = {f"{kind}:*" for kind in kinds}
+    for position, dimension in enumerate(FACET_FIELDS):
+        rows = get_dimension_cache().rows(dimension, {key[position] for key in keys})
+        tags.update(f"{kind}:{dimension}:{row.name.lower()}" for row in rows.values() for kind in kinds)
+    return tags
+
+
+def tag_key(tag):
+    # Dimension names may hold spaces and other characters some cache backends reject in keys
+    return f"{LIST_TAG_KEY_PREFIX}:{hashlib.sha256(tag.encode('utf-8')).hexdigest()}"
+
+
+def invalidate_tags(tags):
+    """
+    Invalidate the list entries with any of the tags by giving each tag a new version, in one cache round trip.
+    """
+    if tags:
+        version = time.time_ns()
+        cache.set_many({tag_key(tag): version for tag in tags}, timeout=None)
+
+
+def invalidate_fasteners(fastener_ids, offers_only=False):
+    """
+    Invalidate the list entries that may list the given fasteners, e.g. after their offers changed.
+    """
+    fastener_ids = list(fastener_ids)
+    if fastener_ids:
+        keys = set(Fastener.objects.filter(id__in=fastener_ids).values_list(
+            *(f"{field}_id" for field in FACET_FIELDS)
+        ).distinct())
+        invalidate_tags(change_tags(keys, offers_only))
+
+
+class ListCache:
+    """
+    Cache of fastener list results, keyed by the dimension version, the normalized query and the shape of the
+    data. Each entry stores the versions of its tags when its query started: it is served only while all of them
+    are unchanged, so an ingest only invalidates the entries tagged with the dimension values it touched.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.hits = self.misses = self.stale = self.stores = self.skipped = 0
+
+    def count(self, counter):
+        with self.lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    @staticmethod
+    def key(query_dict, variant):
+        dimension_cache = get_dimension_cache()
+        if dimension_cache.version is None:
+            dimension_cache.revalidate()
+        key = f"{dimension_cache.version}|{normalize_query(query_dict)}|{variant}"
+        return f"{LIST_CACHE_KEY_PREFIX}:{hashlib.sha256(key.encode('utf-8')).hexdigest()}"
+
+    def get(self, key):
+        """
+        Return the cached data of a key, or None if it is missing or one of its tags was invalidated since.
+        """
+        entry = cache.get(key)
+        if entry is None:
+            self.count('misses')
+            return None
+        versions, data = entry
+        if cache.get_many(list(versions)) != versions:
+            self.count('stale')
+            return None
+        self.count('hits')
+        return data
+
+    @staticmethod
+    def tag_versions(tags):
+        """
+        Return the current {tag key: version} of the tags, giving a version to tags that have none yet.
+        Read before the query runs, so an invalidation while it runs leaves the entry stale.
+        """
+        keys = [tag_key(tag) for tag in tags]
+        versions = cache.get_many(keys)
+        missing = {key: time.time_ns() for key in keys if key not in versions}
+        if missing:
+            cache.set_many(missing, timeout=None)
+            versions.update(missing)
+        return versions
+
+    def set(self, key, versions, data):
+        if len(data) > settings.LIST_CACHE_MAX_ROWS:
+            self.count('skipped')
+            return
+        cache.set(key, (versions, data), settings.LIST_CACHE_TIMEOUT)
+        self.count('stores')
+
+    def stats(self):
+        """
+        Return the hits, misses and stale entries of this process with its hit ratio, and the results stored
+        or skipped for their size.
+        """
+        lookups = self.hits + self.misses + self.stale
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "stores": self.stores,
+            "skipped": self.skipped,
+            "hit_ratio": self.hits / lookups if lookups else None,
+        }
+
+
+list_cache = ListCache()
+
+
+def get_list_cache():
+    """
+    Return this process's ListCache.
+    """
+    return list_cache
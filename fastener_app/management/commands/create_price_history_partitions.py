@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from fastener_app.price_history import ensure_price_history_partition, month_bounds
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the monthly price_history partitions of the current and the next months ahead of the writes, "
+        "moving in rows the DEFAULT partition holds for them. Run it at least monthly, e.g. from cron."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=3, help="Months after the current one to create.")
+
+    def handle(self, *args, **options):
+        start, _ = month_bounds(timezone.now())
+        created = []
+        for _ in range(options['months'] + 1):
+            if ensure_price_history_partition(start):
+                created.append(f"{start:%Y-%m}")
+            _, start = month_bounds(start)
+        self.stdout.write(self.style.SUCCESS(
+            f"Created price history partitions for {', '.join(created)}." if created
+            else "Price history partitions already exist."
+        ))
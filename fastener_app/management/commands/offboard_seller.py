@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+from fastener_app.models import Seller
+from fastener_app.offboarding import OFFBOARD_BATCH_SIZE, offboard_seller
+
+
+class Command(BaseCommand):
+    help = "Delete a seller and its offers in batches, keeping the best offers consistent after every batch."
+
+    def add_arguments(self, parser):
+        parser.add_argument('seller_id', type=int)
+        parser.add_argument('--batch-size', type=int, default=OFFBOARD_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        def progress(deleted, total):
+            self.stdout.write(f"Deleted {deleted} of {total} offers.")
+
+        try:
+            deleted = offboard_seller(options['seller_id'], batch_size=options['batch_size'], progress=progress)
+        except Seller.DoesNotExist:
+            raise CommandError(f"Seller {options['seller_id']} does not exist.")
+        self.stdout.write(self.style.SUCCESS(f"Offboarded seller {options['seller_id']} with {deleted} offers."))
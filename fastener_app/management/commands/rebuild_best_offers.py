@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from fastener_app.models import BestOffer
+from fastener_app.offers import refresh_best_offers
+
+
+class Command(BaseCommand):
+    help = "Recompute the denormalized best_offer table from the seller_fastener table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            refresh_best_offers()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {BestOffer.objects.count()} best offer rows."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from fastener_app.facets import rebuild_facet_counts
+from fastener_app.models import FacetCount
+
+
+class Command(BaseCommand):
+    help = "Recompute the pre-aggregated facet_count table from the fastener table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_facet_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {FacetCount.objects.count()} facet count rows."))
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from fastener_app.models import SellerStats
+from fastener_app.seller_stats import refresh_seller_stats
+
+
+class Command(BaseCommand):
+    help = "Recompute the per-seller seller_stats table from the seller_fastener table."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            refresh_seller_stats()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {SellerStats.objects.count()} seller stats rows."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from fastener_app.catalog_version import bump_catalog_version
+from fastener_app.list_cache import FASTENERS, OFFERS, invalidate_tags
+from fastener_app.models import ThreadSizeEquivalence
+from fastener_app.thread_equivalence import rebuild_thread_size_equivalences
+
+
+class Command(BaseCommand):
+    help = "Recompute the thread_size_equivalence index with the current THREAD_EQUIVALENCE_TOLERANCE."
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rebuild_thread_size_equivalences()
+            # Cached equivalent searches may list different fasteners now
+            transaction.on_commit(bump_catalog_version)
+            transaction.on_commit(lambda: invalidate_tags({f"{FASTENERS}:equivalent", f"{OFFERS}:equivalent"}))
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {ThreadSizeEquivalence.objects.count()} thread size equivalence rows."
+        ))
@@ -0,0 +1,97 @@
+import csv
+import threading
+from django.db import transaction
+from fastener_app.models import Seller, SellerMappingVersion
+
+# Compiled mappings kept per process; versions are immutable so entries never go stale
+COMPILED_MAPPINGS_MAX_SIZE = 1024
+
+
+class CompiledMapping:
+    """
+    A seller's csv_mapping prepared for ingest: the CSV header is resolved to column indexes once per file
+    instead of looking every mapped column up in a dict per row.
+    """
+
+    def __init__(self, csv_mapping):
+        self.fields = tuple((csv_field, model_field) for csv_field, model_field in csv_mapping.items())
+
+    def plan(self, header):
+        """
+        Return (model field, column index or None) for each mapped column of a CSV header.
+        A column repeated in the header maps to its last occurrence, like csv.DictReader.
+        """
+        index_of = {name: index for index, name in enumerate(header)}
+        return [(model_field, index_of.get(csv_field)) for csv_field, model_field in self.fields]
+
+    def map_rows(self, csv_file):
+        """
+        Yield each row of a CSV file as {model field: stripped value}, '' for missing columns.
+        Blank lines are skipped.
+        """
+        reader = csv.reader(csv_file)
+        plan = self.plan(next(reader, []))
+        for row in reader:
+            if not row:
+                continue
+            yield {
+                model_field: row[index].strip() if index is not None and index < len(row) else ''
+                for model_field, index in plan
+            }
+
+
+_compiled_mappings = {}
+_compiled_mappings_lock = threading.Lock()
+
+
+def compiled_mapping(mapping_version):
+    """
+    Return the CompiledMapping of a SellerMappingVersion, compiled once per process per (seller_id, version).
+    """
+    key = (mapping_version.seller_id, mapping_version.version)
+    compiled = _compiled_mappings.get(key)
+    if compiled is None:
+        compiled = CompiledMapping(mapping_version.csv_mapping or {})
+        with _compiled_mappings_lock:
+            if len(_compiled_mappings) >= COMPILED_MAPPINGS_MAX_SIZE:
+                _compiled_mappings.clear()
+            _compiled_mappings[key] = compiled
+    return compiled
+
+
+def create_mapping_versions(sellers):
+    """
+    Record version 1 of the csv_mapping of newly created sellers, whose mapping_version is already 1.
+    """
+    SellerMappingVersion.objects.bulk_create(
+        SellerMappingVersion(seller=seller, version=seller.mapping_version, csv_mapping=seller.csv_mapping or {})
+        for seller in sellers
+    )
+
+
+def update_csv_mapping(seller_id, csv_mapping):
+    """
+    Make `csv_mapping` the seller's current mapping as a new version and return that SellerMappingVersion.
+    The seller row is locked so concurrent edits get consecutive version numbers.
+    """
+    with transaction.atomic():
+        seller = Seller.objects.select_for_update().get(id=seller_id)
+        seller.csv_mapping = csv_mapping
+        seller.mapping_version += 1
+        seller.save(update_fields=['csv_mapping', 'mapping_version'])
+        return SellerMappingVersion.objects.create(seller=seller, version=seller.mapping_version,
+                                                   csv_mapping=csv_mapping)
+
+
+def current_mapping_version(seller):
+    """
+    Return the seller's current SellerMappingVersion, recording one from csv_mapping for a seller that has none.
+    """
+    mapping_version = SellerMappingVersion.objects.filter(seller=seller, version=seller.mapping_version).first()
+    if mapping_version is None:
+        with transaction.atomic():
+            locked = Seller.objects.select_for_update().get(id=seller.id)
+            mapping_version = SellerMappingVersion.objects.filter(seller=locked, version=locked.mapping_version).first()
+            if mapping_version is None:
+                mapping_version = update_csv_mapping(locked.id, locked.csv_mapping or {})
+    return mapping_version
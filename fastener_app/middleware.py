@@ -0,0 +1,74 @@
+import time
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.utils.decorators import sync_and_async_middleware
+from fastener_app.db_router import use_replicas
+from fastener_app.dimension_cache import get_dimension_cache
+
+# Cookie holding the time until which a client's reads stay on the primary
+PRIMARY_PIN_COOKIE = 'pin_primary'
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+
+def reads_pinned(request):
+    """
+    Pin reads to the primary for writes and for clients that wrote within READ_YOUR_WRITES_SECONDS,
+    e.g. a seller that just ingested a CSV and lists its fasteners.
+    """
+    if request.method not in SAFE_METHODS:
+        return True
+    try:
+        return float(request.COOKIES.get(PRIMARY_PIN_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def pin_client(request, response):
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        response.set_cookie(
+            PRIMARY_PIN_COOKIE, f"{time.time() + settings.READ_YOUR_WRITES_SECONDS:.3f}",
+            max_age=settings.READ_YOUR_WRITES_SECONDS, httponly=True, samesite='Lax',
+        )
+    return response
+
+
+@sync_and_async_middleware
+def primary_replica_middleware(get_response):
+    """
+    Let the reads of read-only requests go to replicas, keeping writing requests and recently writing clients
+    on the primary database, and give writing clients a short-lived cookie so their next reads see their writes.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            if reads_pinned(request):
+                response = await get_response(request)
+            else:
+                with use_replicas():
+                    response = await get_response(request)
+            return pin_client(request, response)
+    else:
+        def middleware(request):
+            if reads_pinned(request):
+                response = get_response(request)
+            else:
+                with use_replicas():
+                    response = get_response(request)
+            return pin_client(request, response)
+    return middleware
+
+
+@sync_and_async_middleware
+def dimension_cache_middleware(get_response):
+    """
+    Revalidate this process's dimension cache against the shared dimension version at the start of each request.
+    """
+    if iscoroutinefunction(get_response):
+        async def middleware(request):
+            await get_dimension_cache().arevalidate()
+            return await get_response(request)
+    else:
+        def middleware(request):
+            get_dimension_cache().revalidate()
+            return get_response(request)
+    return middleware
@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def populate_facet_counts(apps, schema_editor):
+    Fastener = apps.get_model("fastener_app", "Fastener")
+    FacetCount = apps.get_model("fastener_app", "FacetCount")
+    db_alias = schema_editor.connection.alias
+    rows = (
+        Fastener.objects.using(db_alias).values("thread_size_id", "material_id", "finish_id", "category_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    FacetCount.objects.using(db_alias).bulk_create(FacetCount(**row) for row in rows)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FacetCount",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet_counts",
+                        to="fastener_app.category",
+                    ),
+                ),
+                (
+                    "finish",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet_counts",
+                        to="fastener_app.finish",
+                    ),
+                ),
+                (
+                    "material",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet_counts",
+                        to="fastener_app.material",
+                    ),
+                ),
+                (
+                    "thread_size",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet_counts",
+                        to="fastener_app.threadsize",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": f'{settings.DB_SCHEMA}"."facet_count',
+                "unique_together": {("thread_size", "material", "finish", "category")},
+            },
+        ),
+        migrations.RunPython(populate_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0002_facetcount"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="fastener",
+            name="fastener_name",
+        ),
+        migrations.AddIndex(
+            model_name="fastener",
+            index=models.Index(
+                fields=["description", "id"], name="fastener_description_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="threadsize",
+            index=models.Index(
+                fields=["metric_size_num"], name="thread_size_metric__7d5d1e_idx"
+            ),
+        ),
+    ]
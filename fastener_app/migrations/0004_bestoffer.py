@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:08
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def populate_best_offers(apps, schema_editor):
+    BestOffer = apps.get_model("fastener_app", "BestOffer")
+    SellerFastener = apps.get_model("fastener_app", "SellerFastener")
+    quote_name = schema_editor.connection.ops.quote_name
+    best_offer = quote_name(BestOffer._meta.db_table)
+    seller_fastener = quote_name(SellerFastener._meta.db_table)
+    schema_editor.execute(
+        f"INSERT INTO {best_offer} (fastener_id, best_price, seller_id, total_quantity, offer_count) "
+        f"SELECT summary.fastener_id, cheapest.price, cheapest.seller_id, summary.total_quantity, summary.offer_count "
+        f"FROM (SELECT fastener_id, SUM(quantity) AS total_quantity, COUNT(*) AS offer_count "
+        f"      FROM {seller_fastener} GROUP BY fastener_id) summary "
+        f"LEFT JOIN (SELECT DISTINCT ON (fastener_id) fastener_id, price, seller_id "
+        f"           FROM {seller_fastener} WHERE quantity > 0 "
+        f"           ORDER BY fastener_id, price, seller_id) cheapest "
+        f"ON cheapest.fastener_id = summary.fastener_id"
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0003_sort_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BestOffer",
+            fields=[
+                (
+                    "fastener",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="best_offer",
+                        serialize=False,
+                        to="fastener_app.fastener",
+                    ),
+                ),
+                (
+                    "best_price",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+                ("total_quantity", models.PositiveBigIntegerField(default=0)),
+                ("offer_count", models.PositiveIntegerField(default=0)),
+                (
+                    "seller",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="best_offers",
+                        to="fastener_app.seller",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": f'{settings.DB_SCHEMA}"."best_offer',
+                "indexes": [
+                    models.Index(
+                        fields=["best_price", "fastener"], name="best_offer_price"
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(populate_best_offers, migrations.RunPython.noop),
+    ]
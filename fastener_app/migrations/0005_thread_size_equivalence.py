@@ -0,0 +1,90 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:21
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+INCH_TO_MM = 25.4
+
+
+def geometry(thread_type, metric_size_num, imperial_size_num, thread_per_unit):
+    if not thread_per_unit:
+        return None
+    if str(thread_type).lower() == "imperial":
+        return (imperial_size_num * INCH_TO_MM, INCH_TO_MM / thread_per_unit) if imperial_size_num else None
+    return (metric_size_num, thread_per_unit) if metric_size_num else None
+
+
+def index_thread_sizes(apps, schema_editor):
+    ThreadSize = apps.get_model("fastener_app", "ThreadSize")
+    ThreadSizeEquivalence = apps.get_model("fastener_app", "ThreadSizeEquivalence")
+    db_alias = schema_editor.connection.alias
+    tolerance = getattr(settings, "THREAD_EQUIVALENCE_TOLERANCE", 0.02)
+
+    # Imperial sizes used to be named by their rounded metric conversion
+    imperial_sizes = ThreadSize.objects.using(db_alias).filter(thread_type__iexact="imperial")
+    for thread_size in imperial_sizes.exclude(imperial_size_str=None):
+        thread_size.name = thread_size.imperial_size_str
+        thread_size.save(using=db_alias, update_fields=["name"])
+
+    sizes = ThreadSize.objects.using(db_alias).values_list(
+        "id", "thread_type", "metric_size_num", "imperial_size_num", "thread_per_unit"
+    )
+    geometries = [(size[0], geometry(*size[1:])) for size in sizes]
+    pairs = [(thread_size_id, thread_size_id) for thread_size_id, _ in geometries]
+    for thread_size_id, size in geometries:
+        for other_id, other in geometries:
+            if size and other and other_id != thread_size_id and all(
+                abs(value - other_value) <= tolerance * max(value, other_value)
+                for value, other_value in zip(size, other)
+            ):
+                pairs.append((thread_size_id, other_id))
+    ThreadSizeEquivalence.objects.using(db_alias).bulk_create(
+        ThreadSizeEquivalence(thread_size_id=thread_size_id, equivalent_id=equivalent_id)
+        for thread_size_id, equivalent_id in pairs
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0004_bestoffer"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ThreadSizeEquivalence",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "equivalent",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="fastener_app.threadsize",
+                    ),
+                ),
+                (
+                    "thread_size",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="equivalences",
+                        to="fastener_app.threadsize",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": f'{settings.DB_SCHEMA}"."thread_size_equivalence',
+                "unique_together": {("thread_size", "equivalent")},
+            },
+        ),
+        migrations.RunPython(index_thread_sizes, migrations.RunPython.noop),
+    ]
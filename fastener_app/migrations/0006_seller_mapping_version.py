@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:26
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def record_mapping_versions(apps, schema_editor):
+    Seller = apps.get_model("fastener_app", "Seller")
+    SellerMappingVersion = apps.get_model("fastener_app", "SellerMappingVersion")
+    db_alias = schema_editor.connection.alias
+
+    # Existing mappings become version 1 of their seller
+    SellerMappingVersion.objects.using(db_alias).bulk_create(
+        SellerMappingVersion(seller_id=seller_id, version=1, csv_mapping=csv_mapping or {})
+        for seller_id, csv_mapping in Seller.objects.using(db_alias).values_list("id", "csv_mapping").iterator()
+    )
+    Seller.objects.using(db_alias).update(mapping_version=1)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0005_thread_size_equivalence"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="seller",
+            name="mapping_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name="SellerMappingVersion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.PositiveIntegerField()),
+                ("csv_mapping", models.JSONField(default=dict)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "seller",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="mapping_versions",
+                        to="fastener_app.seller",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": f'{settings.DB_SCHEMA}"."seller_mapping_version',
+                "unique_together": {("seller", "version")},
+            },
+        ),
+        migrations.CreateModel(
+            name="IngestRun",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("running", "Running"),
+                            ("succeeded", "Succeeded"),
+                            ("failed", "Failed"),
+                        ],
+                        default="running",
+                        max_length=10,
+                    ),
+                ),
+                ("row_count", models.PositiveIntegerField(default=0)),
+                ("started_at", models.DateTimeField(auto_now_add=True)),
+                ("finished_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "seller",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ingest_runs",
+                        to="fastener_app.seller",
+                    ),
+                ),
+                (
+                    "mapping_version",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="ingest_runs",
+                        to="fastener_app.sellermappingversion",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": f'{settings.DB_SCHEMA}"."ingest_run',
+            },
+        ),
+        migrations.RunPython(record_mapping_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+PRICE_HISTOGRAM_EDGES = ["0.10", "0.25", "0.50", "1", "2.50", "5", "10", "25", "50", "100", "250", "500", "1000"]
+
+
+def populate_seller_stats(apps, schema_editor):
+    SellerStats = apps.get_model("fastener_app", "SellerStats")
+    SellerFastener = apps.get_model("fastener_app", "SellerFastener")
+    quote_name = schema_editor.connection.ops.quote_name
+    seller_stats = quote_name(SellerStats._meta.db_table)
+    seller_fastener = quote_name(SellerFastener._meta.db_table)
+    schema_editor.execute(
+        f"INSERT INTO {seller_stats} (seller_id, offer_count, in_stock_count, total_quantity, min_price, max_price, "
+        f"price_sum, price_histogram, updated_at) "
+        f"SELECT summary.seller_id, summary.offer_count, summary.in_stock_count, summary.total_quantity, "
+        f"summary.min_price, summary.max_price, summary.price_sum, histogram.price_histogram, now() "
+        f"FROM (SELECT seller_id, COUNT(*) AS offer_count, COUNT(*) FILTER (WHERE quantity > 0) AS in_stock_count, "
+        f"      SUM(quantity) AS total_quantity, MIN(price) AS min_price, MAX(price) AS max_price, "
+        f"      SUM(price) AS price_sum "
+        f"      FROM {seller_fastener} GROUP BY seller_id) summary "
+        f"JOIN (SELECT seller_id, jsonb_object_agg(bucket, offer_count) AS price_histogram "
+        f"      FROM (SELECT seller_id, width_bucket(price, %s::numeric[]) AS bucket, COUNT(*) AS offer_count "
+        f"            FROM {seller_fastener} GROUP BY seller_id, bucket) buckets "
+        f"      GROUP BY seller_id) histogram "
+        f"ON histogram.seller_id = summary.seller_id",
+        [PRICE_HISTOGRAM_EDGES],
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0006_seller_mapping_version"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SellerStats",
+            fields=[
+                (
+                    "seller",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="stats",
+                        serialize=False,
+                        to="fastener_app.seller",
+                    ),
+                ),
+                ("offer_count", models.PositiveIntegerField(default=0)),
+                ("in_stock_count", models.PositiveIntegerField(default=0)),
+                ("total_quantity", models.PositiveBigIntegerField(default=0)),
+                (
+                    "min_price",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+                (
+                    "max_price",
+                    models.DecimalField(
+                        blank=True, decimal_places=2, max_digits=10, null=True
+                    ),
+                ),
+                (
+                    "price_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=20),
+                ),
+                ("price_histogram", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                "db_table": f'{settings.DB_SCHEMA}"."seller_stats',
+            },
+        ),
+        migrations.RunPython(populate_seller_stats, migrations.RunPython.noop),
+    ]
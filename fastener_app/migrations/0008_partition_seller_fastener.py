@@ -0,0 +1,107 @@
+from django.db import migrations
+
+SELLER_FASTENER_PARTITIONS = 16
+
+# Constraint and index names Django gave the unpartitioned table, kept so later migrations find them
+COLUMNS = (
+    "id bigint GENERATED BY DEFAULT AS IDENTITY, "
+    "price numeric(10, 2) NOT NULL, "
+    "quantity integer NOT NULL CONSTRAINT seller_fastener_quantity_check CHECK (quantity >= 0), "
+    "last_updated timestamp with time zone NOT NULL, "
+    "fastener_id bigint NOT NULL, "
+    "seller_id bigint NOT NULL"
+)
+CONSTRAINTS = [
+    "ADD CONSTRAINT seller_fastener_seller_id_fastener_id_4c06d691_uniq UNIQUE (seller_id, fastener_id)",
+    "ADD CONSTRAINT seller_fastener_fastener_id_0f5b43a9_fk_fastener_id FOREIGN KEY (fastener_id) "
+    "REFERENCES {fastener} (id) DEFERRABLE INITIALLY DEFERRED",
+    "ADD CONSTRAINT seller_fastener_seller_id_cda9e306_fk_seller_id FOREIGN KEY (seller_id) "
+    "REFERENCES {seller} (id) DEFERRABLE INITIALLY DEFERRED",
+]
+INDEXES = [
+    "CREATE INDEX seller_fastener_fastener_id_0f5b43a9 ON {table} (fastener_id)",
+    "CREATE INDEX seller_fastener_seller_id_cda9e306 ON {table} (seller_id)",
+]
+
+
+def tables(apps, schema_editor):
+    quote_name = schema_editor.connection.ops.quote_name
+    names = {
+        key: quote_name(apps.get_model("fastener_app", model)._meta.db_table)
+        for key, model in (("table", "SellerFastener"), ("fastener", "Fastener"), ("seller", "Seller"))
+    }
+    names["old"] = quote_name(apps.get_model("fastener_app", "SellerFastener")._meta.db_table + "_old")
+    return names
+
+
+def rebuild_seller_fastener(schema_editor, names, partitioned):
+    """
+    Move seller_fastener aside, create it again (hash-partitioned by seller_id or not), copy the rows back
+    and continue the id sequence after the copied ids.
+    """
+    table = names["table"]
+    schema_editor.execute(f"ALTER TABLE {table} RENAME TO {names['old'].split('.')[-1]}")
+    for constraint in ("seller_fastener_pkey", "seller_fastener_quantity_check",
+                       "seller_fastener_seller_id_fastener_id_4c06d691_uniq",
+                       "seller_fastener_fastener_id_0f5b43a9_fk_fastener_id",
+                       "seller_fastener_seller_id_cda9e306_fk_seller_id"):
+        schema_editor.execute(f"ALTER TABLE {names['old']} DROP CONSTRAINT IF EXISTS {constraint}")
+    for index in ("seller_fastener_fastener_id_0f5b43a9", "seller_fastener_seller_id_cda9e306"):
+        schema_editor.execute(f"DROP INDEX IF EXISTS {table.rsplit('.', 1)[0]}.{index}")
+
+    if partitioned:
+        # Unique constraints of a partitioned table must include the partition key
+        schema_editor.execute(
+            f"CREATE TABLE {table} ({COLUMNS}, CONSTRAINT seller_fastener_pkey PRIMARY KEY (id, seller_id)) "
+            f"PARTITION BY HASH (seller_id)"
+        )
+        for remainder in range(SELLER_FASTENER_PARTITIONS):
+            schema_editor.execute(
+                f'CREATE TABLE {table[:-1]}_p{remainder}" PARTITION OF {table} '
+                f"FOR VALUES WITH (MODULUS {SELLER_FASTENER_PARTITIONS}, REMAINDER {remainder})"
+            )
+    else:
+        schema_editor.execute(f"CREATE TABLE {table} ({COLUMNS}, CONSTRAINT seller_fastener_pkey PRIMARY KEY (id))")
+
+    schema_editor.execute(
+        f"INSERT INTO {table} (id, price, quantity, last_updated, fastener_id, seller_id) "
+        f"OVERRIDING SYSTEM VALUE "
+        f"SELECT id, price, quantity, last_updated, fastener_id, seller_id FROM {names['old']}"
+    )
+    schema_editor.execute(f"DROP TABLE {names['old']}")
+    for constraint in CONSTRAINTS:
+        schema_editor.execute(f"ALTER TABLE {table} {constraint.format(**names)}")
+    for index in INDEXES:
+        schema_editor.execute(index.format(**names))
+    schema_editor.execute(
+        f"SELECT setval(pg_get_serial_sequence(%s, 'id'), COALESCE(MAX(id), 0) + 1, false) FROM {table}",
+        [table],
+    )
+    schema_editor.execute(f"ANALYZE {table}")
+
+
+def partition_seller_fastener(apps, schema_editor):
+    rebuild_seller_fastener(schema_editor, tables(apps, schema_editor), partitioned=True)
+
+
+def unpartition_seller_fastener(apps, schema_editor):
+    rebuild_seller_fastener(schema_editor, tables(apps, schema_editor), partitioned=False)
+
+
+class Migration(migrations.Migration):
+    """
+    Hash-partition seller_fastener by seller_id. The model state is unchanged: Django keeps treating id as
+    the primary key, while the table's primary key becomes (id, seller_id) as partitioning requires.
+    """
+
+    dependencies = [
+        ("fastener_app", "0007_sellerstats"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            database_operations=[
+                migrations.RunPython(partition_seller_fastener, unpartition_seller_fastener),
+            ],
+        ),
+    ]
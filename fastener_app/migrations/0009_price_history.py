@@ -0,0 +1,119 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:34
+
+import datetime
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def create_price_history(apps, schema_editor):
+    """
+    Create price_history range-partitioned by month of valid_from, with partitions for the months of the
+    current offers, and record every current offer as its first history row.
+    """
+    quote_name = schema_editor.connection.ops.quote_name
+    # The model is only added to the migration state alongside this operation
+    table = quote_name(f'{settings.DB_SCHEMA}"."price_history')
+    seller = quote_name(apps.get_model("fastener_app", "Seller")._meta.db_table)
+    fastener = quote_name(apps.get_model("fastener_app", "Fastener")._meta.db_table)
+    seller_fastener = quote_name(apps.get_model("fastener_app", "SellerFastener")._meta.db_table)
+
+    # Unique constraints of a partitioned table must include the partition key
+    schema_editor.execute(
+        f"CREATE TABLE {table} ("
+        f"id bigint GENERATED BY DEFAULT AS IDENTITY, "
+        f"price numeric(10, 2) NOT NULL, "
+        f"quantity integer NOT NULL CONSTRAINT price_history_quantity_check CHECK (quantity >= 0), "
+        f"valid_from timestamp with time zone NOT NULL, "
+        f"fastener_id bigint NOT NULL CONSTRAINT price_history_fastener_id_fk_fastener_id "
+        f"REFERENCES {fastener} (id) DEFERRABLE INITIALLY DEFERRED, "
+        f"seller_id bigint NOT NULL CONSTRAINT price_history_seller_id_fk_seller_id "
+        f"REFERENCES {seller} (id) DEFERRABLE INITIALLY DEFERRED, "
+        f"CONSTRAINT price_history_pkey PRIMARY KEY (id, valid_from)"
+        f") PARTITION BY RANGE (valid_from)"
+    )
+    schema_editor.execute(f"CREATE INDEX price_history_as_of ON {table} (seller_id, fastener_id, valid_from)")
+    schema_editor.execute(f"CREATE INDEX price_history_series ON {table} (fastener_id, valid_from)")
+
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute(f"SELECT DISTINCT date_trunc('month', last_updated AT TIME ZONE 'UTC') FROM {seller_fastener}")
+        months = [month for month, in cursor.fetchall()]
+    for month in months:
+        next_month = (month.replace(day=28) + datetime.timedelta(days=4)).replace(day=1)
+        schema_editor.execute(
+            f'CREATE TABLE {table[:-1]}_y{month:%Y}m{month:%m}" PARTITION OF {table} '
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}+00') TO ('{next_month:%Y-%m-%d}+00')"
+        )
+    schema_editor.execute(
+        f"INSERT INTO {table} (seller_id, fastener_id, price, quantity, valid_from) "
+        f"SELECT seller_id, fastener_id, price, quantity, last_updated FROM {seller_fastener}"
+    )
+
+
+def drop_price_history(apps, schema_editor):
+    table = schema_editor.connection.ops.quote_name(f'{settings.DB_SCHEMA}"."price_history')
+    schema_editor.execute(f"DROP TABLE {table}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0008_partition_seller_fastener"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.CreateModel(
+                    name="PriceHistory",
+                    fields=[
+                        (
+                            "id",
+                            models.BigAutoField(
+                                auto_created=True,
+                                primary_key=True,
+                                serialize=False,
+                                verbose_name="ID",
+                            ),
+                        ),
+                        ("price", models.DecimalField(decimal_places=2, max_digits=10)),
+                        ("quantity", models.PositiveIntegerField(default=0)),
+                        ("valid_from", models.DateTimeField()),
+                        (
+                            "fastener",
+                            models.ForeignKey(
+                                db_index=False,
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="price_history",
+                                to="fastener_app.fastener",
+                            ),
+                        ),
+                        (
+                            "seller",
+                            models.ForeignKey(
+                                db_index=False,
+                                on_delete=django.db.models.deletion.CASCADE,
+                                related_name="price_history",
+                                to="fastener_app.seller",
+                            ),
+                        ),
+                    ],
+                    options={
+                        "db_table": f'{settings.DB_SCHEMA}"."price_history',
+                        "indexes": [
+                            models.Index(
+                                fields=["seller", "fastener", "valid_from"],
+                                name="price_history_as_of",
+                            ),
+                            models.Index(
+                                fields=["fastener", "valid_from"], name="price_history_series"
+                            ),
+                        ],
+                    },
+                ),
+            ],
+            database_operations=[
+                migrations.RunPython(create_price_history, drop_price_history),
+            ],
+        ),
+    ]
@@ -0,0 +1,67 @@
+from collections import defaultdict
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def canonical_key(metric_size_str, imperial_size_str):
+    return "|".join(" ".join((size_str or "").upper().split()) for size_str in (metric_size_str, imperial_size_str))
+
+
+def merge_duplicate_thread_sizes(apps, schema_editor):
+    """
+    Key every thread size, keep the oldest of the thread sizes sharing a key and move the fasteners and facet
+    counts of the others onto it before deleting them.
+    """
+    ThreadSize = apps.get_model("fastener_app", "ThreadSize")
+    Fastener = apps.get_model("fastener_app", "Fastener")
+    FacetCount = apps.get_model("fastener_app", "FacetCount")
+    db_alias = schema_editor.connection.alias
+
+    thread_sizes = list(ThreadSize.objects.using(db_alias).order_by("id"))
+    by_key = defaultdict(list)
+    for thread_size in thread_sizes:
+        thread_size.canonical_key = canonical_key(thread_size.metric_size_str, thread_size.imperial_size_str)
+        by_key[thread_size.canonical_key].append(thread_size)
+
+    for keeper, *duplicates in by_key.values():
+        if not duplicates:
+            continue
+        duplicate_ids = [thread_size.id for thread_size in duplicates]
+        Fastener.objects.using(db_alias).filter(thread_size_id__in=duplicate_ids).update(thread_size_id=keeper.id)
+        # Recount the keeper's facet combinations; the duplicates' equivalences go with them (same geometry)
+        FacetCount.objects.using(db_alias).filter(thread_size_id__in=[keeper.id, *duplicate_ids]).delete()
+        FacetCount.objects.using(db_alias).bulk_create(
+            FacetCount(**row)
+            for row in Fastener.objects.using(db_alias).filter(thread_size_id=keeper.id)
+            .values("thread_size_id", "material_id", "finish_id", "category_id")
+            .annotate(count=Count("id"))
+            .order_by()
+        )
+        ThreadSize.objects.using(db_alias).filter(id__in=duplicate_ids).delete()
+
+    ThreadSize.objects.using(db_alias).bulk_update(
+        [group[0] for group in by_key.values()], ["canonical_key"], batch_size=1000
+    )
+    # Check the deferred foreign keys now, the table cannot be altered with trigger events pending
+    schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0009_price_history"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="threadsize",
+            name="canonical_key",
+            field=models.CharField(max_length=101, null=True),
+        ),
+        migrations.RunPython(merge_duplicate_thread_sizes, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="threadsize",
+            name="canonical_key",
+            field=models.CharField(max_length=101, unique=True),
+        ),
+    ]
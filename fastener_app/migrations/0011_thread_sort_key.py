@@ -0,0 +1,80 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:42
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 10000
+INCH_TO_MM = 25.4
+
+
+def sort_key(thread_type, metric_size_num, imperial_size_num, thread_per_unit):
+    if not thread_per_unit:
+        return None
+    if str(thread_type).lower() == "imperial":
+        if not imperial_size_num:
+            return None
+        diameter, pitch = imperial_size_num * INCH_TO_MM, INCH_TO_MM / thread_per_unit
+    elif not metric_size_num:
+        return None
+    else:
+        diameter, pitch = metric_size_num, thread_per_unit
+    return round(diameter * 1000) * 10**6 + round(pitch * 1000)
+
+
+def backfill_thread_sort_keys(apps, schema_editor):
+    """
+    Compute the sort key of every thread size, then copy it onto the fasteners one id range at a time.
+    The migration is not atomic, so each batch commits on its own and holds its row locks briefly.
+    """
+    ThreadSize = apps.get_model("fastener_app", "ThreadSize")
+    Fastener = apps.get_model("fastener_app", "Fastener")
+    db_alias = schema_editor.connection.alias
+    thread_sizes = list(ThreadSize.objects.using(db_alias).all())
+    for thread_size in thread_sizes:
+        thread_size.sort_key = sort_key(thread_size.thread_type, thread_size.metric_size_num,
+                                        thread_size.imperial_size_num, thread_size.thread_per_unit)
+    ThreadSize.objects.using(db_alias).bulk_update(thread_sizes, ["sort_key"], batch_size=1000)
+
+    quote_name = schema_editor.connection.ops.quote_name
+    fastener = quote_name(Fastener._meta.db_table)
+    thread_size = quote_name(ThreadSize._meta.db_table)
+    last_id = Fastener.objects.using(db_alias).order_by("-id").values_list("id", flat=True).first() or 0
+    for start in range(0, last_id, BACKFILL_BATCH_SIZE):
+        schema_editor.execute(
+            f"UPDATE {fastener} f SET thread_sort_key = t.sort_key FROM {thread_size} t "
+            f"WHERE t.id = f.thread_size_id AND f.id > %s AND f.id <= %s",
+            [start, start + BACKFILL_BATCH_SIZE],
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("fastener_app", "0010_thread_size_canonical_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fastener",
+            name="thread_sort_key",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="threadsize",
+            name="sort_key",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_thread_sort_keys, migrations.RunPython.noop),
+        # Indexed after the backfill so the updates do not maintain it
+        migrations.AddIndex(
+            model_name="fastener",
+            index=models.Index(
+                fields=["thread_sort_key", "id"], name="fastener_thread_sort_key_id"
+            ),
+        ),
+        migrations.RemoveIndex(
+            model_name="threadsize",
+            name="thread_size_metric__7d5d1e_idx",
+        ),
+    ]
@@ -0,0 +1,75 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:43
+
+from django.db import migrations, models
+
+BACKFILL_BATCH_SIZE = 10000
+
+
+def backfill_dimension_names(apps, schema_editor):
+    """
+    Copy the material, finish and category names onto the fasteners one id range at a time, each range
+    committed separately like the thread sort key backfill of 0011.
+    """
+    quote_name = schema_editor.connection.ops.quote_name
+    Fastener = apps.get_model("fastener_app", "Fastener")
+    db_alias = schema_editor.connection.alias
+    fastener = quote_name(Fastener._meta.db_table)
+    material, finish, category = (
+        quote_name(apps.get_model("fastener_app", model)._meta.db_table) for model in ("Material", "Finish", "Category")
+    )
+    last_id = Fastener.objects.using(db_alias).order_by("-id").values_list("id", flat=True).first() or 0
+    for start in range(0, last_id, BACKFILL_BATCH_SIZE):
+        schema_editor.execute(
+            f"UPDATE {fastener} f SET material_name = m.name, finish_name = fi.name, category_name = c.name "
+            f"FROM {material} m, {finish} fi, {category} c "
+            f"WHERE m.id = f.material_id AND fi.id = f.finish_id AND c.id = f.category_id "
+            f"AND f.id > %s AND f.id <= %s",
+            [start, start + BACKFILL_BATCH_SIZE],
+        )
+
+
+class Migration(migrations.Migration):
+
+    atomic = False
+
+    dependencies = [
+        ("fastener_app", "0011_thread_sort_key"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="fastener",
+            name="category_name",
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name="fastener",
+            name="finish_name",
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.AddField(
+            model_name="fastener",
+            name="material_name",
+            field=models.CharField(blank=True, max_length=50, null=True),
+        ),
+        migrations.RunPython(backfill_dimension_names, migrations.RunPython.noop),
+        # Indexed after the backfill so the updates do not maintain them
+        migrations.AddIndex(
+            model_name="fastener",
+            index=models.Index(
+                fields=["material_name", "id"], name="fastener_material_name_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fastener",
+            index=models.Index(
+                fields=["finish_name", "id"], name="fastener_finish_name_id"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="fastener",
+            index=models.Index(
+                fields=["category_name", "id"], name="fastener_category_name_id"
+            ),
+        ),
+    ]
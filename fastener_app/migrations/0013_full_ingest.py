@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-19 13:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0012_dimension_sort_columns"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingestrun",
+            name="mode",
+            field=models.CharField(
+                choices=[("delta", "Delta"), ("full", "Full")],
+                default="delta",
+                max_length=5,
+            ),
+        ),
+        migrations.AddField(
+            model_name="ingestrun",
+            name="retired_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="sellerfastener",
+            name="last_ingest_run",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="offers",
+                to="fastener_app.ingestrun",
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def create_default_partition(apps, schema_editor):
+    """
+    Give price_history a DEFAULT partition, so history rows of a month whose partition was not created ahead
+    by create_price_history_partitions are still written instead of failing the ingest.
+    """
+    table = schema_editor.connection.ops.quote_name(f'{settings.DB_SCHEMA}"."price_history')
+    schema_editor.execute(f'CREATE TABLE {table[:-1]}_default" PARTITION OF {table} DEFAULT')
+
+
+def drop_default_partition(apps, schema_editor):
+    table = schema_editor.connection.ops.quote_name(f'{settings.DB_SCHEMA}"."price_history')
+    schema_editor.execute(f'DROP TABLE {table[:-1]}_default"')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("fastener_app", "0013_full_ingest"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_partition, drop_default_partition),
+    ]
@@ -1,7 +1,14 @@
+from fastener_app.models.best_offer import BestOffer
 from fastener_app.models.category import Category
+from fastener_app.models.facet_count import FacetCount
 from fastener_app.models.fastener import Fastener
 from fastener_app.models.finish import Finish
+from fastener_app.models.ingest_run import IngestRun
 from fastener_app.models.material import Material
+from fastener_app.models.price_history import PriceHistory
 from fastener_app.models.seller import Seller
 from fastener_app.models.seller_category import SellerFastener
+from fastener_app.models.seller_mapping_version import SellerMappingVersion
+from fastener_app.models.seller_stats import SellerStats
 from fastener_app.models.thread_size import ThreadSize
+from fastener_app.models.thread_size_equivalence import ThreadSizeEquivalence
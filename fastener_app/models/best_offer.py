@@ -0,0 +1,23 @@
+from django.db import models
+from django.conf import settings
+from fastener_app.models.fastener import Fastener
+from fastener_app.models.seller import Seller
+
+
+class BestOffer(models.Model):
+    """
+    Denormalized summary of the offers of a fastener: the cheapest in-stock offer, the total quantity and
+    the number of offers. Refreshed for the fasteners touched by every write to seller_fastener.
+    """
+    fastener = models.OneToOneField(Fastener, on_delete=models.CASCADE, primary_key=True, related_name='best_offer')
+    best_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    seller = models.ForeignKey(Seller, on_delete=models.SET_NULL, blank=True, null=True, related_name='best_offers')
+    total_quantity = models.PositiveBigIntegerField(default=0)
+    offer_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        db_table = f'{settings.DB_SCHEMA}"."best_offer'
+        indexes = [models.Index(name="best_offer_price", fields=['best_price', 'fastener'])]
+
+    def __str__(self):
+        return f"{self.fastener_id}: {self.best_price}"
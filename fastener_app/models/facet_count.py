@@ -0,0 +1,25 @@
+from django.db import models
+from django.conf import settings
+from fastener_app.models.category import Category
+from fastener_app.models.thread_size import ThreadSize
+from fastener_app.models.material import Material
+from fastener_app.models.finish import Finish
+
+
+class FacetCount(models.Model):
+    """
+    Pre-aggregated number of fasteners per (thread_size, material, finish, category) combination.
+    Kept up to date incrementally by ingest so facet counts never have to scan the fastener table.
+    """
+    thread_size = models.ForeignKey(ThreadSize, on_delete=models.CASCADE, related_name='facet_counts')
+    material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name='facet_counts')
+    finish = models.ForeignKey(Finish, on_delete=models.CASCADE, related_name='facet_counts')
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='facet_counts')
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = f'{settings.DB_SCHEMA}"."facet_count'
+        unique_together = ('thread_size', 'material', 'finish', 'category')
+
+    def __str__(self):
+        return f"{self.thread_size_id}/{self.material_id}/{self.finish_id}/{self.category_id}: {self.count}"
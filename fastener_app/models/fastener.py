@@ -12,13 +12,31 @@ class Fastener(models.Model):
     material = models.ForeignKey(Material, on_delete=models.CASCADE, related_name='fasteners')
     finish = models.ForeignKey(Finish, on_delete=models.CASCADE, related_name='fasteners')
     category = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='fasteners')
+    # Copy of thread_size.sort_key, so sort=thread_size is an index scan without joining thread_size
+    thread_sort_key = models.BigIntegerField(blank=True, null=True)
+    # Copies of the dimension names, so sorting by them is an index scan without joining the dimension table
+    material_name = models.CharField(max_length=50, blank=True, null=True)
+    finish_name = models.CharField(max_length=50, blank=True, null=True)
+    category_name = models.CharField(max_length=50, blank=True, null=True)
 
     def __str__(self):
         return f"{self.product_id} - {self.description}"
 
+    def save(self, *args, **kwargs):
+        self.thread_sort_key = self.thread_size.sort_key
+        self.material_name = self.material.name
+        self.finish_name = self.finish.name
+        self.category_name = self.category.name
+        super().save(*args, **kwargs)
+
     class Meta:
         db_table = f'{settings.DB_SCHEMA}"."fastener'
         indexes = [
-            models.Index(name="fastener_name", fields=['description']),
+            # Serves sort=description with the id tie-breaker as an index scan
+            models.Index(name="fastener_description_id", fields=['description', 'id']),
+            models.Index(name="fastener_thread_sort_key_id", fields=['thread_sort_key', 'id']),
+            models.Index(name="fastener_material_name_id", fields=['material_name', 'id']),
+            models.Index(name="fastener_finish_name_id", fields=['finish_name', 'id']),
+            models.Index(name="fastener_category_name_id", fields=['category_name', 'id']),
             models.Index(name="features", fields=['thread_size', 'material', 'finish', 'category'])
         ]
@@ -0,0 +1,34 @@
+from django.db import models
+from django.conf import settings
+from fastener_app.models.seller import Seller
+from fastener_app.models.seller_mapping_version import SellerMappingVersion
+
+
+class IngestRun(models.Model):
+    """
+    One CSV upload of a seller, pinned to the mapping version that was current when it started.
+    """
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+    STATUS_CHOICES = [(RUNNING, 'Running'), (SUCCEEDED, 'Succeeded'), (FAILED, 'Failed')]
+
+    # A delta upload only upserts its rows, a full one also retires the seller's offers missing from it
+    DELTA = 'delta'
+    FULL = 'full'
+    MODE_CHOICES = [(DELTA, 'Delta'), (FULL, 'Full')]
+
+    seller = models.ForeignKey(Seller, on_delete=models.CASCADE, related_name='ingest_runs')
+    mapping_version = models.ForeignKey(SellerMappingVersion, on_delete=models.CASCADE, related_name='ingest_runs')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=RUNNING)
+    mode = models.CharField(max_length=5, choices=MODE_CHOICES, default=DELTA)
+    row_count = models.PositiveIntegerField(default=0)
+    retired_count = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = f'{settings.DB_SCHEMA}"."ingest_run'
+
+    def __str__(self):
+        return f"{self.seller_id} run {self.id} ({self.status})"
@@ -1,5 +1,6 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from fastener_app.catalog_version import bump_dimension_version
 
 
 class Material(models.Model):
@@ -9,5 +10,19 @@ class Material(models.Model):
         db_table = f'{settings.DB_SCHEMA}"."material'
         indexes = [models.Index(fields=['name'])]
 
+    def save(self, *args, **kwargs):
+        adding = self._state.adding
+        super().save(*args, **kwargs)
+        if not adding:
+            # A rename is copied onto the fasteners' material_name
+            self.fasteners.exclude(material_name=self.name).update(material_name=self.name)
+        # Workers drop their cached dimensions once the insert or rename is visible
+        transaction.on_commit(bump_dimension_version)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(bump_dimension_version)
+        return result
+
     def __str__(self):
         return self.name
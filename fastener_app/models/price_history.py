@@ -0,0 +1,30 @@
+from django.db import models
+from django.conf import settings
+from fastener_app.models.fastener import Fastener
+from fastener_app.models.seller import Seller
+
+
+class PriceHistory(models.Model):
+    """
+    Append-only history of an offer's price and quantity. A row is added when an ingest changes either,
+    and stays valid until the next row of the same seller and fastener.
+    The table is range-partitioned by month of valid_from in the database (migration 0009), with (id, valid_from)
+    as its primary key. Monthly partitions are created ahead of time by the create_price_history_partitions
+    command; rows arriving before their month's partition exists land in the DEFAULT partition (migration 0014).
+    """
+    seller = models.ForeignKey(Seller, on_delete=models.CASCADE, related_name='price_history', db_index=False)
+    fastener = models.ForeignKey(Fastener, on_delete=models.CASCADE, related_name='price_history', db_index=False)
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    quantity = models.PositiveIntegerField(default=0)
+    valid_from = models.DateTimeField()
+
+    class Meta:
+        db_table = f'{settings.DB_SCHEMA}"."price_history'
+        indexes = [
+            # Serves "price at a seller as of T" as a backward index scan stopping at the first row
+            models.Index(name="price_history_as_of", fields=['seller', 'fastener', 'valid_from']),
+            models.Index(name="price_history_series", fields=['fastener', 'valid_from']),
+        ]
+
+    def __str__(self):
+        return f"{self.seller_id}/{self.fastener_id} {self.price} from {self.valid_from}"
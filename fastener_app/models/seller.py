@@ -8,6 +8,7 @@ class Seller(models.Model):
     phone_number = models.CharField(max_length=20, blank=True, null=True)
     address = models.TextField(blank=True, null=True)
     csv_mapping = models.JSONField(default=dict, blank=True, null=True)  # Stores CSV column mappings
+    mapping_version = models.PositiveIntegerField(default=0)  # Current SellerMappingVersion, 0 before the first
 
     class Meta:
         db_table = f'{settings.DB_SCHEMA}"."seller'
@@ -2,6 +2,7 @@ from django.db import models
 from django.conf import settings
 from fastener_app.models.seller import Seller
 from fastener_app.models.fastener import Fastener
+from fastener_app.models.ingest_run import IngestRun
 
 
 class SellerFastener(models.Model):
@@ -10,8 +11,12 @@ class SellerFastener(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     quantity = models.PositiveIntegerField(default=0)
     last_updated = models.DateTimeField(auto_now=True)
+    # The upload that last wrote the offer; a full upload retires the offers it did not write
+    last_ingest_run = models.ForeignKey(IngestRun, on_delete=models.SET_NULL, blank=True, null=True,
+                                        related_name='offers')
 
     class Meta:
+        # Hash-partitioned by seller_id in the database (migration 0008), with (id, seller_id) as its primary key
         db_table = f'{settings.DB_SCHEMA}"."seller_fastener'
         unique_together = ('seller', 'fastener')  # Ensures a seller-fastener pair is unique
 
@@ -0,0 +1,26 @@
+from django.db import models
+from django.conf import settings
+from fastener_app.models.seller import Seller
+
+
+class SellerMappingVersion(models.Model):
+    """
+    Immutable snapshot of a seller's csv_mapping. Every change of the mapping adds a version with the next
+    number, so anything derived from a mapping can be cached by (seller_id, version).
+    """
+    seller = models.ForeignKey(Seller, on_delete=models.CASCADE, related_name='mapping_versions')
+    version = models.PositiveIntegerField()
+    csv_mapping = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = f'{settings.DB_SCHEMA}"."seller_mapping_version'
+        unique_together = ('seller', 'version')
+
+    def save(self, *args, **kwargs):
+        if self.pk is not None:
+            raise ValueError("Seller mapping versions cannot be changed.")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"{self.seller_id} v{self.version}"
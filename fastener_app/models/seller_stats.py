@@ -0,0 +1,32 @@
+from decimal import Decimal
+from django.db import models
+from django.conf import settings
+from fastener_app.models.seller import Seller
+
+
+class SellerStats(models.Model):
+    """
+    Aggregates of a seller's offers: counts, total quantity, price range and sum, and a price histogram
+    over fastener_app.seller_stats.PRICE_HISTOGRAM_EDGES. Refreshed for the seller by every ingest.
+    """
+    seller = models.OneToOneField(Seller, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    offer_count = models.PositiveIntegerField(default=0)
+    in_stock_count = models.PositiveIntegerField(default=0)
+    total_quantity = models.PositiveBigIntegerField(default=0)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    price_sum = models.DecimalField(max_digits=20, decimal_places=2, default=0)
+    price_histogram = models.JSONField(default=dict)  # {bucket index: offer count}, empty buckets omitted
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = f'{settings.DB_SCHEMA}"."seller_stats'
+
+    @property
+    def average_price(self):
+        if not self.offer_count:
+            return None
+        return (self.price_sum / self.offer_count).quantize(Decimal('0.01'))
+
+    def __str__(self):
+        return f"{self.seller_id}: {self.offer_count} offers"
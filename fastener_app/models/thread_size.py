@@ -1,10 +1,14 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 from django.core.exceptions import ValidationError
 import re
 
 import fastener_app.models.constants as constants
+from fastener_app.catalog_version import bump_dimension_version
+from fastener_app.unit_converter import thread_geometry
 
+# The sort key is the diameter in microns times this scale plus the pitch in microns
+SORT_KEY_PITCH_SCALE = 10 ** 6
 
 
 class ThreadSize(models.Model):
@@ -22,6 +26,34 @@ class ThreadSize(models.Model):
     imperial_size_str = models.CharField(max_length=50, blank=True, null=True)  # e.g., "1/2-13"
     imperial_size_num = models.FloatField(blank=True, null=True)  # e.g., 0.5
     thread_per_unit = models.FloatField()  # Threads per unit (TPI or TPM)
+    # Normalized (metric_size_str, imperial_size_str) pair, e.g. "M12-1.75|1/2-44", that identifies a thread size
+    canonical_key = models.CharField(max_length=101, unique=True)
+    # Fixed-point (diameter, pitch) of either system in microns, e.g. 6350001270 for 1/4-20; None if incomplete
+    sort_key = models.BigIntegerField(blank=True, null=True)
+
+    @staticmethod
+    def make_canonical_key(metric_size_str, imperial_size_str):
+        """
+        Return the canonical key of a thread size: its size strings uppercased with whitespace collapsed.
+        """
+        return '|'.join(' '.join((size_str or '').upper().split()) for size_str in (metric_size_str, imperial_size_str))
+
+    @staticmethod
+    def make_sort_key(thread_type, metric_size_num, imperial_size_num, thread_per_unit):
+        """
+        Return the sort key of a thread size from its exact geometry, so 1/4" (6.35 mm) sorts after M6
+        instead of tying with it through the truncated metric_size_num. Returns None if the size is incomplete.
+        """
+        geometry = thread_geometry(thread_type, metric_size_num, imperial_size_num, thread_per_unit)
+        if geometry is None:
+            return None
+        diameter, pitch = geometry
+        return round(diameter * 1000) * SORT_KEY_PITCH_SCALE + round(pitch * 1000)
+
+    def fill_keys(self):
+        self.canonical_key = self.make_canonical_key(self.metric_size_str, self.imperial_size_str)
+        self.sort_key = self.make_sort_key(self.thread_type, self.metric_size_num, self.imperial_size_num,
+                                           self.thread_per_unit)
 
     def validate(self):
         """
@@ -55,11 +87,25 @@ class ThreadSize(models.Model):
     def save(self, *args, **kwargs):
         # Ensure the clean method is called before saving the model
         self.validate()
+        self.fill_keys()
+        adding = self._state.adding
         super().save(*args, **kwargs)
+        if not adding:
+            # Keep the sort key denormalized on the fasteners in sync
+            self.fasteners.exclude(thread_sort_key=self.sort_key).update(thread_sort_key=self.sort_key)
+        # Workers drop their cached dimensions once the insert or change is visible
+        transaction.on_commit(bump_dimension_version)
+
+    def delete(self, *args, **kwargs):
+        result = super().delete(*args, **kwargs)
+        transaction.on_commit(bump_dimension_version)
+        return result
 
     class Meta:
         db_table = f'{settings.DB_SCHEMA}"."thread_size'
-        indexes = [models.Index(fields=['name'])]
+        indexes = [
+            models.Index(fields=['name']),
+        ]
 
     def __str__(self):
         return self.name
@@ -0,0 +1,19 @@
+from django.db import models
+from django.conf import settings
+from fastener_app.models.thread_size import ThreadSize
+
+
+class ThreadSizeEquivalence(models.Model):
+    """
+    Pair of thread sizes whose diameter and pitch agree within THREAD_EQUIVALENCE_TOLERANCE, e.g. a metric
+    size and its imperial counterpart. Every thread size is listed as equivalent to itself.
+    """
+    thread_size = models.ForeignKey(ThreadSize, on_delete=models.CASCADE, related_name='equivalences')
+    equivalent = models.ForeignKey(ThreadSize, on_delete=models.CASCADE, related_name='+')
+
+    class Meta:
+        db_table = f'{settings.DB_SCHEMA}"."thread_size_equivalence'
+        unique_together = ('thread_size', 'equivalent')
+
+    def __str__(self):
+        return f"{self.thread_size_id} ~ {self.equivalent_id}"
@@ -0,0 +1,81 @@
+import logging
+from functools import partial
+from django.db import connection, transaction
+from fastener_app.catalog_version import bump_catalog_version
+from fastener_app.list_cache import invalidate_fasteners
+from fastener_app.models import PriceHistory, Seller, SellerFastener, SellerStats
+from fastener_app.offers import refresh_best_offers
+
+logger = logging.getLogger(__name__)
+
+OFFBOARD_BATCH_SIZE = 10000
+
+
+def delete_offer_batch(seller_id, batch_size):
+    """
+    Delete up to `batch_size` offers of a seller with one statement and return the ids of their fasteners.
+    """
+    seller_fastener = connection.ops.quote_name(SellerFastener._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            # The seller_id predicate on both sides keeps the statement on the seller's partition
+            f"DELETE FROM {seller_fastener} WHERE seller_id = %s AND id IN ("
+            f"SELECT id FROM {seller_fastener} WHERE seller_id = %s LIMIT %s) "
+            f"RETURNING fastener_id",
+            [seller_id, seller_id, batch_size],
+        )
+        return [fastener_id for fastener_id, in cursor.fetchall()]
+
+
+def delete_price_history_batch(seller_id, batch_size):
+    """
+    Delete up to `batch_size` price history rows of a seller with one statement and return how many were deleted.
+    """
+    price_history = connection.ops.quote_name(PriceHistory._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {price_history} WHERE (id, valid_from) IN ("
+            f"SELECT id, valid_from FROM {price_history} WHERE seller_id = %s LIMIT %s)",
+            [seller_id, batch_size],
+        )
+        return cursor.rowcount
+
+
+def offboard_seller(seller_id, batch_size=OFFBOARD_BATCH_SIZE, progress=None):
+    """
+    Delete a seller with all its offers and price history without loading them into Python.
+    Offers are deleted in batches of `batch_size`, each in its own transaction together with the refresh of
+    the best offers of its fasteners and, once committed, the catalog version bump and list cache invalidation,
+    so locks stay short, readers never see offers that are gone, and an interrupted run can simply be restarted.
+    `progress(deleted, total)` is called after each batch. Return the number of deleted offers.
+    """
+    seller = Seller.objects.get(id=seller_id)
+    stats = SellerStats.objects.filter(seller=seller).first()
+    total = stats.offer_count if stats else SellerFastener.objects.filter(seller=seller).count()
+
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            fastener_ids = delete_offer_batch(seller.id, batch_size)
+            refresh_best_offers(set(fastener_ids))
+            if fastener_ids:
+                # Lists and ETags stop showing the batch as soon as it is gone, not once the whole seller is
+                transaction.on_commit(bump_catalog_version)
+                transaction.on_commit(partial(invalidate_fasteners, set(fastener_ids), offers_only=True))
+        if not fastener_ids:
+            break
+        deleted += len(fastener_ids)
+        logger.info(f"Offboarding seller {seller.id}: deleted {deleted} of {total} offers.")
+        if progress:
+            progress(deleted, max(total, deleted))
+
+    # The price history is deleted the same way, it no longer affects any offer
+    while True:
+        with transaction.atomic():
+            if not delete_price_history_batch(seller.id, batch_size):
+                break
+
+    with transaction.atomic():
+        # Only small per-seller rows remain for the collector (mapping versions, ingest runs, stats)
+        seller.delete()
+    return deleted
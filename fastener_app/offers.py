@@ -0,0 +1,73 @@
+from django.db import connection
+from django.db.models import Count, F, Min, Q, Sum, Window
+from django.db.models.functions import Coalesce
+from fastener_app.models import BestOffer, SellerFastener
+
+# Annotations added to fasteners by annotate_offer_summary
+OFFER_SUMMARY_FIELDS = ['min_price', 'best_seller_id', 'seller_count', 'total_quantity']
+
+
+def annotate_offer_summary(queryset):
+    """
+    Annotate a Fastener queryset with the cheapest in-stock price and its seller, the number of sellers
+    and the total quantity of its offers, read from the best_offer table.
+    """
+    return queryset.annotate(
+        min_price=F('best_offer__best_price'),
+        best_seller_id=F('best_offer__seller_id'),
+        seller_count=Coalesce(F('best_offer__offer_count'), 0),
+        total_quantity=Coalesce(F('best_offer__total_quantity'), 0),
+    )
+
+
+def refresh_best_offers(fastener_ids=None):
+    """
+    Recompute the best_offer rows of the given fasteners from seller_fastener with set-based SQL,
+    or rebuild the whole table when `fastener_ids` is None.
+    """
+    if fastener_ids is not None:
+        fastener_ids = list(fastener_ids)
+        if not fastener_ids:
+            return
+
+    best_offer = connection.ops.quote_name(BestOffer._meta.db_table)
+    seller_fastener = connection.ops.quote_name(SellerFastener._meta.db_table)
+    scope, params = '', []
+    if fastener_ids is not None:
+        scope, params = 'AND fastener_id = ANY(%s)', [fastener_ids]
+
+    with connection.cursor() as cursor:
+        # Fasteners without any offer left lose their row
+        cursor.execute(
+            f"DELETE FROM {best_offer} WHERE TRUE {scope} AND NOT EXISTS ("
+            f"SELECT 1 FROM {seller_fastener} sf WHERE sf.fastener_id = {best_offer}.fastener_id)",
+            params,
+        )
+        cursor.execute(
+            f"INSERT INTO {best_offer} (fastener_id, best_price, seller_id, total_quantity, offer_count) "
+            f"SELECT summary.fastener_id, cheapest.price, cheapest.seller_id, summary.total_quantity, summary.offer_count "
+            f"FROM (SELECT fastener_id, SUM(quantity) AS total_quantity, COUNT(*) AS offer_count "
+            f"      FROM {seller_fastener} WHERE TRUE {scope} GROUP BY fastener_id) summary "
+            f"LEFT JOIN (SELECT DISTINCT ON (fastener_id) fastener_id, price, seller_id "
+            f"           FROM {seller_fastener} WHERE quantity > 0 {scope} "
+            f"           ORDER BY fastener_id, price, seller_id) cheapest "
+            f"ON cheapest.fastener_id = summary.fastener_id "
+            f"ON CONFLICT (fastener_id) DO UPDATE SET best_price = EXCLUDED.best_price, seller_id = EXCLUDED.seller_id, "
+            f"total_quantity = EXCLUDED.total_quantity, offer_count = EXCLUDED.offer_count",
+            params * 2,
+        )
+
+
+def get_offers(fastener_id):
+    """
+    Return the offers of a fastener, cheapest first, each annotated with the offer summary of the fastener
+    computed by window functions so offers and summary come back in a single query.
+    """
+    partition = {'partition_by': [F('fastener_id')]}
+    return SellerFastener.objects.filter(fastener_id=fastener_id).select_related('seller').only(
+        'id', 'price', 'quantity', 'last_updated', 'fastener_id', 'seller__name'
+    ).annotate(
+        min_price=Window(Min('price', filter=Q(quantity__gt=0)), **partition),
+        seller_count=Window(Count('seller_id'), **partition),
+        total_quantity=Window(Sum('quantity'), **partition),
+    ).order_by('price', 'seller_id')
@@ -0,0 +1,134 @@
+import datetime
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+from fastener_app.models import PriceHistory, SellerFastener
+
+
+def month_bounds(moment):
+    """
+    Return the UTC start of the month of `moment` and the start of the next month.
+    """
+    start = moment.astimezone(datetime.timezone.utc).replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = (start + datetime.timedelta(days=32)).replace(day=1)
+    return start, end
+
+
+def price_history_partition(suffix):
+    """
+    Return the quoted name of a partition of price_history, e.g. for suffix 'y2026m01' or 'default'.
+    """
+    return f'{connection.ops.quote_name(PriceHistory._meta.db_table)[:-1]}_{suffix}"'
+
+
+def price_history_partition_exists(start):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [price_history_partition(f"y{start:%Y}m{start:%m}")])
+        return cursor.fetchone()[0]
+
+
+def ensure_price_history_partition(moment):
+    """
+    Create the monthly partition of price_history holding `moment` unless it exists, moving into it the rows
+    the DEFAULT partition received for that month. Return True if it was created.
+
+    Meant to run ahead of the month from create_price_history_partitions, in a short transaction of its own:
+    attaching the partition locks the DEFAULT partition. A partition created concurrently is not an error.
+    """
+    start, end = month_bounds(moment)
+    if price_history_partition_exists(start):
+        return False
+    table = connection.ops.quote_name(PriceHistory._meta.db_table)
+    partition = price_history_partition(f"y{start:%Y}m{start:%m}")
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"CREATE TABLE {partition} (LIKE {table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+            cursor.execute(
+                f"WITH moved AS (DELETE FROM {price_history_partition('default')} "
+                f"               WHERE valid_from >= %s AND valid_from < %s RETURNING *) "
+                f"INSERT INTO {partition} SELECT * FROM moved",
+                [start, end],
+            )
+            cursor.execute(
+                f"ALTER TABLE {table} ATTACH PARTITION {partition} "
+                f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+    except DatabaseError:
+        if price_history_partition_exists(start):
+            return False
+        raise
+    return True
+
+
+def record_price_history(seller_id, fastener_ids):
+    """
+    Append a price_history row for each offer of the seller on the given fasteners whose price or quantity
+    differs from its latest history row, in one INSERT ... SELECT. Return the number of rows added.
+    """
+    fastener_ids = list(fastener_ids)
+    if not fastener_ids:
+        return 0
+
+    valid_from = timezone.now()
+    price_history = connection.ops.quote_name(PriceHistory._meta.db_table)
+    seller_fastener = connection.ops.quote_name(SellerFastener._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {price_history} (seller_id, fastener_id, price, quantity, valid_from) "
+            f"SELECT sf.seller_id, sf.fastener_id, sf.price, sf.quantity, %s FROM {seller_fastener} sf "
+            f"LEFT JOIN LATERAL (SELECT price, quantity FROM {price_history} h "
+            f"                   WHERE h.seller_id = sf.seller_id AND h.fastener_id = sf.fastener_id "
+            f"                   ORDER BY h.valid_from DESC LIMIT 1) latest ON TRUE "
+            f"WHERE sf.seller_id = %s AND sf.fastener_id = ANY(%s) "
+            f"AND (latest.price IS DISTINCT FROM sf.price OR latest.quantity IS DISTINCT FROM sf.quantity)",
+            [valid_from, seller_id, fastener_ids],
+        )
+        return cursor.rowcount
+
+
+def record_retired_offers(seller_id, offers):
+    """
+    Append a zero-quantity price_history row closing each deleted offer of the seller, given as
+    (fastener_id, price) pairs, unless its latest history row already has no quantity, so that as-of lookups
+    stop reporting it as available. Return the number of rows added.
+    """
+    if not offers:
+        return 0
+
+    price_history = connection.ops.quote_name(PriceHistory._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {price_history} (seller_id, fastener_id, price, quantity, valid_from) "
+            f"SELECT %s, retired.fastener_id, retired.price, 0, %s "
+            f"FROM unnest(%s::bigint[], %s::numeric[]) retired (fastener_id, price) "
+            f"LEFT JOIN LATERAL (SELECT quantity FROM {price_history} h "
+            f"                   WHERE h.seller_id = %s AND h.fastener_id = retired.fastener_id "
+            f"                   ORDER BY h.valid_from DESC LIMIT 1) latest ON TRUE "
+            f"WHERE latest.quantity IS DISTINCT FROM 0",
+            [seller_id, timezone.now(), [fastener_id for fastener_id, _ in offers], [price for _, price in offers],
+             seller_id],
+        )
+        return cursor.rowcount
+
+
+def price_as_of(seller_id, fastener_id, moment):
+    """
+    Return the PriceHistory row of an offer valid at `moment`, or None before its first row.
+    """
+    return PriceHistory.objects.filter(
+        seller_id=seller_id, fastener_id=fastener_id, valid_from__lte=moment
+    ).order_by('-valid_from').first()
+
+
+def price_series(fastener_id, seller_id=None, since=None, until=None):
+    """
+    Return the PriceHistory rows of a fastener, optionally of one seller and within [since, until],
+    ordered by time.
+    """
+    queryset = PriceHistory.objects.filter(fastener_id=fastener_id)
+    if seller_id is not None:
+        queryset = queryset.filter(seller_id=seller_id)
+    if since is not None:
+        queryset = queryset.filter(valid_from__gte=since)
+    if until is not None:
+        queryset = queryset.filter(valid_from__lte=until)
+    return queryset.order_by('valid_from', 'seller_id')
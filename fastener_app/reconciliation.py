@@ -0,0 +1,67 @@
+import logging
+from functools import partial
+from django.db import connection, transaction
+from fastener_app.list_cache import invalidate_fasteners
+from fastener_app.models import SellerFastener
+from fastener_app.offers import refresh_best_offers
+from fastener_app.price_history import record_price_history, record_retired_offers
+
+logger = logging.getLogger(__name__)
+
+RETIRE_BATCH_SIZE = 10000
+
+# How a full upload retires the offers missing from it
+RETIRE_ZERO = 'zero'
+RETIRE_DELETE = 'delete'
+RETIRE_ACTIONS = (RETIRE_ZERO, RETIRE_DELETE)
+
+
+def retire_offer_batch(seller_id, ingest_run_id, action, batch_size):
+    """
+    Zero the quantity of, or delete, up to `batch_size` offers of a seller that the ingest run did not write,
+    with one statement, and return their (fastener_id, price). Offers already out of stock are not zeroed again.
+    """
+    seller_fastener = connection.ops.quote_name(SellerFastener._meta.db_table)
+    # The seller_id predicate on both sides keeps the statement on the seller's partition
+    stale = (
+        f"SELECT id FROM {seller_fastener} WHERE seller_id = %s "
+        f"AND last_ingest_run_id IS DISTINCT FROM %s {'AND quantity > 0' if action == RETIRE_ZERO else ''} LIMIT %s"
+    )
+    if action == RETIRE_ZERO:
+        statement = f"UPDATE {seller_fastener} SET quantity = 0, last_updated = now() "
+    else:
+        statement = f"DELETE FROM {seller_fastener} "
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"{statement} WHERE seller_id = %s AND id IN ({stale}) RETURNING fastener_id, price",
+            [seller_id, seller_id, ingest_run_id, batch_size],
+        )
+        return cursor.fetchall()
+
+
+def retire_stale_offers(seller_id, ingest_run_id, action=RETIRE_ZERO, batch_size=RETIRE_BATCH_SIZE):
+    """
+    Retire the offers of a seller that a full ingest run did not write, batch by batch without loading them.
+    Each batch commits on its own with the refresh of the best offers of its fasteners and their price history,
+    a deleted offer getting a closing zero-quantity row, then invalidates the cached lists of their offers.
+    Return the number of retired offers.
+    """
+    if action not in RETIRE_ACTIONS:
+        raise ValueError(f"Invalid retire action '{action}'. Use 'zero' or 'delete'.")
+
+    retired = 0
+    while True:
+        with transaction.atomic():
+            offers = retire_offer_batch(seller_id, ingest_run_id, action, batch_size)
+            batch = {fastener_id for fastener_id, _ in offers}
+            if action == RETIRE_ZERO:
+                record_price_history(seller_id, batch)
+            else:
+                record_retired_offers(seller_id, offers)
+            refresh_best_offers(batch)
+            transaction.on_commit(partial(invalidate_fasteners, batch, offers_only=True))
+        if not batch:
+            break
+        retired += len(offers)
+        logger.info(f"Ingest run {ingest_run_id}: retired {retired} offers of seller {seller_id}.")
+    return retired
@@ -0,0 +1,176 @@
+import csv
+import datetime
+import decimal
+import io
+import msgpack
+import pyarrow as pa
+from rest_framework.renderers import BaseRenderer
+
+
+class ColumnarData:
+    """
+    Tabular response data held as one sequence per column, so it can be built straight from
+    `values_list()` results without materializing a dict per row.
+    """
+
+    def __init__(self, names, columns):
+        self.names = list(names)
+        self.columns = [list(column) for column in columns]
+
+    @classmethod
+    def from_rows(cls, names, rows):
+        names = list(names)
+        columns = list(zip(*rows)) or [[] for _ in names]
+        return cls(names, columns)
+
+    def rows(self):
+        return zip(*self.columns)
+
+    def __len__(self):
+        return len(self.columns[0]) if self.columns else 0
+
+
+def flatten_dict(data, prefix=''):
+    """
+    Flatten nested dictionaries into dotted keys, e.g. {'material': {'name': 'Steel'}} -> {'material.name': 'Steel'}.
+    """
+    flat = {}
+    for key, value in data.items():
+        if isinstance(value, dict):
+            flat.update(flatten_dict(value, f"{prefix}{key}."))
+        else:
+            flat[f"{prefix}{key}"] = value
+    return flat
+
+
+def to_columnar(data):
+    """
+    Convert serializer output (a dict or a list of dicts) into ColumnarData.
+    """
+    if isinstance(data, ColumnarData):
+        return data
+    if isinstance(data, dict):
+        data = [data]
+    rows = [flatten_dict(item) for item in data]
+    names = list(dict.fromkeys(key for row in rows for key in row))
+    return ColumnarData(names, ([row.get(name) for row in rows] for name in names))
+
+
+def encode_msgpack_value(value):
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not MessagePack serializable")
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Render the same document as JSONRenderer, encoded as MessagePack.
+    """
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        if isinstance(data, ColumnarData):
+            data = [dict(zip(data.names, row)) for row in data.rows()]
+        return msgpack.packb(data, default=encode_msgpack_value, use_bin_type=True)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Render tabular data as CSV, nested fields become dotted column names (e.g. 'thread_size.name').
+    """
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        table = to_columnar(data)
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(table.names)
+        writer.writerows(table.rows())
+        return output.getvalue().encode(self.charset)
+
+
+def build_record_batch(table):
+    """
+    Build an Arrow record batch with one array per column of a ColumnarData.
+    """
+    return pa.RecordBatch.from_arrays([pa.array(column) for column in table.columns], names=table.names)
+
+
+class ArrowRenderer(BaseRenderer):
+    """
+    Render tabular data as an Arrow IPC stream built column by column.
+    """
+    media_type = 'application/vnd.apache.arrow.stream'
+    format = 'arrow'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        batch = build_record_batch(to_columnar(data))
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, batch.schema) as writer:
+            writer.write_batch(batch)
+        return sink.getvalue().to_pybytes()
+
+
+def chunked(rows, chunk_size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(names, rows, chunk_size=10000):
+    """
+    Yield a CSV document chunk by chunk from an iterable of row tuples, for a StreamingHttpResponse.
+    """
+    output = io.StringIO()
+    writer = csv.writer(output)
+    writer.writerow(names)
+    for chunk in chunked(rows, chunk_size):
+        writer.writerows(chunk)
+        yield output.getvalue().encode('utf-8')
+        output.seek(0)
+        output.truncate()
+    if output.tell():
+        yield output.getvalue().encode('utf-8')
+
+
+def stream_arrow(schema, rows, chunk_size=10000):
+    """
+    Yield an Arrow IPC stream with one record batch per chunk of row tuples, for a StreamingHttpResponse.
+    """
+    sink = io.BytesIO()
+
+    def flush():
+        data = sink.getvalue()
+        sink.seek(0)
+        sink.truncate()
+        return data
+
+    with pa.ipc.new_stream(sink, schema) as writer:
+        yield flush()
+        for chunk in chunked(rows, chunk_size):
+            columns = zip(*chunk)
+            writer.write_batch(pa.RecordBatch.from_arrays(
+                [pa.array(column, type=field.type) for column, field in zip(columns, schema)], schema=schema
+            ))
+            yield flush()
+    yield flush()
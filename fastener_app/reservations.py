@@ -0,0 +1,142 @@
+from collections import Counter
+from contextlib import nullcontext
+from functools import partial
+from django.db import connection, transaction
+from fastener_app.catalog_version import bump_catalog_version
+from fastener_app.list_cache import invalidate_fasteners
+from fastener_app.models import BestOffer, SellerFastener
+from fastener_app.offers import refresh_best_offers
+
+
+class InsufficientStock(Exception):
+    """
+    Raised when some lines of a reservation exceed the stock of their offer. `lines` lists
+    (seller_id, fastener_id, requested, available) for each of them, available being 0 for a missing offer.
+    """
+
+    def __init__(self, lines):
+        super().__init__("Insufficient stock.")
+        self.lines = lines
+
+
+def merge_lines(lines):
+    """
+    Sum the quantities of repeated (seller_id, fastener_id) lines, which one UPDATE could only apply once.
+    """
+    merged = Counter()
+    for seller_id, fastener_id, quantity in lines:
+        merged[seller_id, fastener_id] += quantity
+    return merged
+
+
+def adjust_stock(merged, sign):
+    """
+    Add `sign * quantity` to the quantity of each offer of `merged` and to the total quantity of its fastener's
+    best_offer in one statement, and return {(seller_id, fastener_id): new quantity} for the offers it changed.
+    Decrements only apply where the stock covers them. The offers, then the best offers, are locked in key order
+    first, so concurrent batches sharing either queue on them in the same order instead of deadlocking.
+    """
+    seller_fastener = connection.ops.quote_name(SellerFastener._meta.db_table)
+    best_offer = connection.ops.quote_name(BestOffer._meta.db_table)
+    values = ', '.join(['(%s::bigint, %s::bigint, %s::integer)'] * len(merged))
+    params = [value for (seller_id, fastener_id), quantity in merged.items()
+              for value in (seller_id, fastener_id, quantity)]
+    condition = 'AND sf.quantity >= locked.quantity' if sign < 0 else ''
+    operator = '-' if sign < 0 else '+'
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"WITH wanted (seller_id, fastener_id, quantity) AS (VALUES {values}), "
+            f"locked AS (SELECT sf.id, sf.seller_id, wanted.quantity FROM {seller_fastener} sf "
+            f"           JOIN wanted ON sf.seller_id = wanted.seller_id AND sf.fastener_id = wanted.fastener_id "
+            f"           ORDER BY sf.seller_id, sf.fastener_id FOR UPDATE OF sf), "
+            f"changed AS (UPDATE {seller_fastener} sf SET quantity = sf.quantity {operator} locked.quantity, "
+            f"            last_updated = now() "
+            f"            FROM locked WHERE sf.id = locked.id AND sf.seller_id = locked.seller_id {condition} "
+            f"            RETURNING sf.seller_id, sf.fastener_id, sf.quantity, locked.quantity AS delta), "
+            f"totals AS (UPDATE {best_offer} bo SET total_quantity = bo.total_quantity {operator} deltas.delta "
+            f"           FROM (SELECT b.fastener_id, d.delta FROM {best_offer} b "
+            f"                 JOIN (SELECT fastener_id, SUM(delta) AS delta FROM changed GROUP BY fastener_id) d "
+            f"                 ON d.fastener_id = b.fastener_id "
+            f"                 ORDER BY b.fastener_id FOR UPDATE OF b) deltas "
+            f"           WHERE bo.fastener_id = deltas.fastener_id) "
+            f"SELECT seller_id, fastener_id, quantity FROM changed",
+            params,
+        )
+        return {(seller_id, fastener_id): quantity for seller_id, fastener_id, quantity in cursor.fetchall()}
+
+
+def available_stock(keys):
+    """
+    Return {(seller_id, fastener_id): quantity} of the existing offers among `keys`.
+    """
+    seller_fastener = connection.ops.quote_name(SellerFastener._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT seller_id, fastener_id, quantity FROM {seller_fastener} "
+            f"WHERE (seller_id, fastener_id) IN (SELECT * FROM unnest(%s::bigint[], %s::bigint[]))",
+            [[seller_id for seller_id, _ in keys], [fastener_id for _, fastener_id in keys]],
+        )
+        return {(seller_id, fastener_id): quantity for seller_id, fastener_id, quantity in cursor.fetchall()}
+
+
+def refresh_offers(fastener_ids, restocked_ids):
+    """
+    Refresh the best offers of the fasteners with an offer that went out of or back into stock: only then can
+    the cheapest in-stock offer change, adjust_stock() already applied the quantities to the total of the others.
+    Then invalidate the cached lists showing the offers of every changed fastener.
+    """
+    if restocked_ids:
+        refresh_best_offers(restocked_ids)
+    if fastener_ids:
+        transaction.on_commit(bump_catalog_version)
+        transaction.on_commit(partial(invalidate_fasteners, fastener_ids, offers_only=True))
+
+
+def reserve_stock(lines):
+    """
+    Reserve (seller_id, fastener_id, quantity) lines against the offers' stock, all or nothing, with one
+    conditional UPDATE ... SET quantity = quantity - n WHERE quantity >= n. Return the remaining quantity per
+    (seller_id, fastener_id). Raises InsufficientStock, reserving nothing, if any line cannot be covered.
+    """
+    merged = merge_lines(lines)
+    if not merged:
+        return {}
+    # A single line is one statement that applies or not, it needs no transaction of its own
+    with transaction.atomic() if len(merged) > 1 else nullcontext():
+        remaining = adjust_stock(merged, -1)
+        if len(remaining) == len(merged):
+            refresh_offers({fastener_id for _, fastener_id in remaining},
+                           {fastener_id for (_, fastener_id), quantity in remaining.items() if quantity == 0})
+            return remaining
+        if remaining:
+            # Roll the covered lines back before reading what was short
+            transaction.set_rollback(True)
+
+    available = available_stock([key for key in merged if key not in remaining])
+    raise InsufficientStock([
+        (seller_id, fastener_id, quantity, available.get((seller_id, fastener_id), 0))
+        for (seller_id, fastener_id), quantity in merged.items() if (seller_id, fastener_id) not in remaining
+    ])
+
+
+def release_stock(lines):
+    """
+    Return previously reserved (seller_id, fastener_id, quantity) lines to the offers' stock, all or nothing,
+    with one UPDATE ... SET quantity = quantity + n. Return the new quantity per (seller_id, fastener_id).
+    Raises ValueError, releasing nothing, if an offer does not exist.
+    """
+    merged = merge_lines(lines)
+    if not merged:
+        return {}
+    with transaction.atomic():
+        stock = adjust_stock(merged, 1)
+        missing = [key for key in merged if key not in stock]
+        if missing:
+            raise ValueError("Unknown offers: " + ', '.join(
+                f"seller {seller_id} fastener {fastener_id}" for seller_id, fastener_id in missing
+            ) + ".")
+        # An offer whose new quantity is the released one was out of stock
+        refresh_offers({fastener_id for _, fastener_id in stock},
+                       {fastener_id for (seller_id, fastener_id), quantity in stock.items()
+                        if quantity == merged[seller_id, fastener_id]})
+    return stock
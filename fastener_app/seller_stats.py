@@ -0,0 +1,69 @@
+from decimal import Decimal
+from django.db import connection
+from fastener_app.models import SellerFastener, SellerStats
+
+# Upper bounds of the price histogram buckets; a last bucket holds the prices above the last edge.
+# Stored histograms hold bucket indexes, so run rebuild_seller_stats after changing them.
+PRICE_HISTOGRAM_EDGES = tuple(Decimal(edge) for edge in (
+    '0.10', '0.25', '0.50', '1', '2.50', '5', '10', '25', '50', '100', '250', '500', '1000',
+))
+
+
+def refresh_seller_stats(seller_ids=None):
+    """
+    Recompute the seller_stats rows of the given sellers from seller_fastener with set-based SQL,
+    or rebuild the whole table when `seller_ids` is None.
+    """
+    if seller_ids is not None:
+        seller_ids = list(seller_ids)
+        if not seller_ids:
+            return
+
+    seller_stats = connection.ops.quote_name(SellerStats._meta.db_table)
+    seller_fastener = connection.ops.quote_name(SellerFastener._meta.db_table)
+    scope, params = '', []
+    if seller_ids is not None:
+        scope, params = 'AND seller_id = ANY(%s)', [seller_ids]
+
+    with connection.cursor() as cursor:
+        # Sellers without any offer left lose their row
+        cursor.execute(
+            f"DELETE FROM {seller_stats} WHERE TRUE {scope} AND NOT EXISTS ("
+            f"SELECT 1 FROM {seller_fastener} sf WHERE sf.seller_id = {seller_stats}.seller_id)",
+            params,
+        )
+        # width_bucket() returns i for prices in [edge i-1, edge i), 0 below the first edge
+        cursor.execute(
+            f"INSERT INTO {seller_stats} (seller_id, offer_count, in_stock_count, total_quantity, min_price, max_price, "
+            f"price_sum, price_histogram, updated_at) "
+            f"SELECT summary.seller_id, summary.offer_count, summary.in_stock_count, summary.total_quantity, "
+            f"summary.min_price, summary.max_price, summary.price_sum, histogram.price_histogram, now() "
+            f"FROM (SELECT seller_id, COUNT(*) AS offer_count, COUNT(*) FILTER (WHERE quantity > 0) AS in_stock_count, "
+            f"      SUM(quantity) AS total_quantity, MIN(price) AS min_price, MAX(price) AS max_price, "
+            f"      SUM(price) AS price_sum "
+            f"      FROM {seller_fastener} WHERE TRUE {scope} GROUP BY seller_id) summary "
+            f"JOIN (SELECT seller_id, jsonb_object_agg(bucket, offer_count) AS price_histogram "
+            f"      FROM (SELECT seller_id, width_bucket(price, %s::numeric[]) AS bucket, COUNT(*) AS offer_count "
+            f"            FROM {seller_fastener} WHERE TRUE {scope} GROUP BY seller_id, bucket) buckets "
+            f"      GROUP BY seller_id) histogram "
+            f"ON histogram.seller_id = summary.seller_id "
+            f"ON CONFLICT (seller_id) DO UPDATE SET offer_count = EXCLUDED.offer_count, "
+            f"in_stock_count = EXCLUDED.in_stock_count, total_quantity = EXCLUDED.total_quantity, "
+            f"min_price = EXCLUDED.min_price, max_price = EXCLUDED.max_price, price_sum = EXCLUDED.price_sum, "
+            f"price_histogram = EXCLUDED.price_histogram, updated_at = EXCLUDED.updated_at",
+            params + [list(PRICE_HISTOGRAM_EDGES)] + params,
+        )
+
+
+def price_histogram(stats):
+    """
+    Return the histogram of a SellerStats as [{'min': ..., 'max': ..., 'count': ...}] over every bucket,
+    'min' being None for the first bucket and 'max' None for the last.
+    """
+    lower_bounds = (None,) + PRICE_HISTOGRAM_EDGES
+    upper_bounds = PRICE_HISTOGRAM_EDGES + (None,)
+    counts = stats.price_histogram if stats else {}
+    return [
+        {'min': lower, 'max': upper, 'count': counts.get(str(bucket), 0)}
+        for bucket, (lower, upper) in enumerate(zip(lower_bounds, upper_bounds))
+    ]
@@ -1,8 +1,50 @@
+from functools import lru_cache
+from django.db.models import Q
 from rest_framework import serializers
-from .models import Seller, Fastener, SellerFastener, ThreadSize, Material, Finish, Category
+from rest_framework.validators import UniqueValidator
+from .mappings import create_mapping_versions
+from .models import (
+    Seller, Fastener, PriceHistory, SellerFastener, SellerMappingVersion, SellerStats, ThreadSize, Material, Finish,
+    Category,
+)
+from .seller_stats import price_histogram
 
 
-class ThreadSizeSerializer(serializers.ModelSerializer):
+@lru_cache(maxsize=None)
+def required_fastener_fields():
+    """
+    Fastener fields a seller's csv_mapping must provide: fields that may be neither blank nor null.
+    The model does not change at runtime, so they are computed once per process.
+    """
+    return tuple(
+        field.name for field in Fastener._meta.get_fields()
+        if hasattr(field, 'blank') and not field.blank and not field.null
+    )
+
+
+class DynamicFieldsModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer taking an optional `fields` argument that restricts the serialized fields.
+    `fields` maps a field name to None (the whole field) or to the subfields of a nested serializer,
+    e.g. {'product_id': None, 'thread_size': {'name'}}.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            if not isinstance(fields, dict):
+                fields = dict.fromkeys(fields)
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
+            for field_name, subfields in fields.items():
+                if subfields:
+                    nested = self.fields[field_name]
+                    self.fields[field_name] = type(nested)(read_only=True, fields=subfields)
+
+
+class ThreadSizeSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = ThreadSize
         fields = [
@@ -27,39 +69,35 @@ class ThreadSizeSerializer(serializers.ModelSerializer):
         return value
 
 
-class MaterialSerializer(serializers.ModelSerializer):
+class MaterialSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Material
         fields = ['id', 'name']
 
 
-class FinishSerializer(serializers.ModelSerializer):
+class FinishSerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Finish
         fields = ['id', 'name']
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(DynamicFieldsModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name']
 
 
-class SellerSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Seller
-        fields = ['id', 'name', 'contact_email', 'phone_number', 'address', 'csv_mapping']
+class CsvMappingValidationMixin:
+    """
+    Validation of a csv_mapping against the required Fastener fields, shared by sellers and mapping versions.
+    """
 
     def get_required_fastener_fields(self):
         """
         Dynamically fetch required fields from the Fastener model.
         A field is considered required if it's not allowed to be blank and not nullable.
         """
-        required_fields = []
-        for field in Fastener._meta.get_fields():
-            if hasattr(field, 'blank') and not field.blank and not field.null:
-                required_fields.append(field.name)
-        return required_fields
+        return list(required_fastener_fields())
 
     def validate_csv_mapping(self, value):
         """
@@ -78,7 +116,91 @@ class SellerSerializer(serializers.ModelSerializer):
         return value
 
 
-class FastenerSerializer(serializers.ModelSerializer):
+class SellerListSerializer(serializers.ListSerializer):
+    """
+    Validate a batch of sellers with a single uniqueness query and save them with bulk_create.
+    Errors are still reported per seller, including duplicates inside the batch.
+    """
+    UNIQUE_FIELDS = ('name', 'contact_email')
+
+    def to_internal_value(self, data):
+        # Collect the unique values already taken in the database for the whole batch at once
+        self.taken = {field: set() for field in self.UNIQUE_FIELDS}
+        if isinstance(data, list):
+            lookup = Q()
+            for field in self.UNIQUE_FIELDS:
+                values = {item.get(field) for item in data if isinstance(item, dict) and item.get(field)}
+                lookup |= Q(**{f"{field}__in": values})
+            for row in Seller.objects.filter(lookup).values_list(*self.UNIQUE_FIELDS):
+                for field, value in zip(self.UNIQUE_FIELDS, row):
+                    self.taken[field].add(value)
+        return super().to_internal_value(data)
+
+    def unique_validator(self, field, message):
+        """
+        Return a field validator rejecting values taken in the database or earlier in the batch.
+        """
+        def validator(value):
+            if value in self.taken[field]:
+                raise serializers.ValidationError(message, code='unique')
+            self.taken[field].add(value)
+        return validator
+
+    def create(self, validated_data):
+        sellers = Seller.objects.bulk_create([Seller(**item, mapping_version=1) for item in validated_data],
+                                             batch_size=1000)
+        create_mapping_versions(sellers)
+        return sellers
+
+
+class SellerSerializer(CsvMappingValidationMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Seller
+        fields = ['id', 'name', 'contact_email', 'phone_number', 'address', 'csv_mapping', 'mapping_version']
+        read_only_fields = ['mapping_version']
+        list_serializer_class = SellerListSerializer
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if isinstance(self.parent, SellerListSerializer):
+            # The list checks uniqueness for the whole batch instead of one query per seller and field
+            for field_name in SellerListSerializer.UNIQUE_FIELDS:
+                field = fields[field_name]
+                validators = []
+                for validator in field.validators:
+                    if isinstance(validator, UniqueValidator):
+                        validator = self.parent.unique_validator(field_name, validator.message)
+                    validators.append(validator)
+                field.validators = validators
+        return fields
+
+    def create(self, validated_data):
+        seller = Seller.objects.create(**validated_data, mapping_version=1)
+        create_mapping_versions([seller])
+        return seller
+
+
+class SellerMappingVersionSerializer(CsvMappingValidationMixin, serializers.ModelSerializer):
+    class Meta:
+        model = SellerMappingVersion
+        fields = ['seller', 'version', 'csv_mapping', 'created_at']
+        read_only_fields = ['seller', 'version', 'created_at']
+
+
+class SellerStatsSerializer(serializers.ModelSerializer):
+    average_price = serializers.DecimalField(max_digits=20, decimal_places=2, read_only=True, allow_null=True)
+    price_histogram = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SellerStats
+        fields = ['seller', 'offer_count', 'in_stock_count', 'total_quantity', 'min_price', 'max_price',
+                  'average_price', 'price_histogram', 'updated_at']
+
+    def get_price_histogram(self, obj):
+        return price_histogram(obj)
+
+
+class FastenerSerializer(DynamicFieldsModelSerializer):
     thread_size = ThreadSizeSerializer(read_only=True)
     material = MaterialSerializer(read_only=True)
     finish = FinishSerializer(read_only=True)
@@ -98,3 +220,75 @@ class SellerFastenerSerializer(serializers.ModelSerializer):
     class Meta:
         model = SellerFastener
         fields = ['id', 'seller', 'fastener', 'seller_id', 'fastener_id', 'price', 'quantity', 'last_updated']
+
+
+class FastenerOfferSummarySerializer(FastenerSerializer):
+    """
+    Fastener with the summary of its offers, read from annotations computed by the list query.
+    """
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    best_seller_id = serializers.IntegerField(read_only=True)
+    seller_count = serializers.IntegerField(read_only=True)
+    total_quantity = serializers.IntegerField(read_only=True)
+
+    class Meta(FastenerSerializer.Meta):
+        fields = FastenerSerializer.Meta.fields + ['min_price', 'best_seller_id', 'seller_count', 'total_quantity']
+
+
+class OfferSerializer(serializers.ModelSerializer):
+    """
+    A seller's offer for a fastener, without the nested seller and fastener documents.
+    """
+    seller_id = serializers.IntegerField(read_only=True)
+    seller_name = serializers.CharField(source='seller.name', read_only=True)
+
+    class Meta:
+        model = SellerFastener
+        fields = ['id', 'seller_id', 'seller_name', 'price', 'quantity', 'last_updated']
+
+
+class FastenerOffersSerializer(serializers.Serializer):
+    """
+    A fastener with all of its offers and their summary.
+    """
+    fastener = FastenerSerializer(read_only=True)
+    min_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True, allow_null=True)
+    seller_count = serializers.IntegerField(read_only=True)
+    total_quantity = serializers.IntegerField(read_only=True)
+    offers = OfferSerializer(many=True, read_only=True)
+
+
+class PriceHistorySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = PriceHistory
+        fields = ['seller', 'fastener', 'price', 'quantity', 'valid_from']
+
+
+class StockLineSerializer(serializers.Serializer):
+    """
+    One line of a stock reservation or release: a quantity of a seller's offer for a fastener.
+    """
+    seller = serializers.IntegerField(min_value=1)
+    fastener = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class StockLinesSerializer(serializers.Serializer):
+    MAX_LINES = 1000
+
+    lines = StockLineSerializer(many=True, allow_empty=False, max_length=MAX_LINES)
+
+
+class StockUpdateSerializer(serializers.Serializer):
+    """
+    One absolute stock update: the new quantity of a seller's offer for a fastener.
+    """
+    seller = serializers.IntegerField(min_value=1)
+    fastener = serializers.IntegerField(min_value=1)
+    quantity = serializers.IntegerField(min_value=0)
+
+
+class StockUpdatesSerializer(serializers.Serializer):
+    MAX_UPDATES = 10000
+
+    updates = StockUpdateSerializer(many=True, allow_empty=False, max_length=MAX_UPDATES)
@@ -0,0 +1,285 @@
+import sys
+import threading
+from array import array
+from django.db import connections, router, transaction
+from fastener_app.catalog_version import get_catalog_version
+from fastener_app.models import Category, Fastener, Finish, Material, ThreadSize
+from fastener_app.serializers import CategorySerializer, FinishSerializer, MaterialSerializer, ThreadSizeSerializer
+
+# Dimension fields of a fastener: model, serializer and the field the list sorts them by
+DIMENSIONS = {
+    'thread_size': (ThreadSize, ThreadSizeSerializer, 'sort_key'),
+    'material': (Material, MaterialSerializer, 'name'),
+    'finish': (Finish, FinishSerializer, 'name'),
+    'category': (Category, CategorySerializer, 'name'),
+}
+
+# Dimensions with a bitmap per lowercased name
+FILTER_DIMENSIONS = ('material', 'finish', 'category')
+
+# Fastener columns stored as one UTF-8 buffer with offsets
+TEXT_FIELDS = ('product_id', 'description')
+
+# Bit positions set in each byte value
+BYTE_BITS = [tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256)]
+
+
+class CatalogSnapshot:
+    """
+    Immutable, array-backed copy of the fastener catalog at one catalog version.
+    Row i is the i-th fastener by id. Dimensions are stored as codes into tables of serialized dimensions
+    and text fields as one UTF-8 buffer with offsets. Every sortable field has a precomputed (value, id)
+    permutation with the position of each row in it, plus a dense rank per row for multi-key sorts, and
+    every filterable dimension name has a bitmap of its rows.
+    """
+
+    def __init__(self, version, rows, dimensions, text_orderings=None):
+        """
+        `rows` yields (id, product_id, description, thread_size_id, material_id, finish_id, category_id)
+        ordered by id. `dimensions` maps each dimension field to (id, sort value, serialized dimension)
+        tuples in the order the database sorts them. `text_orderings` maps each text field to the fastener
+        ids ordered by (field, id) in the database collation; missing orderings are sorted in Python.
+        """
+        self.version = version
+        self.ids = array('q')
+        self.codes = {field: array('i') for field in DIMENSIONS}
+        self.dimensions = {}
+        buffers = {field: bytearray() for field in TEXT_FIELDS}
+        self.offsets = {field: array('Q', [0]) for field in TEXT_FIELDS}
+
+        code_of, dimension_ranks = {}, {}
+        for field, entries in dimensions.items():
+            self.dimensions[field], code_of[field], dimension_ranks[field] = self.build_dimension(entries)
+
+        for fastener_id, product_id, description, *dimension_ids in rows:
+            self.ids.append(fastener_id)
+            for field, value in zip(TEXT_FIELDS, (product_id, description)):
+                buffers[field] += value.encode('utf-8')
+                self.offsets[field].append(len(buffers[field]))
+            for field, dimension_id in zip(DIMENSIONS, dimension_ids):
+                self.codes[field].append(code_of[field][dimension_id])
+        self.text = {field: bytes(buffer) for field, buffer in buffers.items()}
+
+        self.ranks, self.permutations = {}, {}
+        for field in DIMENSIONS:
+            ranks = dimension_ranks[field]
+            self.ranks[field] = array('i', (ranks[code] for code in self.codes[field]))
+            # Rows are in id order and sorted() is stable, so ties keep their id order
+            self.permutations[field] = array('i', sorted(range(len(self)), key=self.ranks[field].__getitem__))
+        for field in TEXT_FIELDS:
+            self.ranks[field], self.permutations[field] = self.build_text_order(field, (text_orderings or {}).get(field))
+
+        self.positions = {}
+        for field, permutation in self.permutations.items():
+            positions = array('i', bytes(4 * len(self)))
+            for position, row in enumerate(permutation):
+                positions[row] = position
+            self.positions[field] = positions
+
+        self.bitmaps = {field: self.build_bitmaps(field) for field in FILTER_DIMENSIONS}
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def build_dimension(entries):
+        """
+        Return the table of serialized dimensions, the code of each dimension id and the dense rank of each code.
+        """
+        table, code_of, ranks = [], {}, array('i')
+        rank, previous = -1, None
+        for dimension_id, sort_value, data in entries:
+            if rank < 0 or sort_value != previous:
+                rank, previous = rank + 1, sort_value
+            code_of[dimension_id] = len(table)
+            table.append(data)
+            ranks.append(rank)
+        return table, code_of, ranks
+
+    def build_text_order(self, field, ordering):
+        if ordering is None:
+            permutation = array('i', sorted(range(len(self)), key=lambda row: (self.text_value(field, row), self.ids[row])))
+        else:
+            position = {fastener_id: row for row, fastener_id in enumerate(self.ids)}
+            permutation = array('i', (position[fastener_id] for fastener_id in ordering))
+
+        ranks = array('i', bytes(4 * len(self)))
+        rank, previous = -1, None
+        for row in permutation:
+            value = self.text_bytes(field, row)
+            if rank < 0 or value != previous:
+                rank, previous = rank + 1, value
+            ranks[row] = rank
+        return ranks, permutation
+
+    def build_bitmaps(self, field):
+        """
+        Return {lowercased name: bitmap of the rows with that name}, bitmaps being Python ints.
+        """
+        rows_bits = [bytearray((len(self) + 7) // 8) for _ in self.dimensions[field]]
+        for row, code in enumerate(self.codes[field]):
+            rows_bits[code][row >> 3] |= 1 << (row & 7)
+
+        bitmaps = {}
+        for data, bits in zip(self.dimensions[field], rows_bits):
+            name = data['name'].lower()
+            bitmaps[name] = bitmaps.get(name, 0) | int.from_bytes(bits, 'little')
+        return bitmaps
+
+    def text_bytes(self, field, row):
+        offsets = self.offsets[field]
+        return self.text[field][offsets[row]:offsets[row + 1]]
+
+    def text_value(self, field, row):
+        return self.text_bytes(field, row).decode('utf-8')
+
+    def query(self, filters, sort_keys):
+        """
+        Return the rows matching `filters` ({dimension: [lowercased names]}) in the order of `sort_keys`
+        ([(field, direction)]), ties broken by id in the direction of the last key.
+        """
+        mask = None
+        for field, names in filters.items():
+            field_mask = 0
+            for name in names:
+                field_mask |= self.bitmaps[field].get(name, 0)
+            mask = field_mask if mask is None else mask & field_mask
+
+        if mask is None:
+            if len(sort_keys) == 1:
+                return self.ordered(*sort_keys[0])
+            rows = range(len(self))
+        else:
+            bits = mask.to_bytes((len(self) + 7) // 8, 'little')
+            if len(sort_keys) == 1 and mask.bit_count() > len(self) // 4:
+                # Walking the precomputed order is cheaper than sorting a large selection
+                return [row for row in self.ordered(*sort_keys[0]) if bits[row >> 3] >> (row & 7) & 1]
+            rows = [offset * 8 + bit for offset, byte in enumerate(bits) if byte for bit in BYTE_BITS[byte]]
+
+        if not sort_keys:
+            return rows
+        if len(sort_keys) == 1:
+            field, direction = sort_keys[0]
+            return sorted(rows, key=self.positions[field].__getitem__, reverse=direction == 'desc')
+        return sorted(rows, key=self.sort_key(sort_keys))
+
+    def ordered(self, field, direction):
+        permutation = self.permutations[field]
+        return permutation if direction == 'asc' else permutation[::-1]
+
+    def sort_key(self, sort_keys):
+        keys = [(self.ranks[field], direction == 'asc') for field, direction in sort_keys]
+        id_ascending = sort_keys[-1][1] == 'asc'
+
+        def key(row):
+            return tuple(ranks[row] if ascending else -ranks[row] for ranks, ascending in keys) + (
+                row if id_ascending else -row,
+            )
+        return key
+
+    def column(self, lookup, rows):
+        """
+        Return the values of a values_list() lookup such as 'product_id' or 'thread_size__name' for the rows.
+        """
+        field, _, subfield = lookup.partition('__')
+        if field == 'id':
+            return [self.ids[row] for row in rows]
+        if field in TEXT_FIELDS:
+            return [self.text_value(field, row) for row in rows]
+        table, codes = self.dimensions[field], self.codes[field]
+        if subfield:
+            values = [data[subfield] for data in table]
+            return [values[codes[row]] for row in rows]
+        return [table[codes[row]]['id'] for row in rows]
+
+    def records(self, rows, fields):
+        """
+        Return the rows as serialized fasteners. `fields` lists (field, subfields) in output order,
+        subfields being the ordered fields of a nested dimension or None for a plain field.
+        """
+        tables = {
+            field: [{subfield: data[subfield] for subfield in subfields} for data in self.dimensions[field]]
+            for field, subfields in fields if subfields is not None
+        }
+        records = []
+        for row in rows:
+            record = {}
+            for field, subfields in fields:
+                if subfields is not None:
+                    record[field] = tables[field][self.codes[field][row]]
+                elif field == 'id':
+                    record[field] = self.ids[row]
+                else:
+                    record[field] = self.text_value(field, row)
+            records.append(record)
+        return records
+
+    def memory_usage(self):
+        """
+        Approximate number of bytes held by the snapshot's arrays, buffers, bitmaps and dimension tables.
+        """
+        arrays = [self.ids, *self.codes.values(), *self.offsets.values(), *self.ranks.values(),
+                  *self.permutations.values(), *self.positions.values()]
+        size = sum(sys.getsizeof(item) for item in arrays)
+        size += sum(sys.getsizeof(buffer) for buffer in self.text.values())
+        size += sum(sys.getsizeof(bitmap) for bitmaps in self.bitmaps.values() for bitmap in bitmaps.values())
+        size += sum(sys.getsizeof(data) for table in self.dimensions.values() for data in table)
+        return size
+
+
+def load_snapshot(version):
+    """
+    Read the catalog into a CatalogSnapshot inside one repeatable-read transaction, so fasteners and
+    dimensions come from the same database state. The snapshot is tagged with a version read from the
+    catalog version key, so it is always loaded from the primary: a lagging replica would be missing
+    rows the version already accounts for, and the snapshot would serve them until the next bump.
+    """
+    using = router.db_for_write(Fastener)
+    connection = connections[using]
+    outermost = not connection.in_atomic_block
+    with transaction.atomic(using=using):
+        if outermost:
+            with connection.cursor() as cursor:
+                cursor.execute("SET TRANSACTION ISOLATION LEVEL REPEATABLE READ READ ONLY")
+
+        fasteners = Fastener.objects.using(using)
+        dimensions = {
+            field: [
+                (dimension.id, getattr(dimension, sort_field), dict(serializer(dimension).data))
+                for dimension in model.objects.using(using).order_by(sort_field, 'id')
+            ]
+            for field, (model, serializer, sort_field) in DIMENSIONS.items()
+        }
+        text_orderings = {
+            field: fasteners.order_by(field, 'id').values_list('id', flat=True).iterator(chunk_size=10000)
+            for field in TEXT_FIELDS
+        }
+        rows = fasteners.order_by('id').values_list(
+            'id', 'product_id', 'description', *(f'{field}_id' for field in DIMENSIONS)
+        ).iterator(chunk_size=10000)
+        snapshot = CatalogSnapshot(version, rows, dimensions, text_orderings)
+    return snapshot
+
+
+_snapshot = None
+_snapshot_lock = threading.Lock()
+
+
+def get_snapshot():
+    """
+    Return this process's snapshot of the current catalog version, rebuilding it when the version changed.
+    Concurrent requests wait for the rebuild, and the new snapshot replaces the old one in a single assignment.
+    """
+    global _snapshot
+    # Read the version before the catalog so a concurrent ingest makes the snapshot stale, never wrong
+    version = get_catalog_version()
+    snapshot = _snapshot
+    if snapshot is not None and snapshot.version == version:
+        return snapshot
+
+    with _snapshot_lock:
+        snapshot = _snapshot
+        if snapshot is None or snapshot.version != version:
+            snapshot = load_snapshot(version)
+            _snapshot = snapshot
+    return snapshot
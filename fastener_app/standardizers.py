@@ -1,3 +1,6 @@
+from django.db import connection, transaction
+from fastener_app.catalog_version import bump_dimension_version
+from fastener_app.dimension_cache import get_dimension_cache
 from fastener_app.models import (
     Material,
     Finish,
@@ -6,6 +9,7 @@ from fastener_app.models import (
     constants
 )
 from fastener_app.tests.test_views.test_view_ingest import logger
+from fastener_app.thread_equivalence import add_thread_size_equivalences
 from fastener_app.unit_converter import get_all_info_from_thread_size_str
 
 
@@ -31,6 +35,33 @@ def parse_size(raw_data, standardized_data):
     standardized_data.update(get_all_info_from_thread_size_str(metric_size_str))
 
 
+def upsert_thread_size(thread_size):
+    """
+    Insert an unsaved ThreadSize unless one with the same canonical key exists and return (thread size, created).
+    INSERT ... ON CONFLICT DO NOTHING makes concurrent ingests of a new thread size agree on a single row without
+    raising on the unique key; the losers read the winner's row back.
+    """
+    thread_size.validate()
+    thread_size.fill_keys()
+    fields = [field for field in ThreadSize._meta.concrete_fields if not field.primary_key]
+    table = connection.ops.quote_name(ThreadSize._meta.db_table)
+    columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) VALUES ({', '.join(['%s'] * len(fields))}) "
+            f"ON CONFLICT (canonical_key) DO NOTHING RETURNING id",
+            [getattr(thread_size, field.attname) for field in fields],
+        )
+        row = cursor.fetchone()
+    if row is None:
+        return ThreadSize.objects.get(canonical_key=thread_size.canonical_key), False
+    thread_size.id = row[0]
+    thread_size._state.adding = False
+    transaction.on_commit(bump_dimension_version)
+    return thread_size, True
+
+
 def standardize_thread_size(raw_data, standardized_data):
     """
     Standardize thread size from raw_data and store in standardized_data.
@@ -40,19 +71,31 @@ def standardize_thread_size(raw_data, standardized_data):
     # Parse metric and imperial sizes
     parse_size(raw_data, standardized_data)
 
-    # Store or update ThreadSize entry in the database
-    thread_size_obj, _ = ThreadSize.objects.get_or_create(
-        metric_size_str=standardized_data.get('metric_size_str'),
-        imperial_size_str=standardized_data.get('imperial_size_str'),
-        defaults={
-            'name': standardized_data['metric_size_str'] or standardized_data['imperial_size_str'],
-            'thread_type': standardized_data['thread_type'],
-            'unit': standardized_data['unit'],
-            'metric_size_num': standardized_data.get('metric_size_num'),
-            'imperial_size_num': standardized_data.get('imperial_size_num'),
-            'thread_per_unit': standardized_data.get('thread_per_unit'),  # Same field for both TPM and TPI
-        }
-    )
+    # Name a thread size by its own designation, not by its rounded conversion to the other system
+    if standardized_data['thread_type'] == constants.ThreadType.IMPERIAL.value:
+        name = standardized_data['imperial_size_str']
+    else:
+        name = standardized_data['metric_size_str']
+
+    # Known thread sizes come from the dimension cache, new ones are stored in the database
+    thread_size_obj = get_dimension_cache().lookup('thread_size', ThreadSize.make_canonical_key(
+        standardized_data.get('metric_size_str'), standardized_data.get('imperial_size_str')
+    ))
+    if thread_size_obj is None:
+        thread_size_obj, created = upsert_thread_size(ThreadSize(
+            name=name,
+            thread_type=standardized_data['thread_type'],
+            unit=standardized_data['unit'],
+            metric_size_str=standardized_data.get('metric_size_str'),
+            metric_size_num=standardized_data.get('metric_size_num'),
+            imperial_size_str=standardized_data.get('imperial_size_str'),
+            imperial_size_num=standardized_data.get('imperial_size_num'),
+            thread_per_unit=standardized_data.get('thread_per_unit'),  # Same field for both TPM and TPI
+        ))
+
+        # Index the equivalents of a new thread size so equivalent searches find it
+        if created:
+            add_thread_size_equivalences([thread_size_obj])
 
     # Add the thread size id to standardized_data
     standardized_data['thread_size'] = thread_size_obj
@@ -61,7 +104,9 @@ def standardize_thread_size(raw_data, standardized_data):
 def standardize_material(raw_data, standardized_data):
     if 'material' in raw_data:
         material_name = raw_data['material'].strip().title()
-        material, _ = Material.objects.get_or_create(name=material_name)
+        material = get_dimension_cache().lookup('material', material_name)
+        if material is None:
+            material, _ = Material.objects.get_or_create(name=material_name)
         logger.debug(material_name)
         logger.debug(material)
         standardized_data['material'] = material
@@ -69,13 +114,17 @@ def standardize_material(raw_data, standardized_data):
 def standardize_finish(raw_data, standardized_data):
     if 'finish' in raw_data:
         finish_name = raw_data['finish'].strip().title()
-        finish, _ = Finish.objects.get_or_create(name=finish_name)
+        finish = get_dimension_cache().lookup('finish', finish_name)
+        if finish is None:
+            finish, _ = Finish.objects.get_or_create(name=finish_name)
         standardized_data['finish'] = finish
 
 def standardize_category(raw_data, standardized_data):
     if 'category' in raw_data:
         category_name = raw_data['category'].strip().title()
-        category, _ = Category.objects.get_or_create(name=category_name)
+        category = get_dimension_cache().lookup('category', category_name)
+        if category is None:
+            category, _ = Category.objects.get_or_create(name=category_name)
         standardized_data['category'] = category
 
 def standardize_product_id(raw_data, standardized_data):
@@ -0,0 +1,278 @@
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from functools import partial
+from pathlib import Path
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, connection, transaction
+from fastener_app.catalog_version import bump_catalog_version
+from fastener_app.list_cache import invalidate_fasteners
+from fastener_app.models import SellerFastener
+from fastener_app.offers import refresh_best_offers
+from fastener_app.price_history import record_price_history
+from fastener_app.seller_stats import refresh_seller_stats
+
+logger = logging.getLogger(__name__)
+
+# Offers written per UPDATE statement of a flush
+STOCK_FLUSH_BATCH_SIZE = 1000
+
+
+def write_stock_batch(updates):
+    """
+    Set the quantity of each (seller_id, fastener_id) of `updates` with one UPDATE ... FROM (VALUES ...),
+    skipping offers whose quantity is already the new one. Return the (seller_id, fastener_id) of the offers
+    written.
+    """
+    seller_fastener = connection.ops.quote_name(SellerFastener._meta.db_table)
+    values = ', '.join(['(%s::bigint, %s::bigint, %s::integer)'] * len(updates))
+    params = [value for (seller_id, fastener_id), quantity in updates for value in (seller_id, fastener_id, quantity)]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {seller_fastener} sf SET quantity = ticks.quantity, last_updated = now() "
+            f"FROM (VALUES {values}) ticks (seller_id, fastener_id, quantity) "
+            f"WHERE sf.seller_id = ticks.seller_id AND sf.fastener_id = ticks.fastener_id "
+            f"AND sf.quantity <> ticks.quantity "
+            f"RETURNING sf.seller_id, sf.fastener_id",
+            params,
+        )
+        return cursor.fetchall()
+
+
+class StockBuffer:
+    """
+    Write-behind buffer of absolute stock updates. Updates are coalesced per (seller_id, fastener_id) in
+    memory, the last one winning, and written by flush() as set-based UPDATEs of STOCK_FLUSH_BATCH_SIZE
+    offers, so a SKU ticking every few seconds costs one write per flush instead of one per tick.
+
+    A flush is triggered once `max_size` offers are pending or `max_delay` seconds after the first pending
+    update (by a background thread; None disables it), and at interpreter exit. With a `journal_dir`, every
+    accepted update is also appended to this process's journal there before it is acknowledged, and a buffer
+    replays the journals left by processes that died before flushing.
+    """
+
+    def __init__(self, max_size, max_delay=None, journal_dir=None):
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.pending = {}
+        self.first_pending_at = None
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.closed = False
+        self.received = self.flushed = self.written = 0
+
+        self.journal_path = self.journal = None
+        if journal_dir:
+            Path(journal_dir).mkdir(parents=True, exist_ok=True)
+            self.journal_path = Path(journal_dir) / f"stock-{os.getpid()}.jsonl"
+            recovered = self.recover(Path(journal_dir))
+            self.journal = open(self.journal_path, 'a', encoding='utf-8')
+            self.buffer(recovered)
+
+        self.thread = None
+        if max_delay is not None:
+            self.thread = threading.Thread(target=self.run, name='stock-buffer', daemon=True)
+            self.thread.start()
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, updates):
+        """
+        Buffer (seller_id, fastener_id, quantity) updates and return the number of offers pending.
+        Flushes in the calling thread once max_size offers are pending. The updates are accepted even if that
+        flush cannot reach the database: they stay buffered and are retried at the next trigger.
+        """
+        pending = self.buffer(updates)
+        if pending >= self.max_size:
+            try:
+                self.flush()
+            except DatabaseError:
+                # Already logged and buffered again by flush()
+                pass
+            pending = len(self)
+        return pending
+
+    def buffer(self, updates):
+        with self.lock:
+            if self.journal:
+                self.journal.write(''.join(json.dumps(list(update)) + '\n' for update in updates))
+                self.journal.flush()
+            for seller_id, fastener_id, quantity in updates:
+                self.pending[seller_id, fastener_id] = quantity
+            self.received += len(updates)
+            if self.first_pending_at is None and self.pending:
+                self.first_pending_at = time.monotonic()
+                self.wakeup.set()
+            return len(self.pending)
+
+    def take(self):
+        """
+        Return the pending updates and start a new buffer (and journal) for the next ones.
+        """
+        with self.lock:
+            pending, self.pending, self.first_pending_at = self.pending, {}, None
+            flushing = None
+            if self.journal:
+                self.journal.close()
+                flushing = self.journal_path.with_suffix('.flushing')
+                os.replace(self.journal_path, flushing)
+                self.journal = open(self.journal_path, 'a', encoding='utf-8')
+            return pending, flushing
+
+    def flush(self):
+        """
+        Write the pending updates and return the number of offers whose quantity changed. Offers that do
+        not exist are dropped. If the write fails the updates are buffered again, behind any newer ones.
+        """
+        with self.flush_lock:
+            pending, flushing = self.take()
+            if not pending:
+                if flushing:
+                    flushing.unlink()
+                return 0
+            try:
+                written = self.write(list(pending.items()))
+            except Exception:
+                logger.exception(f"Could not flush {len(pending)} stock updates, keeping them buffered.")
+                with self.lock:
+                    newer = dict(self.pending)
+                    self.received -= len(pending)
+                self.buffer([(*key, quantity) for key, quantity in pending.items() if key not in newer])
+                if flushing:
+                    flushing.unlink()
+                raise
+            if flushing:
+                flushing.unlink()
+            self.flushed += len(pending)
+            self.written += written
+            return written
+
+    @staticmethod
+    def write(updates):
+        """
+        Write coalesced updates in batches within one transaction, then refresh what depends on the stock
+        of the offers written: their best offers, price history and seller stats.
+        """
+        written = []
+        with transaction.atomic():
+            for start in range(0, len(updates), STOCK_FLUSH_BATCH_SIZE):
+                written.extend(write_stock_batch(updates[start:start + STOCK_FLUSH_BATCH_SIZE]))
+            if written:
+                by_seller = {}
+                for seller_id, fastener_id in written:
+                    by_seller.setdefault(seller_id, []).append(fastener_id)
+                for seller_id, fastener_ids in by_seller.items():
+                    record_price_history(seller_id, fastener_ids)
+                fastener_ids = {fastener_id for _, fastener_id in written}
+                refresh_best_offers(fastener_ids)
+                refresh_seller_stats(list(by_seller))
+                transaction.on_commit(bump_catalog_version)
+                transaction.on_commit(partial(invalidate_fasteners, fastener_ids, offers_only=True))
+        return len(written)
+
+    def run(self):
+        """
+        Background loop flushing the buffer `max_delay` seconds after its first pending update.
+        """
+        while not self.closed:
+            self.wakeup.wait()
+            with self.lock:
+                self.wakeup.clear()
+                first_pending_at = self.first_pending_at
+            if first_pending_at is None:
+                continue
+            delay = first_pending_at + self.max_delay - time.monotonic()
+            if delay > 0 and not self.closed:
+                time.sleep(delay)
+            try:
+                close_old_connections()
+                self.flush()
+            except Exception:
+                # Already logged, the updates are retried at the next trigger
+                time.sleep(self.max_delay)
+                self.wakeup.set()
+
+    def close(self):
+        """
+        Stop the background thread and flush what is pending, e.g. at worker shutdown.
+        """
+        self.closed = True
+        self.wakeup.set()
+        self.flush()
+        if self.journal:
+            with self.lock:
+                self.journal.close()
+                self.journal = None
+            if not self.pending:
+                self.journal_path.unlink(missing_ok=True)
+
+    def recover(self, journal_dir):
+        """
+        Return the updates of the journals of processes that are gone, coalesced oldest first, including a journal left
+        by an earlier process with this pid. Each journal is claimed by renaming it, so two workers starting
+        together cannot both replay it.
+        """
+        def owner(path):
+            return int(path.name.split('-')[1].split('.')[0])
+
+        def alive(pid):
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                return False
+            except PermissionError:
+                pass
+            return True
+
+        orphans = sorted(
+            (path for path in journal_dir.glob('stock-*') if path.suffix in ('.jsonl', '.flushing')
+             and (owner(path) == os.getpid() or not alive(owner(path)))),
+            # A process's journal being flushed is older than its current one
+            key=lambda path: (path.stat().st_mtime, path.suffix == '.jsonl'),
+        )
+        recovered = {}
+        for path in orphans:
+            claimed = self.journal_path.with_name(f"{self.journal_path.stem}.recovered-{path.name}")
+            try:
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue
+            with open(claimed, encoding='utf-8') as journal:
+                updates = [json.loads(line) for line in journal if line.strip()]
+            for seller_id, fastener_id, quantity in updates:
+                recovered[seller_id, fastener_id] = quantity
+            claimed.unlink()
+            logger.info(f"Recovered {len(updates)} stock updates from {path.name}.")
+        return [(*key, quantity) for key, quantity in recovered.items()]
+
+    def stats(self):
+        return {
+            "pending": len(self.pending),
+            "received": self.received,
+            "flushed": self.flushed,
+            "written": self.written,
+        }
+
+
+_stock_buffer = None
+_stock_buffer_lock = threading.Lock()
+
+
+def get_stock_buffer():
+    """
+    Return this process's StockBuffer, created from the STOCK_BUFFER_* settings on first use and flushed
+    when the interpreter exits.
+    """
+    global _stock_buffer
+    if _stock_buffer is None:
+        with _stock_buffer_lock:
+            if _stock_buffer is None:
+                _stock_buffer = StockBuffer(settings.STOCK_BUFFER_MAX_SIZE, settings.STOCK_BUFFER_MAX_DELAY,
+                                            settings.STOCK_BUFFER_JOURNAL_DIR or None)
+                atexit.register(_stock_buffer.close)
+    return _stock_buffer
@@ -1,4 +1,14 @@
 import pytest
+from decimal import Decimal
+from django.apps import apps
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.urls import reverse
+from fastener_app.catalog_version import DIMENSION_VERSION_KEY
+from fastener_app.dimension_cache import get_dimension_cache
+from fastener_app.offers import refresh_best_offers
+from rest_framework import status
 from rest_framework.test import APIClient
 from fastener_app.tests.factories import (
     SellerFactory,
@@ -10,6 +20,28 @@ from fastener_app.tests.factories import (
     CategoryFactory
 )
 
+@pytest.fixture(autouse=True)
+def dimension_cache():
+    """A dimension cache that does not hold the rows of an earlier test, which were rolled back."""
+    cache.delete(DIMENSION_VERSION_KEY)
+    get_dimension_cache().reset()
+    return get_dimension_cache()
+
+@pytest.fixture
+def committed_rows(django_db_blocker):
+    """
+    Truncate the app's tables after a transaction=True test. The flush that ends such a test does not see
+    the schema-qualified tables, so with --reuse-db their committed rows would leak into the next run.
+    """
+    yield
+    tables = ', '.join(
+        connection.ops.quote_name(model._meta.db_table)
+        for model in apps.get_app_config('fastener_app').get_models()
+        if model._meta.managed and not model._meta.proxy
+    )
+    with django_db_blocker.unblock(), connection.cursor() as cursor:
+        cursor.execute(f"TRUNCATE {tables} RESTART IDENTITY CASCADE")
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -49,3 +81,31 @@ def seller_fastener(seller, fastener):
         seller=seller,
         fastener=fastener
     )
+
+@pytest.fixture
+def offers(fastener):
+    """Two sellers offering the same fastener, the cheaper one with little stock."""
+    offers = [
+        SellerFastenerFactory(fastener=fastener, seller=SellerFactory(), price=Decimal('1.00'), quantity=2),
+        SellerFastenerFactory(fastener=fastener, seller=SellerFactory(), price=Decimal('2.00'), quantity=10),
+    ]
+    refresh_best_offers([fastener.id])
+    return offers
+
+@pytest.fixture
+def ingest(api_client, seller, django_capture_on_commit_callbacks):
+    """
+    Upload CSV rows through the ingest view and return the response, running the hooks the upload registers
+    on commit (catalog version, cache invalidation). The rows follow the seller's csv_mapping, which gives
+    the header; other keyword arguments are posted with the file, e.g. mode='full'. Pass expected_status=None
+    to check the response yourself.
+    """
+    def ingest(*rows, seller=seller, expected_status=status.HTTP_201_CREATED, **data):
+        content = ','.join(seller.csv_mapping) + '\n' + ''.join(rows)
+        csv_file = SimpleUploadedFile('fasteners.csv', content.encode('utf-8'), content_type='text/csv')
+        with django_capture_on_commit_callbacks(execute=True):
+            response = api_client.post(reverse('fastener-ingest', args=[seller.id]), {'file': csv_file, **data},
+                                       format='multipart')
+        assert expected_status is None or response.status_code == expected_status
+        return response
+    return ingest
@@ -0,0 +1,168 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connections
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from fastener_app import db_router
+from fastener_app.db_router import PrimaryReplicaRouter, use_primary, use_replicas
+from fastener_app.list_cache import get_list_cache
+from fastener_app.middleware import PRIMARY_PIN_COOKIE
+from fastener_app.models import Fastener
+from fastener_app.snapshot import load_snapshot
+
+
+@pytest.fixture
+def replica(settings, monkeypatch):
+    """Route reads to the 'replica' alias, a second connection to the test database."""
+    settings.DATABASE_REPLICAS = ['replica']
+    monkeypatch.setattr(db_router, '_replica_lag_checks', {})
+    return 'replica'
+
+
+@pytest.fixture
+def lag(monkeypatch):
+    """Replication lag reported for every replica, in seconds or None when unreachable."""
+    lag = {'value': 0.0, 'checks': 0}
+
+    def replica_lag(alias):
+        lag['checks'] += 1
+        return lag['value']
+
+    monkeypatch.setattr(db_router, 'replica_lag', replica_lag)
+    return lag
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_reads_go_to_replica_and_writes_to_primary(replica, lag):
+    router = PrimaryReplicaRouter()
+
+    with use_replicas():
+        assert router.db_for_read(Fastener) == 'replica'
+        assert router.db_for_write(Fastener) == 'default'
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_reads_outside_requests_use_primary(replica, lag):
+    # Migrations, management commands and background threads read what they just wrote
+    assert PrimaryReplicaRouter().db_for_read(Fastener) == 'default'
+    assert lag['checks'] == 0
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_reads_stay_on_primary_without_replicas(settings):
+    settings.DATABASE_REPLICAS = []
+
+    assert PrimaryReplicaRouter().db_for_read(Fastener) == 'default'
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+@pytest.mark.parametrize('replica_lag', [30.0, None])
+def test_lagging_or_unreachable_replica_falls_back_to_primary(replica, lag, replica_lag):
+    lag['value'] = replica_lag
+
+    with use_replicas():
+        assert PrimaryReplicaRouter().db_for_read(Fastener) == 'default'
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_replica_lag_is_checked_once_per_interval(replica, lag, settings):
+    settings.REPLICA_LAG_CHECK_INTERVAL = 60
+    router = PrimaryReplicaRouter()
+
+    with use_replicas():
+        for _ in range(5):
+            router.db_for_read(Fastener)
+
+    assert lag['checks'] == 1
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_replica_lag_query(replica):
+    # The test replica is a plain connection to the primary, which reports no lag
+    assert db_router.replica_lag('replica') == 0
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_pinned_reads_use_primary(replica, lag):
+    router = PrimaryReplicaRouter()
+
+    with use_replicas():
+        with use_primary():
+            assert router.db_for_read(Fastener) == 'default'
+        assert router.db_for_read(Fastener) == 'replica'
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_list_served_by_replica(api_client, replica, lag):
+    with CaptureQueriesContext(connections['replica']) as replica_queries:
+        response = api_client.get(reverse('fastener-list'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert any('fastener' in query['sql'] for query in replica_queries.captured_queries)
+    # The replica may lag behind the catalog version the ETag is derived from
+    assert 'ETag' not in response
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_async_list_served_by_replica_has_no_etag(replica, lag):
+    response = async_to_sync(AsyncClient().get)(reverse('async-fastener-list'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert 'ETag' not in response
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_list_cache_is_filled_from_primary(api_client, fastener, replica, lag, settings):
+    settings.LIST_CACHE_ENABLED = True
+    get_list_cache().reset()
+
+    with CaptureQueriesContext(connections['replica']) as replica_queries:
+        response = api_client.get(reverse('fastener-list'))
+
+    assert response['X-Catalog-Source'] == 'database'
+    assert [item['product_id'] for item in response.json()] == [fastener.product_id]
+    assert 'ETag' in response
+    assert replica_queries.captured_queries == []
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_ingest_pins_client_reads_to_primary(api_client, seller, replica, lag):
+    csv_content = (
+        "id,name,size_and_length,material,surface_treatment,category,price,quantity\n"
+        "F001,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,15.99,200\n"
+    ).encode('utf-8')
+    csv_file = SimpleUploadedFile('fasteners.csv', csv_content, content_type='text/csv')
+
+    with CaptureQueriesContext(connections['replica']) as replica_queries:
+        response = api_client.post(reverse('fastener-ingest', args=[seller.id]), {'file': csv_file},
+                                   format='multipart')
+        assert response.status_code == status.HTTP_201_CREATED
+        assert PRIMARY_PIN_COOKIE in response.cookies
+
+        # The client sends the cookie back, so its next reads see its writes
+        response = api_client.get(reverse('fastener-list'))
+
+    assert [item['product_id'] for item in response.json()] == ['F001']
+    assert replica_queries.captured_queries == []
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_expired_pin_cookie_reads_from_replica(api_client, replica, lag):
+    api_client.cookies[PRIMARY_PIN_COOKIE] = '0'
+
+    with CaptureQueriesContext(connections['replica']) as replica_queries:
+        api_client.get(reverse('fastener-list'))
+
+    assert replica_queries.captured_queries
+
+
+@pytest.mark.django_db(databases=['default', 'replica'])
+def test_snapshot_loads_from_primary(fastener, replica, lag):
+    with use_replicas(), CaptureQueriesContext(connections['replica']) as replica_queries:
+        snapshot = load_snapshot(0)
+
+    assert list(snapshot.ids) == [fastener.id]
+    assert replica_queries.captured_queries == []
@@ -0,0 +1,87 @@
+import pytest
+from django.urls import reverse
+from fastener_app.dimension_cache import DimensionCache
+from fastener_app.models import Material
+from fastener_app.standardizers import standardize_material
+from fastener_app.tests.factories import MaterialFactory
+
+
+@pytest.mark.django_db
+def test_tables_are_shared_between_workers(dimension_cache, material, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        assert dimension_cache.lookup('material', material.name) == material
+        assert dimension_cache.lookup('material', material.name) == material
+
+    # Another worker at the same version reads the table from the shared cache
+    other = DimensionCache()
+    with django_assert_num_queries(0):
+        assert other.rows('material', [material.id]) == {material.id: material}
+
+    assert dimension_cache.stats()['loads'] == 1
+    assert other.stats()['shared_hits'] == 1
+    assert other.stats()['hit_ratio'] == 1
+
+
+@pytest.mark.django_db
+def test_revalidate_keeps_tables_of_the_current_version(dimension_cache, material, django_assert_num_queries):
+    dimension_cache.lookup('material', material.name)
+
+    dimension_cache.revalidate()
+    with django_assert_num_queries(0):
+        assert dimension_cache.lookup('material', material.name) == material
+    assert dimension_cache.stats()['invalidations'] == 0
+
+
+@pytest.mark.django_db
+def test_rename_invalidates_every_worker(dimension_cache, material, django_capture_on_commit_callbacks):
+    other = DimensionCache()
+    assert other.lookup('material', material.name) == material
+
+    with django_capture_on_commit_callbacks(execute=True):
+        material.name = 'Renamed'
+        material.save()
+    other.revalidate()
+
+    assert other.lookup('material', 'Renamed') == material
+    assert other.ids_named('material', ['renamed']) == [material.id]
+    stats = other.stats()
+    assert stats['invalidations'] == 1
+    assert 0 <= stats['staleness'] <= stats['max_staleness']
+
+
+@pytest.mark.django_db
+def test_rows_newer_than_the_table_are_read_from_the_database(dimension_cache, material):
+    dimension_cache.table('material')
+    # Inserted without a version bump, as seen between the insert and the bump
+    newer = MaterialFactory()
+
+    assert dimension_cache.rows('material', {material.id, newer.id}) == {material.id: material, newer.id: newer}
+    assert dimension_cache.lookup('material', newer.name) is None
+    assert dimension_cache.stats()['misses'] == 2
+
+
+@pytest.mark.django_db
+def test_standardize_reads_known_dimensions_from_the_cache(dimension_cache, django_assert_num_queries,
+                                                           django_capture_on_commit_callbacks):
+    standardized = {}
+    with django_capture_on_commit_callbacks(execute=True):
+        standardize_material({'material': 'stainless steel'}, standardized)
+    dimension_cache.revalidate()
+
+    with django_assert_num_queries(1):
+        standardize_material({'material': 'Stainless Steel '}, standardized)
+    with django_assert_num_queries(0):
+        standardize_material({'material': 'STAINLESS STEEL'}, standardized)
+
+    assert standardized['material'] == Material.objects.get(name='Stainless Steel')
+
+
+@pytest.mark.django_db
+def test_one_version_check_per_request(api_client, dimension_cache, fastener):
+    for _ in range(3):
+        api_client.get(reverse('fastener-list'))
+
+    stats = dimension_cache.stats()
+    assert stats['checks'] == 3
+    assert stats['loads'] == 4
+    assert stats['lookups'] == 12
@@ -0,0 +1,80 @@
+import pytest
+from decimal import Decimal
+from io import StringIO
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from fastener_app.catalog_version import bump_catalog_version, get_catalog_version
+from fastener_app.models import BestOffer, IngestRun, PriceHistory, Seller, SellerFastener, SellerStats
+from fastener_app.mappings import current_mapping_version
+from fastener_app.offboarding import offboard_seller
+from fastener_app.offers import refresh_best_offers
+from fastener_app.price_history import record_price_history
+from fastener_app.seller_stats import refresh_seller_stats
+from fastener_app.tests.factories import FastenerFactory, SellerFactory, SellerFastenerFactory
+
+
+@pytest.fixture
+def catalog(seller):
+    """A seller with the cheapest offer on five fasteners, another seller offering two of them."""
+    other = SellerFactory()
+    fasteners = FastenerFactory.create_batch(5)
+    for fastener in fasteners:
+        SellerFastenerFactory(seller=seller, fastener=fastener, price=Decimal('1.00'), quantity=10)
+    for fastener in fasteners[:2]:
+        SellerFastenerFactory(seller=other, fastener=fastener, price=Decimal('2.00'), quantity=5)
+    refresh_best_offers()
+    refresh_seller_stats()
+    record_price_history(seller.id, [fastener.id for fastener in fasteners])
+    IngestRun.objects.create(seller=seller, mapping_version=current_mapping_version(seller))
+    return other, fasteners
+
+
+@pytest.mark.django_db
+def test_offboard_seller(seller, catalog):
+    other, fasteners = catalog
+    batches = []
+
+    deleted = offboard_seller(seller.id, batch_size=2, progress=lambda *args: batches.append(args))
+
+    assert deleted == 5
+    assert batches == [(2, 5), (4, 5), (5, 5)]
+    assert not Seller.objects.filter(id=seller.id).exists()
+    assert list(SellerFastener.objects.values_list('seller_id', flat=True)) == [other.id, other.id]
+    assert not SellerStats.objects.filter(seller_id=seller.id).exists()
+    assert not PriceHistory.objects.filter(seller_id=seller.id).exists()
+    # Best offers moved to the remaining seller, fasteners without offers lost theirs
+    assert dict(BestOffer.objects.values_list('fastener_id', 'seller_id')) == {
+        fasteners[0].id: other.id, fasteners[1].id: other.id,
+    }
+
+
+@pytest.mark.django_db
+def test_offboard_seller_bumps_catalog_version_per_batch(seller, catalog, django_capture_on_commit_callbacks):
+    version = get_catalog_version()
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        offboard_seller(seller.id, batch_size=2)
+
+    # One bump per batch of deleted offers
+    assert sum(callback is bump_catalog_version for callback in callbacks) == 3
+    assert get_catalog_version() == version + 3
+
+
+@pytest.mark.django_db
+def test_offboard_seller_without_offers(seller):
+    assert offboard_seller(seller.id) == 0
+    assert not Seller.objects.filter(id=seller.id).exists()
+
+
+@pytest.mark.django_db
+def test_offboard_seller_command(seller, catalog):
+    out = StringIO()
+    call_command('offboard_seller', seller.id, '--batch-size', '3', stdout=out)
+
+    assert out.getvalue().splitlines() == [
+        "Deleted 3 of 5 offers.",
+        "Deleted 5 of 5 offers.",
+        f"Offboarded seller {seller.id} with 5 offers.",
+    ]
+    with pytest.raises(CommandError):
+        call_command('offboard_seller', seller.id)
@@ -0,0 +1,64 @@
+import re
+import pytest
+from django.db import connection
+from fastener_app.models import SellerFastener
+from fastener_app.tests.factories import SellerFactory, SellerFastenerFactory
+
+PARTITION = re.compile(r'seller_fastener_p\d+')
+
+
+def scanned_partitions(plan):
+    return set(PARTITION.findall(plan))
+
+
+@pytest.fixture
+def offers(seller):
+    for other in [seller, *SellerFactory.create_batch(20)]:
+        SellerFastenerFactory(seller=other)
+    return SellerFastener.objects.filter(seller=seller)
+
+
+@pytest.mark.django_db
+def test_seller_fastener_is_partitioned(offers):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM pg_inherits WHERE inhparent = %s::regclass",
+            [connection.ops.quote_name(SellerFastener._meta.db_table)],
+        )
+        assert cursor.fetchone()[0] == 16
+    assert len(scanned_partitions(SellerFastener.objects.all().explain())) == 16
+
+
+@pytest.mark.django_db
+def test_seller_scoped_queries_prune_partitions(seller, offers):
+    offer = offers.get()
+
+    assert len(scanned_partitions(offers.explain())) == 1
+    assert len(scanned_partitions(SellerFastener.objects.filter(seller=seller, fastener=offer.fastener).explain())) == 1
+    assert len(scanned_partitions(offers.filter(quantity__gt=0).order_by('fastener_id').explain())) == 1
+
+
+@pytest.mark.django_db
+def test_offboarding_delete_prunes_partitions(seller, offers):
+    table = connection.ops.quote_name(SellerFastener._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"EXPLAIN DELETE FROM {table} WHERE seller_id = %s AND id IN ("
+            f"SELECT id FROM {table} WHERE seller_id = %s LIMIT %s) RETURNING fastener_id",
+            [seller.id, seller.id, 100],
+        )
+        plan = '\n'.join(row[0] for row in cursor.fetchall())
+    assert len(scanned_partitions(plan)) == 1
+
+
+@pytest.mark.django_db
+def test_orm_writes_on_partitioned_table(seller, offers):
+    offer = offers.get()
+    offer.quantity = 7
+    offer.save()
+    SellerFastener.objects.update_or_create(seller=seller, fastener=offer.fastener, defaults={'price': 3})
+
+    offer.refresh_from_db()
+    assert (offer.quantity, offer.price) == (7, 3)
+    offer.delete()
+    assert not offers.exists()
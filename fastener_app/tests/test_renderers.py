@@ -0,0 +1,61 @@
+import decimal
+import msgpack
+import pyarrow as pa
+from fastener_app.renderers import (
+    ArrowRenderer,
+    ColumnarData,
+    CSVRenderer,
+    MessagePackRenderer,
+    to_columnar,
+)
+
+
+def test_to_columnar_flattens_nested_dicts():
+    table = to_columnar([
+        {'product_id': 'F001', 'material': {'id': 1, 'name': 'Steel'}},
+        {'product_id': 'F002', 'material': {'id': 2, 'name': 'Brass'}},
+    ])
+
+    assert table.names == ['product_id', 'material.id', 'material.name']
+    assert table.columns == [['F001', 'F002'], [1, 2], ['Steel', 'Brass']]
+    assert len(table) == 2
+
+
+def test_columnar_data_from_no_rows():
+    table = ColumnarData.from_rows(['product_id', 'description'], [])
+
+    assert len(table) == 0
+    assert list(table.rows()) == []
+
+
+def test_csv_renderer():
+    table = ColumnarData.from_rows(['product_id', 'thread_size.name'], [('F001', 'M12-1.75'), ('F002', 'M10, fine')])
+
+    content = CSVRenderer().render(table).decode('utf-8')
+
+    assert content.splitlines() == ['product_id,thread_size.name', 'F001,M12-1.75', 'F002,"M10, fine"']
+
+
+def test_csv_renderer_error_document():
+    content = CSVRenderer().render({'error': "Invalid filter key 'size'."}).decode('utf-8')
+
+    assert content.splitlines() == ['error', "Invalid filter key 'size'."]
+
+
+def test_msgpack_renderer_matches_json_document():
+    data = [{'product_id': 'F001', 'price': decimal.Decimal('1.50'), 'material': {'name': 'Steel'}}]
+
+    content = MessagePackRenderer().render(data)
+
+    assert msgpack.unpackb(content) == [{'product_id': 'F001', 'price': '1.50', 'material': {'name': 'Steel'}}]
+
+
+def test_arrow_renderer_builds_typed_columns():
+    table = ColumnarData.from_rows(['id', 'product_id', 'metric_size_num'], [(1, 'F001', 12.0), (2, 'F002', None)])
+
+    content = ArrowRenderer().render(table)
+
+    result = pa.ipc.open_stream(content).read_all()
+    assert result.column_names == ['id', 'product_id', 'metric_size_num']
+    assert result.schema.field('id').type == pa.int64()
+    assert result.column('metric_size_num').to_pylist() == [12.0, None]
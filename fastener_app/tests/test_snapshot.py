@@ -0,0 +1,147 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from fastener_app import snapshot
+from fastener_app.catalog_version import bump_catalog_version
+from fastener_app.snapshot import CatalogSnapshot
+from fastener_app.tests.factories import (
+    CategoryFactory,
+    FastenerFactory,
+    FinishFactory,
+    MaterialFactory,
+    ThreadSizeFactory,
+)
+
+
+@pytest.fixture
+def catalog(db, settings, monkeypatch):
+    """Fasteners with tied sort values, mixed-case names and a thread size without metric size."""
+    settings.CATALOG_SNAPSHOT_ENABLED = True
+    monkeypatch.setattr(snapshot, '_snapshot', None)
+
+    steel, brass = MaterialFactory(name='Steel'), MaterialFactory(name='brass')
+    steel_upper = MaterialFactory(name='STEEL')
+    plain, zinc = FinishFactory(name='Plain'), FinishFactory(name='Zinc')
+    bolt, screw = CategoryFactory(name='Bolt'), CategoryFactory(name='Screw')
+    m10, m12 = ThreadSizeFactory(metric_size_num=10.0), ThreadSizeFactory(metric_size_num=12.0)
+    m10_fine, imperial = ThreadSizeFactory(metric_size_num=10.0), ThreadSizeFactory(metric_size_num=None)
+
+    specs = [
+        ('C3', 'Hex bolt', m12, steel, plain, bolt),
+        ('A1', 'hex bolt', m10, brass, zinc, bolt),
+        ('B2', 'Wood screw', imperial, steel_upper, zinc, screw),
+        ('A2', 'Hex bolt', m10_fine, steel, plain, screw),
+        ('D4', 'Carriage bolt', m10, brass, plain, bolt),
+        ('E5', 'Wood screw', m12, steel, zinc, screw),
+    ]
+    fasteners = [
+        FastenerFactory(product_id=product_id, description=description, thread_size=thread_size,
+                        material=material, finish=finish, category=category)
+        for product_id, description, thread_size, material, finish, category in specs
+    ]
+    bump_catalog_version()
+    return fasteners
+
+
+QUERIES = [
+    {},
+    {'sort': 'thread_size:asc'},
+    {'sort': 'thread_size:desc'},
+    {'sort': 'material:asc,thread_size:desc'},
+    {'sort': 'description:desc'},
+    {'sort': 'category:desc,description:asc,product_id:desc'},
+    {'filter': ['material:steel']},
+    {'filter': ['material:steel', 'material:BRASS', 'finish:zinc'], 'sort': 'product_id:desc'},
+    {'filter': ['category:bolt'], 'sort': 'thread_size:desc', 'fields': 'product_id,thread_size.metric_size_num'},
+    {'filter': ['finish:chrome']},
+    {'fields': 'description,material,category.name', 'sort': 'finish:asc'},
+]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params', QUERIES)
+def test_snapshot_matches_database(api_client, catalog, settings, params):
+    response = api_client.get(reverse('fastener-list'), params)
+    assert response.status_code == status.HTTP_200_OK
+    assert response['X-Catalog-Source'] == 'snapshot'
+
+    settings.CATALOG_SNAPSHOT_ENABLED = False
+    expected = api_client.get(reverse('fastener-list'), params)
+    assert expected['X-Catalog-Source'] == 'database'
+
+    assert response.json() == expected.json()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('format', ['csv', 'arrow', 'msgpack'])
+def test_snapshot_formats_match_database(api_client, catalog, settings, format):
+    params = {'format': format, 'sort': 'material:desc', 'fields': 'id,product_id,thread_size.metric_size_num,finish'}
+    response = api_client.get(reverse('fastener-list'), params)
+
+    settings.CATALOG_SNAPSHOT_ENABLED = False
+    assert response.content == api_client.get(reverse('fastener-list'), params).content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params', [
+    {'offers': 'true'},
+    {'sort': 'price:asc'},
+    {'filter': ['description:hex bolt']},
+])
+def test_snapshot_falls_back_to_database(api_client, catalog, params):
+    response = api_client.get(reverse('fastener-list'), params)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['X-Catalog-Source'] == 'database'
+
+
+@pytest.mark.django_db
+def test_snapshot_built_once_per_catalog_version(api_client, catalog, django_assert_num_queries):
+    api_client.get(reverse('fastener-list'))
+
+    with django_assert_num_queries(0):
+        response = api_client.get(reverse('fastener-list'), {'sort': 'description:asc'})
+    assert len(response.json()) == len(catalog)
+
+    FastenerFactory(product_id='F6')
+    assert len(api_client.get(reverse('fastener-list')).json()) == len(catalog)
+
+    bump_catalog_version()
+    assert len(api_client.get(reverse('fastener-list')).json()) == len(catalog) + 1
+
+
+@pytest.mark.django_db
+def test_snapshot_rebuilt_after_dimension_rename(api_client, catalog, django_capture_on_commit_callbacks):
+    api_client.get(reverse('fastener-list'))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        material = catalog[1].material
+        material.name = 'Bronze'
+        material.save()
+
+    response = api_client.get(reverse('fastener-list'), {'filter': 'material:bronze'})
+    assert response['X-Catalog-Source'] == 'snapshot'
+    assert sorted(item['product_id'] for item in response.json()) == ['A1', 'D4']
+
+
+@pytest.mark.django_db
+def test_snapshot_invalid_parameters(api_client, catalog):
+    response = api_client.get(reverse('fastener-list'), {'sort': 'weight:asc'})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'error': "Cannot sort by field 'weight'."}
+
+
+def test_snapshot_from_rows_sorts_text_in_python():
+    dimensions = {
+        'thread_size': [(1, 10.0, {'id': 1, 'name': 'M10'})],
+        'material': [(1, 'Steel', {'id': 1, 'name': 'Steel'})],
+        'finish': [(1, 'Plain', {'id': 1, 'name': 'Plain'})],
+        'category': [(1, 'Bolt', {'id': 1, 'name': 'Bolt'})],
+    }
+    rows = [(1, 'B', 'Écrou', 1, 1, 1, 1), (2, 'A', 'Bolt', 1, 1, 1, 1), (3, 'C', 'Bolt', 1, 1, 1, 1)]
+    catalog = CatalogSnapshot(version=1, rows=rows, dimensions=dimensions)
+
+    assert catalog.column('product_id', catalog.query({}, [('description', 'asc')])) == ['A', 'C', 'B']
+    assert catalog.column('id', catalog.query({'material': ['steel']}, [('product_id', 'desc')])) == [3, 1, 2]
+    assert catalog.memory_usage() > 0
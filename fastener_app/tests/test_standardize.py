@@ -1,7 +1,10 @@
+import threading
 import pytest
+from django.db import connection, transaction
 from fastener_app.standardizers import standardize_thread_size
 from fastener_app.models import (
     ThreadSize,
+    ThreadSizeEquivalence,
     constants
 )
 
@@ -40,5 +43,48 @@ def test_standardize_thread_size_imperial():
 
     # Ensure the ThreadSize instance was created in the database
     thread_size = ThreadSize.objects.get(imperial_size_str='1/2-13')
+    assert thread_size.name == '1/2-13'
     assert thread_size.imperial_size_num == 0.5
     assert thread_size.thread_per_unit == 13
+
+
+@pytest.mark.django_db
+def test_standardize_thread_size_reuses_the_canonical_row():
+    first, second = {}, {}
+
+    standardize_thread_size({'thread_size': 'M12-1.75'}, first)
+    standardize_thread_size({'thread_size': 'M12-1.75'}, second)
+
+    assert second['thread_size'].id == first['thread_size'].id
+    assert first['thread_size'].canonical_key == 'M12-1.75|1/2-44'
+    assert ThreadSize.objects.count() == 1
+    assert ThreadSizeEquivalence.objects.count() == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_standardize_thread_size_creates_one_row(committed_rows):
+    workers = 8
+    barrier = threading.Barrier(workers)
+    thread_size_ids, errors = [], []
+
+    def ingest():
+        try:
+            with transaction.atomic():
+                standardized_data = {}
+                barrier.wait()
+                standardize_thread_size({'thread_size': '3/8-16'}, standardized_data)
+            thread_size_ids.append(standardized_data['thread_size'].id)
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=ingest) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(set(thread_size_ids)) == 1
+    assert ThreadSize.objects.filter(imperial_size_str='3/8-16').count() == 1
@@ -0,0 +1,125 @@
+import json
+import os
+import pytest
+from decimal import Decimal
+from django.db import OperationalError, connection
+from django.test.utils import CaptureQueriesContext
+from fastener_app.models import BestOffer, PriceHistory, SellerFastener, SellerStats
+from fastener_app.stock_buffer import StockBuffer
+
+
+def quantities(offers):
+    return [SellerFastener.objects.get(id=offer.id).quantity for offer in offers]
+
+
+def test_updates_are_coalesced_last_write_wins():
+    buffer = StockBuffer(max_size=100)
+
+    assert buffer.add([(1, 1, 5), (1, 2, 7), (1, 1, 3)]) == 2
+    assert buffer.add([(1, 1, 4)]) == 2
+
+    assert buffer.pending == {(1, 1): 4, (1, 2): 7}
+    assert buffer.stats() == {'pending': 2, 'received': 4, 'flushed': 0, 'written': 0}
+
+
+@pytest.mark.django_db
+def test_flush_writes_changed_offers_only(fastener, offers):
+    buffer = StockBuffer(max_size=100)
+    buffer.add([(offers[0].seller_id, fastener.id, 0), (offers[1].seller_id, fastener.id, 10),
+                (offers[0].seller_id, 999999, 5)])
+
+    with CaptureQueriesContext(connection) as queries:
+        written = buffer.flush()
+
+    assert written == 1
+    assert quantities(offers) == [0, 10]
+    assert sum('UPDATE' in query['sql'] and 'VALUES' in query['sql'] for query in queries.captured_queries) == 1
+    assert BestOffer.objects.get(fastener=fastener).best_price == Decimal('2.00')
+    assert PriceHistory.objects.filter(seller_id=offers[0].seller_id, quantity=0).exists()
+    assert SellerStats.objects.get(seller_id=offers[0].seller_id).in_stock_count == 0
+    assert buffer.stats() == {'pending': 0, 'received': 3, 'flushed': 3, 'written': 1}
+    assert buffer.flush() == 0
+
+
+@pytest.mark.django_db
+def test_flush_in_batches(fastener, offers, monkeypatch):
+    monkeypatch.setattr('fastener_app.stock_buffer.STOCK_FLUSH_BATCH_SIZE', 1)
+    buffer = StockBuffer(max_size=100)
+    buffer.add([(offers[0].seller_id, fastener.id, 3), (offers[1].seller_id, fastener.id, 4)])
+
+    assert buffer.flush() == 2
+    assert quantities(offers) == [3, 4]
+
+
+@pytest.mark.django_db
+def test_flush_when_max_size_is_reached(fastener, offers):
+    buffer = StockBuffer(max_size=2)
+
+    assert buffer.add([(offers[0].seller_id, fastener.id, 5), (offers[0].seller_id, fastener.id, 6)]) == 1
+    assert quantities(offers) == [2, 10]
+
+    buffer.add([(offers[1].seller_id, fastener.id, 7)])
+
+    assert quantities(offers) == [6, 7]
+    assert len(buffer) == 0
+
+
+@pytest.mark.django_db
+def test_failed_flush_keeps_updates_behind_newer_ones(fastener, offers, monkeypatch):
+    buffer = StockBuffer(max_size=100)
+    buffer.add([(offers[0].seller_id, fastener.id, 5), (offers[1].seller_id, fastener.id, 6)])
+
+    def fail(updates):
+        buffer.add([(offers[0].seller_id, fastener.id, 8)])
+        raise RuntimeError("Database unavailable")
+
+    monkeypatch.setattr(buffer, 'write', fail)
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+    monkeypatch.undo()
+
+    assert buffer.pending == {(offers[0].seller_id, fastener.id): 8, (offers[1].seller_id, fastener.id): 6}
+    assert buffer.flush() == 2
+    assert quantities(offers) == [8, 6]
+
+
+@pytest.mark.django_db
+def test_failed_size_triggered_flush_keeps_updates(fastener, offers, monkeypatch):
+    buffer = StockBuffer(max_size=2)
+
+    def fail(updates):
+        raise OperationalError("Database unavailable")
+
+    monkeypatch.setattr(buffer, 'write', fail)
+    assert buffer.add([(offers[0].seller_id, fastener.id, 5), (offers[1].seller_id, fastener.id, 6)]) == 2
+    monkeypatch.undo()
+
+    buffer.add([(offers[0].seller_id, fastener.id, 7)])
+
+    assert quantities(offers) == [7, 6]
+    assert len(buffer) == 0
+
+
+@pytest.mark.django_db
+def test_journal_is_replayed_after_a_crash(fastener, offers, tmp_path):
+    # A journal left by a process that is gone, and one of a process that was flushing when it died
+    (tmp_path / 'stock-999999999.flushing').write_text(json.dumps([offers[0].seller_id, fastener.id, 1]) + '\n')
+    (tmp_path / 'stock-999999999.jsonl').write_text(json.dumps([offers[0].seller_id, fastener.id, 3]) + '\n')
+    os.utime(tmp_path / 'stock-999999999.flushing', (0, 0))
+    # One of a live process is left alone
+    (tmp_path / 'stock-1.jsonl').write_text(json.dumps([offers[1].seller_id, fastener.id, 1]) + '\n')
+
+    buffer = StockBuffer(max_size=100, journal_dir=tmp_path)
+
+    assert buffer.pending == {(offers[0].seller_id, fastener.id): 3}
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['stock-1.jsonl', f'stock-{os.getpid()}.jsonl']
+
+    # Until flushed, the updates are journaled again by this process
+    buffer.add([(offers[1].seller_id, fastener.id, 4)])
+    journal = [json.loads(line) for line in (tmp_path / f'stock-{os.getpid()}.jsonl').read_text().splitlines()]
+    assert journal == [[offers[0].seller_id, fastener.id, 3], [offers[1].seller_id, fastener.id, 4]]
+
+    buffer.close()
+
+    assert quantities(offers) == [3, 4]
+    assert sorted(path.name for path in tmp_path.iterdir()) == ['stock-1.jsonl']
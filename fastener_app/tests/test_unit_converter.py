@@ -4,7 +4,7 @@ from fastener_app.unit_converter import (
     inch_to_mm, mm_to_inch, decimal_to_fraction_with_quarter_steps,
     get_all_info_from_thread_size_str,
     imperial_to_metric_name, metric_to_imperial_name, parse_fraction_number,
-    round_to_nearest_quarter
+    round_to_nearest_quarter, thread_geometry
 )
 from fastener_app.models import constants
 
@@ -101,3 +101,13 @@ def test_round_to_nearest_quarter():
     assert round_to_nearest_quarter(1.13) == 1.25
     assert round_to_nearest_quarter(1.68) == 1.75
     assert round_to_nearest_quarter(1.99) == 2.0
+
+
+def test_thread_geometry():
+    diameter, pitch = thread_geometry(constants.ThreadType.IMPERIAL.value, 12.0, 0.5, 13)
+    assert diameter == pytest.approx(12.7)
+    assert pitch == pytest.approx(25.4 / 13)
+
+    assert thread_geometry(constants.ThreadType.METRIC.value, 12.0, 0.5, 1.75) == (12.0, 1.75)
+    assert thread_geometry(constants.ThreadType.METRIC.value, None, 0.5, 1.75) is None
+    assert thread_geometry(constants.ThreadType.IMPERIAL.value, 12.0, 0.5, 0) is None
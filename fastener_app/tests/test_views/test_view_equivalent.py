@@ -0,0 +1,93 @@
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from fastener_app.models import ThreadSize, ThreadSizeEquivalence
+
+
+@pytest.fixture
+def ingested(api_client, seller, django_capture_on_commit_callbacks):
+    """Fasteners in 1/2-13, its metric counterpart M12.7-1.95 and the close but different M12-1.75."""
+    csv_content = (
+        "id,name,size_and_length,material,surface_treatment,category,price,quantity\n"
+        "F001,Hex Bolt,1/2-13,Steel,Plain,Hex Cap Screw,1.00,10\n"
+        "F002,Hex Bolt,M12.7-1.95,Steel,Plain,Hex Cap Screw,1.00,10\n"
+        "F003,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,1.00,10\n"
+    ).encode('utf-8')
+    csv_file = SimpleUploadedFile('fasteners.csv', csv_content, content_type='text/csv')
+    # Committing the ingest bumps the dimension version for the new thread sizes
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(reverse('fastener-ingest', args=[seller.id]), {'file': csv_file}, format='multipart')
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+def product_ids(response):
+    assert response.status_code == status.HTTP_200_OK
+    return sorted(item['product_id'] for item in response.json())
+
+
+@pytest.mark.django_db
+def test_ingest_indexes_equivalent_thread_sizes(ingested):
+    imperial = ThreadSize.objects.get(name='1/2-13')
+    metric = ThreadSize.objects.get(name='M12.7-1.95')
+
+    equivalents = set(ThreadSizeEquivalence.objects.values_list('thread_size_id', 'equivalent_id'))
+    assert (imperial.id, metric.id) in equivalents
+    assert (metric.id, imperial.id) in equivalents
+    # Every thread size is its own equivalent, M12-1.75 has no other
+    assert len(equivalents) == 5
+
+
+@pytest.mark.django_db
+def test_filter_by_thread_size(api_client, ingested):
+    response = api_client.get(reverse('fastener-list'), {'filter': 'thread_size:1/2-13'})
+
+    assert product_ids(response) == ['F001']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('thread_size', ['1/2-13', 'm12.7-1.95'])
+def test_equivalent_thread_size_search(api_client, ingested, thread_size):
+    response = api_client.get(reverse('fastener-list'), {'filter': f'thread_size:{thread_size}', 'equivalent': 'true'})
+
+    assert product_ids(response) == ['F001', 'F002']
+
+
+@pytest.mark.django_db
+def test_equivalent_search_is_an_index_lookup(api_client, ingested):
+    with CaptureQueriesContext(connection) as queries:
+        api_client.get(reverse('fastener-list'), {'filter': 'thread_size:M12-1.75', 'equivalent': 'true'})
+
+    fastener_queries = [query['sql'] for query in queries.captured_queries if 'thread_size_equivalence' in query['sql']]
+    assert len(fastener_queries) == 1
+    assert '"thread_size_id" IN (SELECT' in fastener_queries[0]
+
+
+@pytest.mark.django_db
+def test_equivalent_requires_thread_size_filter(api_client, ingested):
+    response = api_client.get(reverse('fastener-list'), {'filter': 'material:steel', 'equivalent': 'true'})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'error': "equivalent=true requires a thread_size filter."}
+
+
+@pytest.mark.django_db
+def test_rebuild_with_wider_tolerance(api_client, ingested, settings):
+    settings.THREAD_EQUIVALENCE_TOLERANCE = 0.11
+
+    call_command('rebuild_thread_size_equivalences')
+
+    response = api_client.get(reverse('fastener-list'), {'filter': 'thread_size:M12-1.75', 'equivalent': 'true'})
+    assert product_ids(response) == ['F001', 'F002', 'F003']
+
+
+@pytest.mark.django_db
+def test_facets_filtered_by_thread_size(api_client, ingested):
+    response = api_client.get(reverse('fastener-facets'), {'filter': 'thread_size:M12-1.75'})
+
+    assert response['X-Facet-Source'] == 'aggregate'
+    assert response.json()['thread_size'] == [{'id': ThreadSize.objects.get(name='M12-1.75').id,
+                                               'name': 'M12-1.75', 'count': 1}]
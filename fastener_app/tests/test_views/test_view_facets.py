@@ -0,0 +1,95 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from fastener_app.facets import get_facet_counts, rebuild_facet_counts
+from fastener_app.models import Seller, FacetCount
+
+
+@pytest.fixture
+def seller(db):
+    return Seller.objects.create(
+        name="Facet Seller",
+        contact_email="facet@example.com",
+        csv_mapping={
+            'field_1': 'product_id',
+            'field_2': 'description',
+            'field_3': 'thread_size',
+            'field_4': 'material',
+            'field_5': 'finish',
+            'field_6': 'category',
+            'field_7': 'price',
+            'field_8': 'quantity'
+        }
+    )
+
+
+@pytest.fixture
+def ingested(ingest):
+    ingest(
+        "F001,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,10.50,200\n",
+        "F002,Hex Bolt,M10-1.5,Steel,Zinc,Hex Cap Screw,15.99,300\n",
+        "F003,Wood Screw,M10-1.5,Brass,Zinc,Wood Screw,1.99,50\n",
+    )
+
+
+def counts(facet):
+    return {item['name']: item['count'] for item in facet}
+
+
+@pytest.mark.django_db
+def test_facets_from_aggregate_table(api_client, ingested):
+    response = api_client.get(reverse('fastener-facets'))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['X-Facet-Source'] == 'aggregate'
+    assert counts(response.data['material']) == {'Brass': 1, 'Steel': 2}
+    assert counts(response.data['finish']) == {'Plain': 1, 'Zinc': 2}
+    assert counts(response.data['category']) == {'Hex Cap Screw': 2, 'Wood Screw': 1}
+    assert counts(response.data['thread_size']) == {'M10-1.5': 2, 'M12-1.75': 1}
+
+
+@pytest.mark.django_db
+def test_facets_with_dimension_filters(api_client, ingested):
+    response = api_client.get(reverse('fastener-facets'), {'filter': ['material:steel', 'finish:ZINC']})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['X-Facet-Source'] == 'aggregate'
+    assert counts(response.data['material']) == {'Steel': 1}
+    assert counts(response.data['thread_size']) == {'M10-1.5': 1}
+
+
+@pytest.mark.django_db
+def test_facets_fall_back_to_live_aggregation(api_client, ingested):
+    response = api_client.get(reverse('fastener-facets'), {'filter': ['description:hex bolt']})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['X-Facet-Source'] == 'live'
+    assert counts(response.data['material']) == {'Steel': 2}
+    assert counts(response.data['finish']) == {'Plain': 1, 'Zinc': 1}
+
+
+@pytest.mark.django_db
+def test_facets_invalid_filter_key(api_client, ingested):
+    response = api_client.get(reverse('fastener-facets'), {'filter': ['invalid_key:Steel']})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['error'] == "Invalid filter key 'invalid_key'."
+
+
+@pytest.mark.django_db
+def test_facets_follow_reingested_fastener(api_client, ingested, ingest):
+    # F003 moves from Brass to Steel, the Brass bucket must disappear
+    ingest("F003,Wood Screw,M10-1.5,Steel,Zinc,Wood Screw,1.99,50\n")
+
+    response = api_client.get(reverse('fastener-facets'))
+    assert counts(response.data['material']) == {'Steel': 3}
+    assert sum(FacetCount.objects.values_list('count', flat=True)) == 3
+
+
+@pytest.mark.django_db
+def test_rebuild_facet_counts_matches_live_aggregation(ingested):
+    FacetCount.objects.update(count=42)
+
+    rebuild_facet_counts()
+
+    assert get_facet_counts({}, {}) == get_facet_counts({}, {}, live=True)
@@ -3,7 +3,10 @@ import logging
 from django.urls import reverse
 from rest_framework import status
 from django.core.files.uploadedfile import SimpleUploadedFile
-from fastener_app.models import Seller, Fastener, SellerFastener
+from django.utils import timezone
+from fastener_app.models import BestOffer, IngestRun, PriceHistory, Seller, Fastener, SellerFastener
+from fastener_app.price_history import price_as_of
+from fastener_app.reconciliation import retire_stale_offers
 from unittest.mock import patch, call
 
 
@@ -136,3 +139,75 @@ def test_error_handling_during_ingestion(logger, api_client, seller, valid_csv_f
     assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
     assert response.data['error'] == "Failed to ingest CSV data."
     logger.error.assert_called_with("Error ingesting CSV data: Test Exception")
+
+
+def upload(ingest, rows, **data):
+    return ingest(*(f"{product_id},Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,{price},{quantity}\n"
+                    for product_id, price, quantity in rows), expected_status=None, **data)
+
+
+@pytest.fixture
+def catalog(ingest):
+    response = upload(ingest, [('F001', '1.00', 10), ('F002', '2.00', 20), ('F003', '3.00', 30)])
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_full_ingest_zeroes_missing_offers(seller, catalog, ingest):
+    response = upload(ingest, [('F001', '1.50', 15)], mode='full')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data['rows'] == 1
+    assert response.data['retired'] == 2
+    offers = dict(SellerFastener.objects.filter(seller=seller).values_list('fastener__product_id', 'quantity'))
+    assert offers == {'F001': 15, 'F002': 0, 'F003': 0}
+    assert BestOffer.objects.get(fastener__product_id='F002').best_price is None
+    ingest_run = IngestRun.objects.get(id=response.data['ingest_run'])
+    assert (ingest_run.mode, ingest_run.retired_count) == (IngestRun.FULL, 2)
+    assert SellerFastener.objects.get(fastener__product_id='F001').last_ingest_run == ingest_run
+    assert seller.stats.in_stock_count == 1
+
+
+@pytest.mark.django_db
+def test_full_ingest_deletes_missing_offers(seller, catalog, ingest):
+    response = upload(ingest, [('F002', '2.00', 20)], mode='full', retire='delete')
+
+    assert response.data['retired'] == 2
+    assert list(SellerFastener.objects.filter(seller=seller).values_list('fastener__product_id', flat=True)) == ['F002']
+    assert not BestOffer.objects.filter(fastener__product_id__in=['F001', 'F003']).exists()
+    # The price history closes the deleted offers
+    closed = price_as_of(seller.id, Fastener.objects.get(product_id='F001').id, timezone.now())
+    assert (str(closed.price), closed.quantity) == ('1.00', 0)
+    assert PriceHistory.objects.filter(seller=seller, quantity=0).count() == 2
+
+
+@pytest.mark.django_db
+def test_delta_ingest_keeps_missing_offers(seller, catalog, ingest):
+    response = upload(ingest, [('F001', '1.50', 15)])
+
+    assert response.data['retired'] == 0
+    assert SellerFastener.objects.filter(seller=seller, quantity__gt=0).count() == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('data, error', [
+    ({'mode': 'partial'}, "Invalid mode 'partial'. Use 'delta' or 'full'."),
+    ({'mode': 'full', 'retire': 'archive'}, "Invalid retire action 'archive'. Use 'zero' or 'delete'."),
+])
+def test_full_ingest_invalid_options(ingest, data, error):
+    response = upload(ingest, [('F001', '1.00', 10)], **data)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['error'] == error
+    assert not IngestRun.objects.exists()
+
+
+@pytest.mark.django_db
+def test_retire_stale_offers_in_batches(api_client, seller, catalog):
+    ingest_run = IngestRun.objects.get()
+
+    # Every offer was written by another run, so all of them are stale
+    assert retire_stale_offers(seller.id, ingest_run.id + 1, 'zero', batch_size=2) == 3
+    # Offers already out of stock are not retired twice
+    assert retire_stale_offers(seller.id, ingest_run.id + 1, 'zero', batch_size=2) == 0
+
@@ -1,6 +1,11 @@
 # fastener_app/tests/test_views.py
 
+import msgpack
+import pyarrow as pa
 import pytest
+from django.conf import settings
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework import status
@@ -107,8 +112,9 @@ def test_get_fasteners_sorted_by_metric_size_ascending(api_client):
 
 import pytest
 from django.urls import reverse
+from django.core.files.uploadedfile import SimpleUploadedFile
 from rest_framework import status
-from fastener_app.models import Fastener, Material, Finish, Category, ThreadSize
+from fastener_app.models import Fastener, Material, Finish, Category, Seller, ThreadSize
 
 @pytest.fixture
 def setup_fasteners(db):
@@ -153,6 +159,70 @@ def test_list_fasteners_sort_by_thread_size_desc(api_client, setup_fasteners):
     assert response.data[1]['product_id'] == 'F002'
 
 
+@pytest.mark.django_db
+def test_list_fasteners_sort_by_thread_size_across_systems(api_client, seller):
+    """1/4-20 is 6.35 mm: it sorts between M6 and M7 instead of tying with M6, and M6 coarse after fine."""
+    csv_content = (
+        "id,name,size_and_length,material,surface_treatment,category,price,quantity\n"
+        "F001,Hex Bolt,M7-1,Steel,Plain,Hex Cap Screw,1.00,10\n"
+        "F002,Hex Bolt,1/4-20,Steel,Plain,Hex Cap Screw,1.00,10\n"
+        "F003,Hex Bolt,M6-1,Steel,Plain,Hex Cap Screw,1.00,10\n"
+        "F004,Hex Bolt,M6-0.75,Steel,Plain,Hex Cap Screw,1.00,10\n"
+    ).encode('utf-8')
+    csv_file = SimpleUploadedFile('fasteners.csv', csv_content, content_type='text/csv')
+    response = api_client.post(reverse('fastener-ingest', args=[seller.id]), {'file': csv_file}, format='multipart')
+    assert response.status_code == status.HTTP_201_CREATED
+
+    response = api_client.get(reverse('fastener-list'), {'sort': 'thread_size:asc'})
+
+    assert [item['product_id'] for item in response.data] == ['F004', 'F003', 'F002', 'F001']
+    assert Fastener.objects.get(product_id='F002').thread_sort_key == 6350001270
+
+
+@pytest.mark.django_db
+def test_list_fasteners_sort_by_thread_size_uses_index(setup_fasteners):
+    plan = Fastener.objects.order_by('thread_sort_key', 'id')[:20].explain()
+
+    assert 'fastener_thread_sort_key_id' in plan
+    assert 'Sort' not in plan.replace('Sort Key', '')
+
+
+@pytest.mark.django_db
+def test_thread_size_update_refreshes_fastener_sort_keys(setup_fasteners):
+    thread_size = ThreadSize.objects.get(metric_size_str="M10-1.75")
+    thread_size.metric_size_num = 14.0
+    thread_size.save()
+
+    assert Fastener.objects.get(product_id="F002").thread_sort_key == thread_size.sort_key == 14000001100
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('field', ['material', 'finish', 'category'])
+def test_list_fasteners_sort_by_dimension_uses_index(setup_fasteners, field):
+    plan = Fastener.objects.order_by(f'{field}_name', 'id')[:20].explain()
+
+    assert f'fastener_{field}_name_id' in plan
+    assert 'Sort' not in plan.replace('Sort Key', '')
+
+
+@pytest.mark.django_db
+def test_dimension_rename_refreshes_fastener_names(api_client, setup_fasteners,
+                                                   django_capture_on_commit_callbacks):
+    steel = Material.objects.get(name="Steel")
+    Fastener.objects.filter(product_id="F002").update(material=Material.objects.create(name="Nylon"))
+    Fastener.objects.get(product_id="F002").save()
+    etag = api_client.get(reverse('fastener-list'), {'sort': 'material:asc'})['ETag']
+
+    with django_capture_on_commit_callbacks(execute=True):
+        steel.name = "Zinc Steel"
+        steel.save()
+
+    assert Fastener.objects.get(product_id="F001").material_name == "Zinc Steel"
+    response = api_client.get(reverse('fastener-list'), {'sort': 'material:asc'}, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert [item['product_id'] for item in response.data] == ['F002', 'F001']
+
+
 @pytest.mark.django_db
 def test_list_fasteners_invalid_sort_parameter_format(api_client, setup_fasteners):
     """Test invalid sorting parameter format."""
@@ -204,3 +274,206 @@ def test_invalid_filter_format(api_client, setup_fasteners):
     assert response.status_code == status.HTTP_400_BAD_REQUEST
     assert "error" in response.data
     assert response.data['error'] == "Invalid filter format: 'materialSteel'. Expected format: 'key:value'."
+
+
+@pytest.mark.django_db
+def test_list_fasteners_returns_etag(api_client, setup_fasteners):
+    response = api_client.get(reverse('fastener-list'), {'sort': 'thread_size:asc'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['ETag'].startswith('"') and response['ETag'].endswith('"')
+    assert 'Accept' in response['Vary']
+
+
+@pytest.mark.django_db
+def test_list_fasteners_not_modified_without_queries(api_client, setup_fasteners, django_assert_num_queries):
+    url = reverse('fastener-list')
+    etag = api_client.get(url, {'sort': 'thread_size:asc'})['ETag']
+
+    with django_assert_num_queries(0):
+        response = api_client.get(url, {'sort': 'thread_size:asc'}, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response['ETag'] == etag
+
+
+@pytest.mark.django_db
+def test_list_fasteners_etag_depends_on_normalized_query(api_client, setup_fasteners):
+    url = reverse('fastener-list')
+    etag = api_client.get(url + '?sort=thread_size:asc&filter=material:Steel')['ETag']
+
+    assert api_client.get(url + '?filter=material:Steel&sort=thread_size:asc')['ETag'] == etag
+    assert api_client.get(url + '?sort=thread_size:desc&filter=material:Steel')['ETag'] != etag
+
+
+@pytest.mark.django_db
+def test_list_fasteners_etag_changes_after_ingest(api_client, setup_fasteners, django_capture_on_commit_callbacks):
+    url = reverse('fastener-list')
+    etag = api_client.get(url)['ETag']
+    seller = Seller.objects.create(
+        name="ETag Seller",
+        contact_email="etag@example.com",
+        csv_mapping={'id': 'product_id', 'name': 'description', 'size': 'thread_size', 'material': 'material',
+                     'finish': 'finish', 'category': 'category', 'price': 'price', 'quantity': 'quantity'},
+    )
+    csv_file = SimpleUploadedFile('fasteners.csv', (
+        "id,name,size,material,finish,category,price,quantity\n"
+        "F003,Hex Nut,M8-1.25,Steel,Plain,Hex Nut,0.10,1000\n"
+    ).encode('utf-8'), content_type='text/csv')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(reverse('fastener-ingest', args=[seller.id]), {'file': csv_file}, format='multipart')
+
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == status.HTTP_200_OK
+    assert response['ETag'] != etag
+    assert len(response.data) == 3
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fields, loaded_tables, skipped_columns', [
+    ('product_id,description,thread_size.name', ['thread_size'], ['material_id', 'finish_id', 'category_id']),
+    ('product_id,material', ['material'], ['description', 'thread_size_id']),
+    ('id,product_id', [], ['description', 'material_id']),
+])
+def test_list_fasteners_sparse_fieldset_sql(api_client, setup_fasteners, fields, loaded_tables, skipped_columns):
+    with CaptureQueriesContext(connection) as context:
+        response = api_client.get(reverse('fastener-list'), {'fields': fields})
+
+    assert response.status_code == status.HTTP_200_OK
+    # The fastener query joins no dimension, the dimension cache loads the tables of the nested fields once
+    sql, *loads = [query['sql'] for query in context.captured_queries]
+    for table in ['thread_size', 'material', 'finish', 'category']:
+        assert f'"{settings.DB_SCHEMA}"."{table}"' not in sql
+    for column in skipped_columns:
+        assert f'"{column}"' not in sql
+    assert [table for table in ['thread_size', 'material', 'finish', 'category']
+            if any(f'FROM "{settings.DB_SCHEMA}"."{table}"' in load for load in loads)] == loaded_tables
+
+    with CaptureQueriesContext(connection) as context:
+        assert api_client.get(reverse('fastener-list'), {'fields': fields}).json() == response.json()
+    assert len(context.captured_queries) == 1
+
+
+@pytest.mark.django_db
+def test_list_fasteners_sparse_fieldset_payload(api_client, setup_fasteners):
+    response = api_client.get(reverse('fastener-list'), {'fields': 'product_id,description,thread_size.name',
+                                                         'sort': 'product_id:asc'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()[0] == {'product_id': 'F001', 'description': 'M12-1.75', 'thread_size': {'name': ''}}
+
+
+@pytest.mark.django_db
+def test_list_fasteners_whole_nested_field_wins(api_client, setup_fasteners):
+    response = api_client.get(reverse('fastener-list'), {'fields': 'material.name,material'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert set(response.json()[0]['material']) == {'id', 'name'}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('fields', ['price', 'thread_size.pitch', 'description.name'])
+def test_list_fasteners_invalid_fieldset(api_client, setup_fasteners, fields):
+    response = api_client.get(reverse('fastener-list'), {'fields': fields})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['error'] == f"Invalid field '{fields}'."
+
+
+@pytest.fixture
+def tied_fasteners(setup_fasteners):
+    """Add fasteners that tie with F001 on thread size and material."""
+    f001 = Fastener.objects.get(product_id="F001")
+    brass = Material.objects.create(name="Brass")
+    for product_id, material in [("F004", f001.material), ("F003", brass)]:
+        Fastener.objects.create(
+            product_id=product_id, description="M12-1.75", thread_size=f001.thread_size,
+            material=material, finish=f001.finish, category=f001.category
+        )
+
+
+@pytest.mark.django_db
+def test_list_fasteners_multi_key_sort(api_client, tied_fasteners):
+    response = api_client.get(reverse('fastener-list'), {'sort': 'thread_size:desc,material:asc'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item['product_id'] for item in response.data] == ['F003', 'F001', 'F004', 'F002']
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('direction', ['asc', 'desc'])
+def test_list_fasteners_sort_ties_broken_by_id(api_client, tied_fasteners, direction):
+    response = api_client.get(reverse('fastener-list'), {'sort': f'description:{direction}'})
+
+    ids = [item['id'] for item in response.data if item['description'] == 'M12-1.75']
+    assert ids == sorted(ids, reverse=direction == 'desc')
+
+
+@pytest.mark.django_db
+def test_list_fasteners_default_order_is_by_id(api_client, tied_fasteners):
+    response = api_client.get(reverse('fastener-list'))
+
+    ids = [item['id'] for item in response.data]
+    assert ids == sorted(ids)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('sort, error', [
+    ('material:asc,thread_size', "Invalid sort parameter format: 'thread_size'. Expected format: 'field:direction'."),
+    ('material:asc,weight:desc', "Cannot sort by field 'weight'."),
+    ('material:asc,material:desc', "Duplicate sort field 'material'."),
+])
+def test_list_fasteners_invalid_multi_key_sort(api_client, setup_fasteners, sort, error):
+    response = api_client.get(reverse('fastener-list'), {'sort': sort})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.data['error'] == error
+
+
+@pytest.mark.django_db
+def test_list_fasteners_as_msgpack(api_client, setup_fasteners):
+    url = reverse('fastener-list')
+    json_data = api_client.get(url, {'sort': 'product_id:asc'}).json()
+
+    response = api_client.get(url, {'sort': 'product_id:asc'}, HTTP_ACCEPT='application/msgpack')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'application/msgpack'
+    assert msgpack.unpackb(response.content) == json_data
+
+
+@pytest.mark.django_db
+def test_list_fasteners_as_csv(api_client, setup_fasteners):
+    response = api_client.get(reverse('fastener-list'), {'sort': 'product_id:asc', 'format': 'csv',
+                                                         'fields': 'product_id,thread_size.name,material'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'text/csv; charset=utf-8'
+    lines = response.content.decode('utf-8').splitlines()
+    assert lines[0] == 'product_id,thread_size.name,material.id,material.name'
+    assert lines[1].startswith('F001,,') and lines[1].endswith(',Steel')
+    assert len(lines) == 3
+
+
+@pytest.mark.django_db
+def test_list_fasteners_as_arrow(api_client, setup_fasteners):
+    response = api_client.get(reverse('fastener-list'), {'sort': 'thread_size:asc'},
+                              HTTP_ACCEPT='application/vnd.apache.arrow.stream')
+
+    assert response.status_code == status.HTTP_200_OK
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column('product_id').to_pylist() == ['F002', 'F001']
+    assert table.column('thread_size.metric_size_num').to_pylist() == [10.0, 12.0]
+    assert 'category.name' in table.column_names
+
+
+@pytest.mark.django_db
+def test_list_fasteners_etag_depends_on_media_type(api_client, setup_fasteners):
+    url = reverse('fastener-list')
+    etag = api_client.get(url)['ETag']
+
+    response = api_client.get(url, HTTP_ACCEPT='text/csv', HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['ETag'] != etag
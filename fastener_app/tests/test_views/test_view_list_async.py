@@ -0,0 +1,120 @@
+import msgpack
+import pyarrow as pa
+import pytest
+from asgiref.sync import async_to_sync
+from decimal import Decimal
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework import status
+from fastener_app import snapshot
+from fastener_app.list_cache import get_list_cache
+from fastener_app.offers import refresh_best_offers
+from fastener_app.tests.factories import FastenerFactory, MaterialFactory, SellerFastenerFactory, ThreadSizeFactory
+
+
+@pytest.fixture
+def async_get():
+    client = AsyncClient()
+    return async_to_sync(client.get)
+
+
+@pytest.fixture
+def fasteners(db):
+    steel = MaterialFactory(name='Steel')
+    return [
+        FastenerFactory(product_id='A002', material=steel, thread_size=ThreadSizeFactory(metric_size_num=12.0)),
+        FastenerFactory(product_id='A001', material=steel, thread_size=ThreadSizeFactory(metric_size_num=10.0)),
+        FastenerFactory(product_id='A003', material=MaterialFactory(name='Brass')),
+    ]
+
+
+@pytest.mark.django_db
+def test_async_list_matches_sync_list(api_client, async_get, fasteners):
+    params = {'sort': 'thread_size:desc', 'filter': 'material:steel'}
+
+    response = async_get(reverse('async-fastener-list'), params)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response['Content-Type'] == 'application/json'
+    assert response.json() == api_client.get(reverse('fastener-list'), params).json()
+    assert [item['product_id'] for item in response.json()] == ['A002', 'A001']
+
+
+@pytest.mark.django_db
+def test_async_list_fieldset_and_offers(async_get, fasteners):
+    SellerFastenerFactory(fastener=fasteners[0], price=Decimal('4.20'), quantity=3)
+    refresh_best_offers([fasteners[0].id])
+
+    response = async_get(reverse('async-fastener-list'), {'offers': 'true', 'fields': 'product_id,min_price',
+                                                          'sort': 'product_id:asc'})
+
+    assert response.json() == [
+        {'product_id': 'A001', 'min_price': None},
+        {'product_id': 'A002', 'min_price': '4.20'},
+        {'product_id': 'A003', 'min_price': None},
+    ]
+
+
+@pytest.mark.django_db
+def test_async_list_invalid_sort(async_get, fasteners):
+    response = async_get(reverse('async-fastener-list'), {'sort': 'weight:asc'})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'error': "Cannot sort by field 'weight'."}
+
+
+@pytest.mark.django_db
+def test_async_list_formats(async_get, fasteners):
+    url = reverse('async-fastener-list')
+    json_data = async_get(url, {'sort': 'product_id:asc'}).json()
+
+    response = async_get(url, {'sort': 'product_id:asc'}, headers={'Accept': 'application/msgpack'})
+    assert response['Content-Type'] == 'application/msgpack'
+    assert msgpack.unpackb(response.content) == json_data
+
+    response = async_get(url, {'sort': 'product_id:asc', 'format': 'csv', 'fields': 'product_id,material.name'})
+    assert response['Content-Type'] == 'text/csv; charset=utf-8'
+    assert response.content.decode('utf-8').splitlines() == [
+        'product_id,material.name', 'A001,Steel', 'A002,Steel', 'A003,Brass'
+    ]
+
+    response = async_get(url, {'sort': 'product_id:asc'}, headers={'Accept': 'application/vnd.apache.arrow.stream'})
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column('product_id').to_pylist() == ['A001', 'A002', 'A003']
+
+
+@pytest.mark.django_db
+def test_async_list_not_acceptable(async_get, fasteners):
+    response = async_get(reverse('async-fastener-list'), headers={'Accept': 'application/xml'})
+
+    assert response.status_code == status.HTTP_406_NOT_ACCEPTABLE
+
+
+@pytest.mark.django_db
+def test_async_list_not_modified_without_queries(async_get, fasteners, django_assert_num_queries):
+    url = reverse('async-fastener-list')
+    response = async_get(url)
+    assert response['Vary'] == 'Accept'
+
+    with django_assert_num_queries(0):
+        not_modified = async_get(url, headers={'If-None-Match': response['ETag']})
+
+    assert not_modified.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not_modified['ETag'] == response['ETag']
+
+
+@pytest.mark.django_db
+def test_async_list_uses_snapshot_and_list_cache(api_client, async_get, fasteners, settings, monkeypatch):
+    settings.CATALOG_SNAPSHOT_ENABLED = True
+    settings.LIST_CACHE_ENABLED = True
+    monkeypatch.setattr(snapshot, '_snapshot', None)
+    get_list_cache().reset()
+
+    for params, sources in [
+        ({'sort': 'material:asc', 'fields': 'product_id,material.name'}, ['snapshot', 'snapshot']),
+        ({'offers': 'true', 'sort': 'product_id:desc'}, ['database', 'cache']),
+    ]:
+        responses = [async_get(reverse('async-fastener-list'), params) for _ in sources]
+        assert [response['X-Catalog-Source'] for response in responses] == sources
+        expected = api_client.get(reverse('fastener-list'), params).json()
+        assert all(response.json() == expected for response in responses)
@@ -0,0 +1,135 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+from fastener_app.list_cache import entry_tags, get_list_cache
+from fastener_app.models import Material, SellerFastener
+from fastener_app.stock_buffer import StockBuffer
+
+
+@pytest.fixture
+def list_cache(settings):
+    settings.LIST_CACHE_ENABLED = True
+    get_list_cache().reset()
+    return get_list_cache()
+
+
+@pytest.fixture
+def catalog(ingest):
+    ingest(
+        "B001,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,1.00,10\n",
+        "W001,Flat Washer,M12-1.75,Steel,Plain,Washer,0.10,100\n",
+    )
+
+
+def get_list(api_client, **params):
+    response = api_client.get(reverse('fastener-list'), params)
+    assert response.status_code == status.HTTP_200_OK
+    return response['X-Catalog-Source'], sorted(item['product_id'] for item in response.json())
+
+
+@pytest.mark.django_db
+def test_repeated_query_is_served_from_the_cache(api_client, list_cache, catalog, django_assert_num_queries):
+    assert get_list(api_client, filter='category:washer') == ('database', ['W001'])
+
+    with django_assert_num_queries(0):
+        assert get_list(api_client, filter='category:washer') == ('cache', ['W001'])
+    response = api_client.get(reverse('fastener-list'), {'filter': 'category:washer', 'format': 'csv'})
+    assert response['X-Catalog-Source'] == 'database'
+    assert list_cache.stats() == {'hits': 1, 'misses': 2, 'stale': 0, 'stores': 2, 'skipped': 0, 'hit_ratio': 1 / 3}
+
+
+@pytest.mark.django_db
+def test_ingest_invalidates_only_the_dimension_values_it_touched(api_client, list_cache, catalog, ingest):
+    for params in ({'filter': 'category:washer'}, {'filter': 'category:hex cap screw'}, {}):
+        get_list(api_client, **params)
+
+    ingest("B002,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,1.00,10\n")
+
+    assert get_list(api_client, filter='category:washer') == ('cache', ['W001'])
+    assert get_list(api_client, filter='category:hex cap screw') == ('database', ['B001', 'B002'])
+    assert get_list(api_client) == ('database', ['B001', 'B002', 'W001'])
+    assert list_cache.stats()['stale'] == 2
+
+
+@pytest.mark.django_db
+def test_moving_a_fastener_invalidates_its_old_dimension_value(api_client, list_cache, catalog, ingest):
+    get_list(api_client, filter='category:washer')
+
+    ingest("W001,Flat Washer,M12-1.75,Steel,Plain,Spacer,0.10,100\n")
+
+    assert get_list(api_client, filter='category:washer') == ('database', [])
+
+
+@pytest.mark.django_db
+def test_offer_changes_only_invalidate_lists_reading_offers(api_client, list_cache, catalog, ingest):
+    get_list(api_client, filter='category:washer')
+    get_list(api_client, filter='category:washer', offers='true')
+
+    ingest("W001,Flat Washer,M12-1.75,Steel,Plain,Washer,0.20,50\n")
+
+    assert get_list(api_client, filter='category:washer')[0] == 'cache'
+    assert get_list(api_client, filter='category:washer', offers='true')[0] == 'database'
+    response = api_client.get(reverse('fastener-list'), {'filter': 'category:washer', 'offers': 'true'})
+    assert response['X-Catalog-Source'] == 'cache'
+    assert response.json()[0]['min_price'] == '0.20'
+
+
+@pytest.mark.django_db
+def test_stock_updates_invalidate_lists_reading_offers(api_client, list_cache, catalog,
+                                                       django_capture_on_commit_callbacks):
+    get_list(api_client, filter='category:washer')
+    get_list(api_client, filter='category:hex cap screw', offers='true')
+    get_list(api_client, filter='category:washer', offers='true')
+    offer = SellerFastener.objects.get(fastener__product_id='W001')
+
+    buffer = StockBuffer(max_size=100)
+    buffer.add([(offer.seller_id, offer.fastener_id, 0)])
+    with django_capture_on_commit_callbacks(execute=True):
+        buffer.flush()
+
+    assert get_list(api_client, filter='category:washer')[0] == 'cache'
+    assert get_list(api_client, filter='category:hex cap screw', offers='true')[0] == 'cache'
+    assert get_list(api_client, filter='category:washer', offers='true')[0] == 'database'
+
+
+@pytest.mark.django_db
+def test_dimension_rename_invalidates_every_list(api_client, list_cache, catalog, django_capture_on_commit_callbacks):
+    get_list(api_client, filter='category:washer')
+
+    with django_capture_on_commit_callbacks(execute=True):
+        material = Material.objects.get(name='Steel')
+        material.name = 'Carbon Steel'
+        material.save()
+
+    response = api_client.get(reverse('fastener-list'), {'filter': 'category:washer'})
+    assert response['X-Catalog-Source'] == 'database'
+    assert response.json()[0]['material']['name'] == 'Carbon Steel'
+
+
+@pytest.mark.django_db
+def test_cache_hits_do_not_resolve_equivalent_thread_sizes(api_client, list_cache, catalog, monkeypatch):
+    assert get_list(api_client, filter='thread_size:m12-1.75', equivalent='true') == ('database', ['B001', 'W001'])
+    monkeypatch.setattr('fastener_app.views.fastener.equivalent_thread_size_ids', None)
+
+    assert get_list(api_client, filter='thread_size:m12-1.75', equivalent='true') == ('cache', ['B001', 'W001'])
+    response = api_client.get(reverse('fastener-list'), {'equivalent': 'true'})
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_large_results_are_not_cached(api_client, list_cache, catalog, settings):
+    settings.LIST_CACHE_MAX_ROWS = 1
+
+    get_list(api_client)
+
+    assert get_list(api_client)[0] == 'database'
+    assert list_cache.stats()['skipped'] == 2
+
+
+def test_entry_tags():
+    assert entry_tags({}) == ['fasteners:*']
+    assert entry_tags({'description': ['bolt']}, offers=True) == ['offers:*']
+    assert entry_tags({'material': ['steel', 'brass'], 'category': ['washer']}) == ['fasteners:category:washer']
+    assert entry_tags({'thread_size': ['m12-1.75'], 'material': ['steel']}, equivalent=True) == [
+        'fasteners:equivalent', 'fasteners:material:steel'
+    ]
@@ -0,0 +1,182 @@
+import threading
+import pytest
+from decimal import Decimal
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from fastener_app.catalog_version import get_catalog_version
+from fastener_app.models import BestOffer, SellerFastener
+from fastener_app.reservations import InsufficientStock, reserve_stock
+from fastener_app.stock_buffer import StockBuffer
+from fastener_app.tests.factories import FastenerFactory, SellerFastenerFactory
+
+
+def line(offer, quantity):
+    return {'seller': offer.seller_id, 'fastener': offer.fastener_id, 'quantity': quantity}
+
+
+def quantities(offers):
+    return [SellerFastener.objects.get(id=offer.id).quantity for offer in offers]
+
+
+@pytest.mark.django_db
+def test_reserve_stock(api_client, offers):
+    response = api_client.post(reverse('offer-reserve'), {'lines': [line(offers[0], 1), line(offers[1], 4)]},
+                               format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'lines': [line(offers[0], 1), line(offers[1], 6)]}
+    assert quantities(offers) == [1, 6]
+
+
+@pytest.mark.django_db
+def test_reserve_merges_repeated_lines(api_client, offers):
+    response = api_client.post(reverse('offer-reserve'), {'lines': [line(offers[1], 3), line(offers[1], 4)]},
+                               format='json')
+
+    assert response.json() == {'lines': [line(offers[1], 3)]}
+
+
+@pytest.mark.django_db
+def test_reserve_is_all_or_nothing(api_client, offers):
+    response = api_client.post(
+        reverse('offer-reserve'),
+        {'lines': [line(offers[1], 4), line(offers[0], 3), {'seller': offers[0].seller_id, 'fastener': 999999, 'quantity': 1}]},
+        format='json',
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert response.json() == {'error': 'Insufficient stock.', 'lines': [
+        {'seller': offers[0].seller_id, 'fastener': offers[0].fastener_id, 'requested': 3, 'available': 2},
+        {'seller': offers[0].seller_id, 'fastener': 999999, 'requested': 1, 'available': 0},
+    ]}
+    assert quantities(offers) == [2, 10]
+
+
+@pytest.mark.django_db
+def test_reserving_the_last_units_refreshes_the_best_offer(api_client, fastener, offers):
+    api_client.post(reverse('offer-reserve'), {'lines': [line(offers[0], 2)]}, format='json')
+
+    assert BestOffer.objects.get(fastener=fastener).best_price == Decimal('2.00')
+
+    response = api_client.post(reverse('offer-release'), {'lines': [line(offers[0], 2)]}, format='json')
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == {'lines': [line(offers[0], 2)]}
+    assert BestOffer.objects.get(fastener=fastener).best_price == Decimal('1.00')
+
+
+@pytest.mark.django_db
+def test_partial_reservations_update_the_total_quantity(api_client, fastener, offers,
+                                                        django_capture_on_commit_callbacks):
+    version = get_catalog_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(reverse('offer-reserve'), {'lines': [line(offers[0], 1), line(offers[1], 4)]}, format='json')
+
+    assert BestOffer.objects.get(fastener=fastener).total_quantity == 7
+    assert get_catalog_version() != version
+
+    api_client.post(reverse('offer-release'), {'lines': [line(offers[1], 3)]}, format='json')
+
+    best_offer = BestOffer.objects.get(fastener=fastener)
+    assert (best_offer.total_quantity, best_offer.best_price) == (10, Decimal('1.00'))
+
+
+@pytest.mark.django_db
+def test_release_unknown_offer(api_client, offers):
+    response = api_client.post(
+        reverse('offer-release'),
+        {'lines': [line(offers[1], 1), {'seller': offers[1].seller_id, 'fastener': 999999, 'quantity': 1}]},
+        format='json',
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'error': f"Unknown offers: seller {offers[1].seller_id} fastener 999999."}
+    assert quantities(offers) == [2, 10]
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('body', [{}, {'lines': []}, {'lines': [{'seller': 1, 'fastener': 1, 'quantity': 0}]}])
+def test_reserve_invalid_lines(api_client, body):
+    response = api_client.post(reverse('offer-reserve'), body, format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_reservations_never_oversell(committed_rows):
+    """
+    Workers race for two hot offers, alternately one unit of the first and batches taking both in either
+    order. Every unit is sold exactly once and no batch deadlocks.
+    """
+    hot = [SellerFastenerFactory(fastener=FastenerFactory(), quantity=200) for _ in range(2)]
+    workers, attempts = 16, 40
+    barrier = threading.Barrier(workers)
+    reserved, errors = [], []
+
+    def reserve(worker):
+        try:
+            barrier.wait()
+            for attempt in range(attempts):
+                batch = [(offer.seller_id, offer.fastener_id, 1) for offer in hot]
+                lines = batch[:1] if attempt % 2 else batch[::1 if worker % 2 else -1]
+                try:
+                    reserve_stock(lines)
+                    reserved.extend(lines)
+                except InsufficientStock:
+                    pass
+        except Exception as e:
+            errors.append(e)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=reserve, args=(worker,)) for worker in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    for offer, quantity in zip(hot, quantities(hot)):
+        units = sum(1 for _, fastener_id, _ in reserved if fastener_id == offer.fastener_id)
+        assert units + quantity == 200
+        assert quantity >= 0
+    assert quantities(hot)[0] == 0
+
+
+@pytest.mark.django_db
+def test_stock_updates_are_buffered(api_client, offers, monkeypatch):
+    buffer = StockBuffer(max_size=100)
+    monkeypatch.setattr('fastener_app.stock_buffer._stock_buffer', buffer)
+
+    response = api_client.post(reverse('offer-stock'), {'updates': [line(offers[0], 5), line(offers[1], 0),
+                                                                    line(offers[0], 7)]}, format='json')
+
+    assert response.status_code == status.HTTP_202_ACCEPTED
+    assert response.json() == {'accepted': 3, 'pending': 2}
+    assert quantities(offers) == [2, 10]
+
+    buffer.flush()
+
+    assert quantities(offers) == [7, 0]
+
+
+@pytest.mark.django_db
+def test_stock_updates_are_not_acknowledged_if_the_journal_fails(api_client, offers, monkeypatch, tmp_path):
+    buffer = StockBuffer(max_size=100, journal_dir=tmp_path)
+    monkeypatch.setattr('fastener_app.stock_buffer._stock_buffer', buffer)
+    buffer.journal.close()
+
+    with pytest.raises(ValueError):
+        api_client.post(reverse('offer-stock'), {'updates': [line(offers[0], 5)]}, format='json')
+
+    assert len(buffer) == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('body', [{}, {'updates': []}, {'updates': [{'seller': 1, 'fastener': 1, 'quantity': -1}]}])
+def test_stock_invalid_updates(api_client, body):
+    response = api_client.post(reverse('offer-stock'), body, format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
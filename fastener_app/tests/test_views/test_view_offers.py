@@ -0,0 +1,172 @@
+import pytest
+from decimal import Decimal
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from fastener_app.models import BestOffer
+from fastener_app.offers import refresh_best_offers
+from fastener_app.tests.factories import FastenerFactory, SellerFactory, SellerFastenerFactory
+
+
+@pytest.fixture
+def offers(fastener):
+    """Three sellers offering the same fastener, the cheapest one being out of stock."""
+    offers = [
+        SellerFastenerFactory(fastener=fastener, seller=SellerFactory(), price=Decimal('1.50'), quantity=0),
+        SellerFastenerFactory(fastener=fastener, seller=SellerFactory(), price=Decimal('2.00'), quantity=10),
+        SellerFastenerFactory(fastener=fastener, seller=SellerFactory(), price=Decimal('3.25'), quantity=5),
+    ]
+    refresh_best_offers([fastener.id])
+    return offers
+
+
+@pytest.mark.django_db
+def test_fastener_offers(api_client, fastener, offers):
+    response = api_client.get(reverse('fastener-offers', args=[fastener.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data['fastener']['product_id'] == fastener.product_id
+    assert data['min_price'] == '2.00'
+    assert data['seller_count'] == 3
+    assert data['total_quantity'] == 15
+    assert [offer['price'] for offer in data['offers']] == ['1.50', '2.00', '3.25']
+    assert data['offers'][0]['seller_name'] == offers[0].seller.name
+    assert data['offers'][0]['seller_id'] == offers[0].seller.id
+
+
+@pytest.mark.django_db
+def test_fastener_offers_without_offers(api_client, fastener):
+    response = api_client.get(reverse('fastener-offers', args=[fastener.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()['min_price'] is None
+    assert response.json()['seller_count'] == 0
+    assert response.json()['offers'] == []
+
+
+@pytest.mark.django_db
+def test_fastener_offers_unknown_fastener(api_client, db):
+    response = api_client.get(reverse('fastener-offers', args=[12345]))
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_fastener_offers_query_count(api_client, fastener, offers, django_assert_num_queries):
+    for _ in range(20):
+        SellerFastenerFactory(fastener=fastener)
+
+    # One query for the fastener, one for the offers and their window aggregates
+    with django_assert_num_queries(2):
+        response = api_client.get(reverse('fastener-offers', args=[fastener.id]))
+
+    assert response.json()['seller_count'] == 23
+
+
+@pytest.mark.django_db
+def test_list_fasteners_with_offer_summary(api_client, fastener, offers, django_assert_num_queries):
+    other = FastenerFactory()
+    for _ in range(5):
+        FastenerFactory()
+
+    # Once the dimension cache is warm
+    api_client.get(reverse('fastener-list'), {'offers': 'true'})
+    with django_assert_num_queries(1):
+        response = api_client.get(reverse('fastener-list'), {'offers': 'true'})
+
+    assert response.status_code == status.HTTP_200_OK
+    by_product = {item['product_id']: item for item in response.json()}
+    assert len(by_product) == 7
+    assert by_product[fastener.product_id]['min_price'] == '2.00'
+    assert by_product[fastener.product_id]['best_seller_id'] == offers[1].seller.id
+    assert by_product[fastener.product_id]['seller_count'] == 3
+    assert by_product[fastener.product_id]['total_quantity'] == 15
+    assert by_product[other.product_id]['min_price'] is None
+    assert by_product[other.product_id]['seller_count'] == 0
+    assert by_product[other.product_id]['total_quantity'] == 0
+
+
+@pytest.mark.django_db
+def test_list_fasteners_offer_summary_fieldset(api_client, fastener, offers):
+    response = api_client.get(reverse('fastener-list'), {'offers': 'true', 'fields': 'product_id,min_price'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == [{'product_id': fastener.product_id, 'min_price': '2.00'}]
+
+
+@pytest.mark.django_db
+def test_list_fasteners_offer_summary_requires_offers_mode(api_client, fastener, offers):
+    response = api_client.get(reverse('fastener-list'), {'fields': 'product_id,min_price'})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.django_db
+def test_refresh_best_offers(fastener, offers):
+    best_offer = BestOffer.objects.get(fastener=fastener)
+    assert best_offer.best_price == Decimal('2.00')
+    assert best_offer.seller_id == offers[1].seller_id
+    assert best_offer.total_quantity == 15
+    assert best_offer.offer_count == 3
+
+    offers[1].quantity = 0
+    offers[1].save()
+    offers[2].delete()
+    refresh_best_offers([fastener.id])
+
+    best_offer.refresh_from_db()
+    assert best_offer.best_price is None
+    assert best_offer.seller_id is None
+    assert best_offer.total_quantity == 0
+    assert best_offer.offer_count == 2
+
+    offers[0].delete()
+    offers[1].delete()
+    refresh_best_offers([fastener.id])
+
+    assert not BestOffer.objects.filter(fastener=fastener).exists()
+
+
+@pytest.mark.django_db
+def test_refresh_best_offers_only_touches_given_fasteners(fastener, offers):
+    other = SellerFastenerFactory(price=Decimal('9.99'), quantity=1)
+
+    refresh_best_offers([fastener.id])
+    assert not BestOffer.objects.filter(fastener=other.fastener).exists()
+
+    call_command('rebuild_best_offers')
+    assert BestOffer.objects.get(fastener=other.fastener).best_price == Decimal('9.99')
+    assert BestOffer.objects.count() == 2
+
+
+@pytest.mark.django_db
+def test_ingest_refreshes_best_offers(api_client):
+    sellers = [SellerFactory(), SellerFactory()]
+    header = "id,name,size_and_length,material,surface_treatment,category,price,quantity\n"
+    for seller, price in zip(sellers, ['10.50', '9.75']):
+        row = f"F100,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,{price},20\n"
+        upload = SimpleUploadedFile('fasteners.csv', (header + row).encode('utf-8'), content_type='text/csv')
+        response = api_client.post(reverse('fastener-ingest', args=[seller.id]), {'file': upload}, format='multipart')
+        assert response.status_code == status.HTTP_201_CREATED
+
+    best_offer = BestOffer.objects.get()
+    assert best_offer.best_price == Decimal('9.75')
+    assert best_offer.seller_id == sellers[1].id
+    assert best_offer.offer_count == 2
+    assert best_offer.total_quantity == 40
+
+
+@pytest.mark.django_db
+def test_list_fasteners_sorted_by_price(api_client, fastener, offers):
+    cheaper = SellerFastenerFactory(price=Decimal('0.50'), quantity=3).fastener
+    without_offers = FastenerFactory()
+    refresh_best_offers([cheaper.id])
+
+    response = api_client.get(reverse('fastener-list'), {'sort': 'price:asc', 'fields': 'product_id'})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item['product_id'] for item in response.json()] == [
+        cheaper.product_id, fastener.product_id, without_offers.product_id
+    ]
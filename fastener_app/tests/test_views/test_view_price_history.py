@@ -0,0 +1,122 @@
+import datetime
+import re
+import pytest
+from io import StringIO
+from unittest.mock import patch
+from django.core.management import call_command
+from django.db import connection
+from django.urls import reverse
+from django.utils.dateparse import parse_datetime
+from rest_framework import status
+from fastener_app.models import Fastener, PriceHistory
+from fastener_app.price_history import ensure_price_history_partition, price_as_of
+from fastener_app.tests.factories import SellerFactory
+
+JANUARY = datetime.datetime(2026, 1, 15, 12, 0, tzinfo=datetime.timezone.utc)
+MARCH = datetime.datetime(2026, 3, 2, 8, 30, tzinfo=datetime.timezone.utc)
+
+
+def at(moment):
+    """Date the price history rows written inside the block at `moment`."""
+    return patch('fastener_app.price_history.timezone.now', return_value=moment)
+
+
+def partition_rows():
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT tableoid::regclass::text, COUNT(*) FROM "
+                       f"{connection.ops.quote_name(PriceHistory._meta.db_table)} GROUP BY 1")
+        return {name.split('.')[-1].strip('"'): count for name, count in cursor.fetchall()}
+
+
+@pytest.fixture
+def history(ingest):
+    """F001 repriced in March, F002 ingested again unchanged, F001 also offered by another seller."""
+    with at(JANUARY):
+        ingest("F001,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,1.00,10\n",
+               "F002,Hex Nut,M12-1.75,Steel,Plain,Hex Nut,0.20,100\n")
+    with at(MARCH):
+        ingest("F001,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,1.25,10\n",
+               "F002,Hex Nut,M12-1.75,Steel,Plain,Hex Nut,0.20,100\n")
+        ingest("F001,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,0.90,5\n", seller=SellerFactory())
+    return Fastener.objects.get(product_id='F001')
+
+
+@pytest.mark.django_db
+def test_ingest_appends_changes_only(seller, history):
+    rows = PriceHistory.objects.filter(seller=seller).order_by('valid_from', 'fastener__product_id')
+
+    assert [(row.fastener.product_id, str(row.price), row.valid_from) for row in rows] == [
+        ('F001', '1.00', JANUARY), ('F002', '0.20', JANUARY), ('F001', '1.25', MARCH),
+    ]
+
+
+@pytest.mark.django_db
+def test_price_as_of(api_client, seller, history):
+    url = reverse('fastener-price-as-of', args=[history.id])
+
+    response = api_client.get(url, {'seller': seller.id, 'at': '2026-02-01T00:00:00Z'})
+    assert response.status_code == status.HTTP_200_OK
+    entry = response.json()
+    assert parse_datetime(entry.pop('valid_from')) == JANUARY
+    assert entry == {'seller': seller.id, 'fastener': history.id, 'price': '1.00', 'quantity': 10}
+    assert api_client.get(url, {'seller': seller.id, 'at': '2026-03-02T08:30:00Z'}).json()['price'] == '1.25'
+
+    response = api_client.get(url, {'seller': seller.id, 'at': '2025-12-31T00:00:00Z'})
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('params, error', [
+    ({'at': '2026-02-01T00:00:00Z'}, "Both 'seller' and 'at' are required."),
+    ({'seller': 'abc', 'at': '2026-02-01T00:00:00Z'}, "Invalid seller 'abc'."),
+    ({'seller': '1', 'at': 'yesterday'}, "Invalid datetime 'yesterday' for 'at'."),
+])
+def test_price_as_of_invalid_parameters(api_client, history, params, error):
+    response = api_client.get(reverse('fastener-price-as-of', args=[history.id]), params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json() == {'error': error}
+
+
+@pytest.mark.django_db
+def test_price_series(api_client, seller, history):
+    url = reverse('fastener-price-history', args=[history.id])
+
+    series = api_client.get(url).json()
+    assert [(parse_datetime(entry['valid_from']), entry['price']) for entry in series] == [
+        (JANUARY, '1.00'), (MARCH, '1.25'), (MARCH, '0.90'),
+    ]
+    assert [entry['price'] for entry in api_client.get(url, {'seller': seller.id}).json()] == ['1.00', '1.25']
+    assert [entry['price'] for entry in api_client.get(url, {'since': '2026-02-01T00:00:00'}).json()] == [
+        '1.25', '0.90'
+    ]
+    assert api_client.get(reverse('fastener-price-history', args=[0])).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_history_partitioned_by_month(seller, history):
+    # Months without a partition are written to the DEFAULT partition, and move to theirs once it is created
+    assert partition_rows() == {'price_history_default': 4}
+
+    assert ensure_price_history_partition(JANUARY) and ensure_price_history_partition(MARCH)
+    assert not ensure_price_history_partition(JANUARY)
+
+    assert partition_rows() == {'price_history_y2026m01': 2, 'price_history_y2026m03': 2}
+    # As-of lookups skip later months
+    plan = PriceHistory.objects.filter(
+        seller=seller, fastener=history, valid_from__lte=JANUARY + datetime.timedelta(days=1)
+    ).order_by('-valid_from')[:1].explain()
+
+    assert set(re.findall(r'price_history_y\d{4}m\d{2}', plan)) == {'price_history_y2026m01'}
+    assert price_as_of(seller.id, history.id, MARCH).price == history.seller_fasteners.get(seller=seller).price
+
+
+@pytest.mark.django_db
+def test_create_price_history_partitions_command(history):
+    out = StringIO()
+    with patch('fastener_app.management.commands.create_price_history_partitions.timezone.now',
+               return_value=JANUARY):
+        call_command('create_price_history_partitions', '--months', '2', stdout=out)
+
+    assert out.getvalue().strip() == "Created price history partitions for 2026-01, 2026-02, 2026-03."
+    assert partition_rows() == {'price_history_y2026m01': 2, 'price_history_y2026m03': 2}
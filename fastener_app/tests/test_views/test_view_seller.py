@@ -159,3 +159,41 @@ class SellerCreateViewTest(TestCase):
         sellers = Seller.objects.all()
         expected_data = SellerSerializer(sellers, many=True).data
         self.assertEqual(response.data, expected_data)
+
+    def test_create_multiple_sellers_existing_duplicates(self):
+        # Test case for sellers whose name or contact email is already taken
+        self.client.post(self.url, self.valid_multiple_data[0], format='json')
+        data = [
+            dict(self.valid_multiple_data[1]),
+            dict(self.valid_multiple_data[1], name="Seller B", contact_email="other@example.com"),
+            dict(self.valid_multiple_data[1], name="Seller E", contact_email="sellerB@example.com"),
+        ]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {
+            1: {'name': ['seller with this name already exists.']},
+            2: {'contact_email': ['seller with this contact email already exists.']},
+        })
+        self.assertEqual(Seller.objects.count(), 1)
+
+    def test_create_multiple_sellers_duplicates_within_batch(self):
+        # Test case for a batch repeating a name, reported on the repeated seller
+        data = self.valid_multiple_data + [dict(self.valid_multiple_data[0], contact_email="other@example.com")]
+        response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {2: {'name': ['seller with this name already exists.']}})
+        self.assertEqual(Seller.objects.count(), 0)
+
+    def test_create_multiple_sellers_query_count(self):
+        # Test case ensuring a batch is validated with one query and inserted with one statement per table
+        data = [
+            dict(self.valid_multiple_data[0], name=f"Seller {i}", contact_email=f"seller{i}@example.com")
+            for i in range(50)
+        ]
+        # Savepoint, uniqueness check, seller insert, mapping version insert, savepoint release
+        with self.assertNumQueries(5):
+            response = self.client.post(self.url, data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(Seller.objects.count(), 50)
+        self.assertEqual([seller['id'] for seller in response.data],
+                         list(Seller.objects.order_by('id').values_list('id', flat=True)))
@@ -0,0 +1,119 @@
+import io
+import pytest
+from unittest.mock import patch
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.urls import reverse
+from rest_framework import status
+from fastener_app.mappings import CompiledMapping, compiled_mapping, update_csv_mapping
+from fastener_app.models import Fastener, IngestRun, Seller, SellerMappingVersion
+from fastener_app.views import FastenerIngestView
+
+MAPPING = {
+    'id': 'product_id',
+    'name': 'description',
+    'size_and_length': 'thread_size',
+    'material': 'material',
+    'surface_treatment': 'finish',
+    'category': 'category',
+    'price': 'price',
+    'quantity': 'quantity',
+}
+RENAMED_MAPPING = {('sku' if csv_field == 'id' else csv_field): model_field for csv_field, model_field in MAPPING.items()}
+
+
+def csv_upload(*rows):
+    content = "id,sku,name,size_and_length,material,surface_treatment,category,price,quantity\n" + "".join(rows)
+    return SimpleUploadedFile('fasteners.csv', content.encode('utf-8'), content_type='text/csv')
+
+
+@pytest.mark.django_db
+def test_created_seller_has_mapping_version(api_client):
+    data = {'name': 'Seller A', 'contact_email': 'a@example.com', 'csv_mapping': MAPPING}
+    response = api_client.post(reverse('seller-create'), data, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data['mapping_version'] == 1
+    assert SellerMappingVersion.objects.get(seller_id=response.data['id']).csv_mapping == MAPPING
+
+
+@pytest.mark.django_db
+def test_update_mapping_creates_version(api_client, seller):
+    url = reverse('seller-mapping', args=[seller.id])
+    first = api_client.get(url).data
+
+    response = api_client.put(url, {'csv_mapping': RENAMED_MAPPING}, format='json')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data['version'] == first['version'] + 1
+    assert api_client.get(url).data == response.data
+    seller.refresh_from_db()
+    assert (seller.csv_mapping, seller.mapping_version) == (RENAMED_MAPPING, response.data['version'])
+    # Earlier versions are kept as they were
+    assert SellerMappingVersion.objects.get(seller=seller, version=first['version']).csv_mapping == MAPPING
+
+
+@pytest.mark.django_db
+def test_update_mapping_invalid(api_client, seller):
+    response = api_client.put(reverse('seller-mapping', args=[seller.id]), {'csv_mapping': {'id': 'product_id'}},
+                              format='json')
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "Missing required fields in csv_mapping" in response.data['csv_mapping'][0]
+    assert not SellerMappingVersion.objects.filter(seller=seller).exists()
+
+
+@pytest.mark.django_db
+def test_mapping_versions_are_immutable(seller):
+    mapping_version = update_csv_mapping(seller.id, MAPPING)
+    mapping_version.csv_mapping = RENAMED_MAPPING
+
+    with pytest.raises(ValueError):
+        mapping_version.save()
+
+
+@pytest.mark.django_db
+def test_ingest_pins_mapping_version(api_client, seller):
+    upload = csv_upload(
+        "F001,S001,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,1.00,10\n",
+        "F002,S002,Hex Bolt,M10-1.5,Steel,Plain,Hex Cap Screw,1.00,10\n",
+    )
+    handle_fastener = FastenerIngestView.handle_fastener
+
+    def edit_mapping_midway(view, standardized_data, *args):
+        # A mapping edit while the upload runs must not change how its remaining rows are read
+        update_csv_mapping(seller.id, RENAMED_MAPPING)
+        return handle_fastener(view, standardized_data, *args)
+
+    with patch.object(FastenerIngestView, 'handle_fastener', edit_mapping_midway):
+        response = api_client.post(reverse('fastener-ingest', args=[seller.id]), {'file': upload}, format='multipart')
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert set(Fastener.objects.values_list('product_id', flat=True)) == {'F001', 'F002'}
+    run = IngestRun.objects.get(id=response.data['ingest_run'])
+    assert (run.status, run.row_count, run.mapping_version.version) == (IngestRun.SUCCEEDED, 2, 1)
+    assert Seller.objects.get(id=seller.id).mapping_version == 3
+
+    # The next upload uses the latest mapping
+    upload = csv_upload("F003,S003,Hex Bolt,M12-1.75,Steel,Plain,Hex Cap Screw,1.00,10\n")
+    response = api_client.post(reverse('fastener-ingest', args=[seller.id]), {'file': upload}, format='multipart')
+    assert Fastener.objects.filter(product_id='S003').exists()
+    assert IngestRun.objects.get(id=response.data['ingest_run']).mapping_version.version == 3
+
+
+@pytest.mark.django_db
+def test_compiled_mapping_cached_per_version(seller):
+    first = update_csv_mapping(seller.id, MAPPING)
+    second = update_csv_mapping(seller.id, RENAMED_MAPPING)
+
+    assert compiled_mapping(first) is compiled_mapping(SellerMappingVersion.objects.get(id=first.id))
+    assert compiled_mapping(second) is not compiled_mapping(first)
+
+
+def test_compiled_mapping_rows():
+    mapping = CompiledMapping({'id': 'product_id', 'name': 'description', 'price': 'price'})
+    csv_file = io.StringIO("name,id,name\n Bolt ,F001,Hex Bolt\n\nScrew\n")
+
+    assert list(mapping.map_rows(csv_file)) == [
+        {'product_id': 'F001', 'description': 'Hex Bolt', 'price': ''},
+        {'product_id': '', 'description': '', 'price': ''},
+    ]
@@ -0,0 +1,104 @@
+import csv
+import io
+import pyarrow as pa
+import pytest
+from decimal import Decimal
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+from fastener_app.models import SellerStats
+from fastener_app.tests.factories import SellerFactory
+
+
+@pytest.fixture
+def offers(ingest):
+    ingest(
+        "F002,Hex Bolt,M10-1.5,Steel,Plain,Hex Cap Screw,0.05,0\n",
+        "F001,Wood Screw,M12-1.75,Brass,Zinc,Wood Screw,3.00,100\n",
+        "F003,Hex Nut,M12-1.75,Steel,Plain,Hex Nut,1500.00,20\n",
+    )
+    # Another seller's offers stay out of the export and stats
+    ingest("F001,Wood Screw,M12-1.75,Brass,Zinc,Wood Screw,2.00,5\n", seller=SellerFactory())
+
+
+def content(response):
+    assert response.status_code == status.HTTP_200_OK
+    assert response.streaming
+    return b''.join(response.streaming_content)
+
+
+@pytest.mark.django_db
+def test_export_csv(api_client, seller, offers):
+    response = api_client.get(reverse('seller-offer-export', args=[seller.id]))
+
+    assert response['Content-Type'] == 'text/csv'
+    rows = list(csv.reader(io.StringIO(content(response).decode('utf-8'))))
+    assert rows[0] == ['product_id', 'description', 'thread_size.name', 'material.name', 'finish.name',
+                       'category.name', 'price', 'quantity', 'last_updated']
+    assert [row[:8] for row in rows[1:]] == [
+        ['F002', 'HEX BOLT', 'M10-1.5', 'Steel', 'Plain', 'Hex Cap Screw', '0.05', '0'],
+        ['F001', 'WOOD SCREW', 'M12-1.75', 'Brass', 'Zinc', 'Wood Screw', '3.00', '100'],
+        ['F003', 'HEX NUT', 'M12-1.75', 'Steel', 'Plain', 'Hex Nut', '1500.00', '20'],
+    ]
+
+
+@pytest.mark.django_db
+def test_export_arrow_matches_csv(api_client, seller, offers):
+    url = reverse('seller-offer-export', args=[seller.id])
+    table = pa.ipc.open_stream(content(api_client.get(url, {'format': 'arrow'}))).read_all()
+    rows = list(csv.reader(io.StringIO(content(api_client.get(url)).decode('utf-8'))))
+
+    assert table.column_names == rows[0]
+    assert table.column('product_id').to_pylist() == [row[0] for row in rows[1:]]
+    assert table.column('price').to_pylist() == [Decimal(row[6]) for row in rows[1:]]
+    assert table.column('quantity').to_pylist() == [int(row[7]) for row in rows[1:]]
+
+
+@pytest.mark.django_db
+def test_export_without_offers(api_client, seller):
+    response = api_client.get(reverse('seller-offer-export', args=[seller.id]), {'format': 'arrow'})
+
+    assert pa.ipc.open_stream(content(response)).read_all().num_rows == 0
+    assert api_client.get(reverse('seller-offer-export', args=[0])).status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_stats(api_client, seller, offers, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        response = api_client.get(reverse('seller-stats', args=[seller.id]))
+
+    assert response.status_code == status.HTTP_200_OK
+    stats = response.json()
+    assert {key: stats[key] for key in ('seller', 'offer_count', 'in_stock_count', 'total_quantity')} == {
+        'seller': seller.id, 'offer_count': 3, 'in_stock_count': 2, 'total_quantity': 120,
+    }
+    assert (stats['min_price'], stats['max_price'], stats['average_price']) == ('0.05', '1500.00', '501.02')
+    histogram = stats['price_histogram']
+    assert len(histogram) == 14
+    assert histogram[0] == {'min': None, 'max': 0.1, 'count': 1}
+    assert histogram[4] == {'min': 1.0, 'max': 2.5, 'count': 0}
+    assert histogram[5] == {'min': 2.5, 'max': 5.0, 'count': 1}
+    assert histogram[-1] == {'min': 1000.0, 'max': None, 'count': 1}
+
+
+@pytest.mark.django_db
+def test_stats_follow_ingest(api_client, seller, offers, ingest):
+    ingest("F003,Hex Nut,M12-1.75,Steel,Plain,Hex Nut,2.00,0\n")
+
+    stats = api_client.get(reverse('seller-stats', args=[seller.id])).json()
+    assert (stats['in_stock_count'], stats['total_quantity'], stats['max_price']) == (1, 100, '3.00')
+
+    rows = list(SellerStats.objects.order_by('seller_id').values())
+    call_command('rebuild_seller_stats')
+    assert list(SellerStats.objects.order_by('seller_id').values('seller_id', 'price_sum', 'price_histogram')) == [
+        {key: row[key] for key in ('seller_id', 'price_sum', 'price_histogram')} for row in rows
+    ]
+
+
+@pytest.mark.django_db
+def test_stats_without_offers(api_client, seller):
+    stats = api_client.get(reverse('seller-stats', args=[seller.id])).json()
+
+    assert (stats['offer_count'], stats['min_price'], stats['average_price']) == (0, None, None)
+    assert all(bucket['count'] == 0 for bucket in stats['price_histogram'])
+    assert api_client.get(reverse('seller-stats', args=[0])).status_code == status.HTTP_404_NOT_FOUND
@@ -0,0 +1,78 @@
+from django.conf import settings
+from django.db.models.functions import Lower
+from fastener_app.models import ThreadSize, ThreadSizeEquivalence
+from fastener_app.unit_converter import thread_geometry
+
+GEOMETRY_FIELDS = ('id', 'thread_type', 'metric_size_num', 'imperial_size_num', 'thread_per_unit')
+
+
+def geometries_equivalent(geometry, other, tolerance):
+    """
+    Whether two (diameter, pitch) pairs agree within a relative tolerance, e.g. 0.02 for 2%.
+    """
+    return all(abs(value - other_value) <= tolerance * max(value, other_value)
+               for value, other_value in zip(geometry, other))
+
+
+def thread_size_geometries(queryset):
+    """
+    Return (id, (diameter, pitch)) for the thread sizes of the queryset with a complete geometry.
+    """
+    return [
+        (thread_size_id, geometry)
+        for thread_size_id, *size in queryset.values_list(*GEOMETRY_FIELDS)
+        if (geometry := thread_geometry(*size)) is not None
+    ]
+
+
+def add_thread_size_equivalences(thread_sizes):
+    """
+    Index the equivalences of newly created thread sizes against every thread size, in both directions.
+    """
+    tolerance = settings.THREAD_EQUIVALENCE_TOLERANCE
+    new_ids = [thread_size.id for thread_size in thread_sizes]
+    pairs = {(thread_size_id, thread_size_id) for thread_size_id in new_ids}
+    candidates = thread_size_geometries(ThreadSize.objects.all())
+
+    for thread_size_id, geometry in thread_size_geometries(ThreadSize.objects.filter(id__in=new_ids)):
+        for other_id, other in candidates:
+            if geometries_equivalent(geometry, other, tolerance):
+                pairs.update({(thread_size_id, other_id), (other_id, thread_size_id)})
+
+    ThreadSizeEquivalence.objects.bulk_create(
+        (ThreadSizeEquivalence(thread_size_id=thread_size_id, equivalent_id=equivalent_id)
+         for thread_size_id, equivalent_id in pairs),
+        ignore_conflicts=True,
+    )
+
+
+def rebuild_thread_size_equivalences():
+    """
+    Recompute the whole equivalence index, e.g. after THREAD_EQUIVALENCE_TOLERANCE changed.
+    Thread sizes are swept in diameter order so each one is only compared with its close neighbours.
+    """
+    tolerance = settings.THREAD_EQUIVALENCE_TOLERANCE
+    pairs = {(thread_size_id, thread_size_id) for thread_size_id in ThreadSize.objects.values_list('id', flat=True)}
+    geometries = sorted(thread_size_geometries(ThreadSize.objects.all()), key=lambda item: item[1])
+
+    for index, (thread_size_id, geometry) in enumerate(geometries):
+        for other_id, other in geometries[index + 1:]:
+            if other[0] - geometry[0] > tolerance * other[0]:
+                break
+            if geometries_equivalent(geometry, other, tolerance):
+                pairs.update({(thread_size_id, other_id), (other_id, thread_size_id)})
+
+    ThreadSizeEquivalence.objects.all().delete()
+    ThreadSizeEquivalence.objects.bulk_create(
+        ThreadSizeEquivalence(thread_size_id=thread_size_id, equivalent_id=equivalent_id)
+        for thread_size_id, equivalent_id in pairs
+    )
+
+
+def equivalent_thread_size_ids(names):
+    """
+    Subquery of the ids of the thread sizes equivalent to any thread size named in `names` (lowercased).
+    """
+    return ThreadSizeEquivalence.objects.alias(
+        thread_size_name_lower=Lower('thread_size__name')
+    ).filter(thread_size_name_lower__in=names).values('equivalent_id')
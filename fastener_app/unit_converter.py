@@ -116,3 +116,20 @@ def imperial_to_metric_name(imperial_size_str):
         return None
     other_values = return_all_from_imperial(match)
     return other_values.get("metric_size_str")
+
+
+def thread_geometry(thread_type, metric_size_num, imperial_size_num, thread_per_unit):
+    """
+    Return the exact (major diameter, pitch) of a thread size in millimeters, unlike the names derived
+    above which are rounded. Returns None if the size is incomplete.
+    Example: imperial 1/2-13 -> (12.7, 1.9538...), metric M12-1.75 -> (12.0, 1.75).
+    """
+    if not thread_per_unit:
+        return None
+    if str(thread_type).lower() == constants.ThreadType.IMPERIAL.value:
+        if not imperial_size_num:
+            return None
+        return imperial_size_num * constants.INCH_TO_MM, constants.INCH_TO_MM / thread_per_unit
+    if not metric_size_num:
+        return None
+    return metric_size_num, thread_per_unit
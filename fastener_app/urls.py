@@ -1,8 +1,34 @@
 from django.urls import path
-from .views import FastenerIngestView, FastenerListView, SellerCreateView
+from .views import (
+    AsyncFastenerListView,
+    FastenerIngestView,
+    FastenerListView,
+    FastenerFacetView,
+    FastenerOfferView,
+    FastenerPriceAsOfView,
+    FastenerPriceHistoryView,
+    OfferReleaseView,
+    OfferReserveView,
+    OfferStockView,
+    SellerCreateView,
+    SellerMappingView,
+    SellerOfferExportView,
+    SellerStatsView,
+)
 
 urlpatterns = [
     path('fasteners/<int:seller_id>/', FastenerIngestView.as_view(), name='fastener-ingest'),
     path('fasteners/', FastenerListView.as_view(), name='fastener-list'),
+    path('fasteners/facets/', FastenerFacetView.as_view(), name='fastener-facets'),
+    path('fasteners/<int:fastener_id>/offers/', FastenerOfferView.as_view(), name='fastener-offers'),
+    path('fasteners/<int:fastener_id>/price-history/', FastenerPriceHistoryView.as_view(), name='fastener-price-history'),
+    path('fasteners/<int:fastener_id>/price-history/as-of', FastenerPriceAsOfView.as_view(), name='fastener-price-as-of'),
+    path('offers/reserve', OfferReserveView.as_view(), name='offer-reserve'),
+    path('offers/release', OfferReleaseView.as_view(), name='offer-release'),
+    path('offers/stock', OfferStockView.as_view(), name='offer-stock'),
+    path('async/fasteners/', AsyncFastenerListView.as_view(), name='async-fastener-list'),
     path('sellers', SellerCreateView.as_view(), name='seller-create'),
+    path('sellers/<int:seller_id>/csv-mapping', SellerMappingView.as_view(), name='seller-mapping'),
+    path('sellers/<int:seller_id>/offers/export', SellerOfferExportView.as_view(), name='seller-offer-export'),
+    path('sellers/<int:seller_id>/stats', SellerStatsView.as_view(), name='seller-stats'),
 ]
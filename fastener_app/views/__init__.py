@@ -1,3 +1,9 @@
 from fastener_app.views.fastener_ingest import FastenerIngestView
 from fastener_app.views.fastener import FastenerListView
-from fastener_app.views.seller import SellerCreateView
+from fastener_app.views.fastener_async import AsyncFastenerListView
+from fastener_app.views.fastener_facet import FastenerFacetView
+from fastener_app.views.fastener_offer import FastenerOfferView
+from fastener_app.views.fastener_price_history import FastenerPriceAsOfView, FastenerPriceHistoryView
+from fastener_app.views.offer_stock import OfferReleaseView, OfferReserveView, OfferStockView
+from fastener_app.views.seller import SellerCreateView, SellerMappingView
+from fastener_app.views.seller_offer import SellerOfferExportView, SellerStatsView
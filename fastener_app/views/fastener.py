@@ -1,123 +1,477 @@
 import logging
+from django.conf import settings
+from django.db import router
 from django.db.models.functions import Lower
+from django.utils.cache import get_conditional_response
+from django.utils.decorators import method_decorator
+from django.utils.http import quote_etag
+from django.views.decorators.vary import vary_on_headers
 from rest_framework.response import Response
-from rest_framework import status
+from rest_framework import serializers, status
+from rest_framework.settings import api_settings
 from rest_framework.views import APIView
+from fastener_app.catalog_version import fastener_list_etag
+from fastener_app.dimension_cache import CACHED_DIMENSIONS, get_dimension_cache
+from fastener_app.list_cache import entry_tags, get_list_cache
 from fastener_app.models import Fastener
-from fastener_app.serializers import FastenerSerializer
+from fastener_app.renderers import ArrowRenderer, ColumnarData, CSVRenderer, MessagePackRenderer
+from fastener_app.offers import OFFER_SUMMARY_FIELDS, annotate_offer_summary
+from fastener_app.serializers import FastenerOfferSummarySerializer, FastenerSerializer
+from fastener_app.snapshot import DIMENSIONS, FILTER_DIMENSIONS, TEXT_FIELDS, get_snapshot
+from fastener_app.thread_equivalence import equivalent_thread_size_ids
 
 logger = logging.getLogger(__name__)
 
 
-class FastenerListView(APIView):
+class FastenerFilterMixin:
     """
-    GET /fasteners/ to retrieve all fasteners with optional sorting and filtering.
-    Supports sorting by 'thread_size', which sorts by 'thread_size__metric_size_num'.
-    Other sortable fields include 'material', 'finish', 'category', 'product_id', and 'description'.
-    Usage example: /fasteners/?sort=thread_size:asc&filter=material:Steel&filter=finish:plain
+    Parse the `filter=key:value` query parameters shared by the fastener read endpoints.
     """
 
-    # Define a mapping from sortable fields to ORM lookup expressions
-    SORT_FIELD_MAPPING = {
-        'thread_size': 'thread_size__metric_size_num',  # Changed to numeric field
+    FILTER_MAPPING = {
+        'thread_size': 'thread_size__name',
         'material': 'material__name',
         'finish': 'finish__name',
         'category': 'category__name',
-        'product_id': 'product_id',
         'description': 'description',
     }
 
-    FILTER_MAPPING = {
-        'material': 'material__name',
-        'finish': 'finish__name',
-        'category': 'category__name',
+    def parse_filter(self, filter_params):
+        """
+        Parse the filter parameters into {key: [lowercased values]}.
+        Raises ValueError if a filter is malformed or its key is invalid.
+        """
+        filters = {}
+        for filter_item in filter_params or []:
+            try:
+                key, value = filter_item.split(':')
+            except ValueError:
+                raise ValueError(f"Invalid filter format: '{filter_item}'. Expected format: 'key:value'.")
+
+            if key not in self.FILTER_MAPPING:
+                raise ValueError(f"Invalid filter key '{key}'.")
+
+            filters.setdefault(key, []).append(value.lower())
+
+        return filters
+
+    def get_filter(self, filter_params):
+        """
+        Build annotation and filter dictionaries from the filter parameters.
+        Raises ValueError if an invalid filter key is provided.
+        """
+        filter_dict = {}
+        annotation_dict = {}
+
+        for key, values in self.parse_filter(filter_params).items():
+            # Use Lower() for case-insensitive filtering
+            orm_field = self.FILTER_MAPPING[key]
+            annotation_dict[f"{orm_field}_lower"] = Lower(orm_field)
+            filter_dict[f"{orm_field}_lower__in"] = values
+
+        return annotation_dict, filter_dict
+
+
+class FastenerListMixin(FastenerFilterMixin):
+    """
+    Build the fastener list queryset from the `sort`, `filter`, `fields` and `offers` query parameters,
+    shared by the sync and async list views.
+    """
+
+    # Renderer formats that are fed column buffers instead of serializer output
+    COLUMNAR_FORMATS = (CSVRenderer.format, ArrowRenderer.format)
+
+    # Filter keys and sort fields the in-memory catalog snapshot indexes
+    SNAPSHOT_FILTER_KEYS = set(FILTER_DIMENSIONS)
+    SNAPSHOT_SORT_FIELDS = set(DIMENSIONS) | set(TEXT_FIELDS)
+
+    # Define a mapping from sortable fields to ORM lookup expressions
+    SORT_FIELD_MAPPING = {
+        'thread_size': 'thread_sort_key',  # Exact diameter then pitch of either system, see ThreadSize.sort_key
+        'material': 'material_name',  # Dimension names are denormalized onto fastener with a (name, id) index
+        'finish': 'finish_name',
+        'category': 'category_name',
+        'product_id': 'product_id',
         'description': 'description',
+        'price': 'best_offer__best_price',  # Cheapest in-stock offer, kept by refresh_best_offers
     }
 
-    def sort_queryset(self, queryset, sort_param):
+    def parse_sort(self, sort_param):
         """
-        Sort the queryset based on sort_param. Raises ValueError if the sort field or direction is invalid.
+        Parse a comma-separated list of 'field:direction' keys, e.g. 'material:asc,thread_size:desc',
+        into a list of (field, direction) tuples. Raises ValueError if a sort key is invalid.
         """
-        if sort_param:
+        if not sort_param:
+            return []
+
+        sort_keys = []
+        for sort_item in sort_param.split(','):
             try:
-                # Attempt to split sort_param into field and direction
-                field, direction = sort_param.split(':')
+                # Attempt to split the sort key into field and direction
+                field, direction = sort_item.split(':')
             except ValueError:
                 # Raise a ValueError if the format is incorrect
-                raise ValueError(f"Invalid sort parameter format: '{sort_param}'. Expected format: 'field:direction'.")
+                raise ValueError(f"Invalid sort parameter format: '{sort_item}'. Expected format: 'field:direction'.")
 
             if field not in self.SORT_FIELD_MAPPING:
                 raise ValueError(f"Cannot sort by field '{field}'.")
 
+            if direction not in ('asc', 'desc'):
+                raise ValueError("Invalid sort direction. Use 'asc' or 'desc'.")
+
+            if field in (sorted_field for sorted_field, _ in sort_keys):
+                raise ValueError(f"Duplicate sort field '{field}'.")
+
+            sort_keys.append((field, direction))
+
+        return sort_keys
+
+    def sort_queryset(self, queryset, sort_param):
+        """
+        Sort the queryset based on sort_param. Raises ValueError if a sort field or direction is invalid.
+        The primary key is always appended as a tie-breaker so the order is deterministic. It follows the
+        direction of the last sort key so a single-key sort can be served by a (field, id) index scan.
+        """
+        ordering = []
+        direction = 'asc'
+        for field, direction in self.parse_sort(sort_param):
             # Retrieve the actual ORM field for sorting
             orm_field = self.SORT_FIELD_MAPPING[field]
+            ordering.append(orm_field if direction == 'asc' else f'-{orm_field}')
 
-            # Determine the ordering direction
-            if direction == 'asc':
-                ordering = orm_field
-            elif direction == 'desc':
-                ordering = f'-{orm_field}'
-            else:
-                raise ValueError("Invalid sort direction. Use 'asc' or 'desc'.")
+        ordering.append('id' if direction == 'asc' else '-id')
+        return queryset.order_by(*ordering)
 
-            # Apply the ordering to the queryset
-            queryset = queryset.order_by(ordering)
+    def offers_requested(self):
+        return self.request.GET.get('offers') == 'true'
 
-        return queryset
+    def equivalents_requested(self):
+        return self.request.GET.get('equivalent') == 'true'
 
-    def get_filter(self, filter_params):
+    def expand_thread_size_filter(self, annotation_dict, filter_dict):
         """
-        Build annotation and filter dictionaries from the filter parameters.
-        Raises ValueError if an invalid filter key is provided.
+        Replace the thread_size filter, required by validate_params(), by a lookup of the thread sizes
+        equivalent to the requested ones in the thread_size_equivalence index.
         """
-        if not filter_params:
-            return {}, {}
+        lookup = f"{self.FILTER_MAPPING['thread_size']}_lower"
+        names = filter_dict.pop(f"{lookup}__in")
+        annotation_dict.pop(lookup)
+        filter_dict['thread_size_id__in'] = equivalent_thread_size_ids(names)
 
-        filter_dict = {}
-        annotation_dict = {}
+    def resolve_dimension_filters(self, annotation_dict, filter_dict):
+        """
+        Replace the name filters on dimensions by filters on the ids of the matching names in the dimension cache,
+        so filtering does not join the dimension tables.
+        """
+        for key in CACHED_DIMENSIONS:
+            lookup = f"{self.FILTER_MAPPING[key]}_lower"
+            names = filter_dict.pop(f"{lookup}__in", None)
+            if names is not None:
+                annotation_dict.pop(lookup)
+                filter_dict[f'{key}_id__in'] = get_dimension_cache().ids_named(key, names)
 
-        for filter_item in filter_params:
-            try:
-                key, value = filter_item.split(':')
-            except ValueError:
-                raise ValueError(f"Invalid filter format: '{filter_item}'. Expected format: 'key:value'.")
+    def get_serializer_class(self):
+        if self.offers_requested():
+            return FastenerOfferSummarySerializer
+        return FastenerSerializer
 
-            if key not in self.FILTER_MAPPING:
-                raise ValueError(f"Invalid filter key '{key}'.")
+    def get_fieldset(self, fields_param):
+        """
+        Parse a `fields` parameter such as 'product_id,thread_size.name' into the `fields` argument of
+        FastenerSerializer, e.g. {'product_id': None, 'thread_size': {'name'}}.
+        Returns None when no fieldset is requested. Raises ValueError on unknown fields.
+        """
+        if not fields_param:
+            return None
 
-            # Use Lower() for case-insensitive filtering
-            orm_field = self.FILTER_MAPPING[key]
-            annotation_dict[f"{orm_field}_lower"] = Lower(orm_field)
-            if f"{orm_field}_lower__in" not in filter_dict:
-                filter_dict[f"{orm_field}_lower__in"] = []
+        nested_serializers = self.get_nested_serializers()
+        fieldset = {}
+        for path in fields_param.split(','):
+            field, _, subfield = path.strip().partition('.')
+            if field not in self.get_serializer_class().Meta.fields:
+                raise ValueError(f"Invalid field '{path}'.")
 
-            filter_dict[f"{orm_field}_lower__in"].append(value.lower())
+            if not subfield:
+                fieldset[field] = None
+            elif field not in nested_serializers or subfield not in nested_serializers[field].Meta.fields:
+                raise ValueError(f"Invalid field '{path}'.")
+            elif field not in fieldset or fieldset[field] is not None:
+                # A nested field requested as a whole wins over a list of its subfields
+                fieldset.setdefault(field, set()).add(subfield)
 
-        return annotation_dict, filter_dict
+        return fieldset
 
-    def get(self, request):
+    def get_nested_serializers(self):
         """
-        Handle the GET request, apply filtering and sorting, and return the result.
+        Map each nested field of the fastener serializer to its serializer class.
         """
-        sort_param = request.GET.get('sort')
-        filter_params = request.GET.getlist('filter')
+        return {
+            name: type(field)
+            for name, field in self.get_serializer_class()._declared_fields.items()
+            if isinstance(field, serializers.BaseSerializer)
+        }
 
-        try:
-            # Process filters
-            annotation_dict, filter_dict = self.get_filter(filter_params)
+    def apply_fieldset(self, queryset, fieldset):
+        """
+        Load only the fastener columns the fieldset needs. Nested dimensions are read from the dimension cache
+        by attach_dimensions() instead of being joined.
+        """
+        if fieldset is None:
+            return queryset
+        return queryset.only(*(field for field in fieldset if field not in OFFER_SUMMARY_FIELDS))
+
+    def attach_dimensions(self, fasteners, fieldset):
+        """
+        Set the nested dimensions of the fieldset on the fasteners from the dimension cache and return them as a list.
+        """
+        nested_serializers = self.get_nested_serializers()
+        return get_dimension_cache().attach(fasteners, [
+            field for field in nested_serializers if fieldset is None or field in fieldset
+        ])
+
+    def get_columnar_lookups(self, fieldset):
+        """
+        Return the column names and values_list() lookups of the fieldset.
+        Nested fields become dotted column names, e.g. 'thread_size.name'.
+        """
+        nested_serializers = self.get_nested_serializers()
+        names, lookups = [], []
+        for field in self.get_serializer_class().Meta.fields:
+            if fieldset is not None and field not in fieldset:
+                continue
+            if field not in nested_serializers:
+                names.append(field)
+                lookups.append(field)
+                continue
+            subfields = fieldset and fieldset[field]
+            for subfield in nested_serializers[field].Meta.fields:
+                if not subfields or subfield in subfields:
+                    names.append(f"{field}.{subfield}")
+                    lookups.append(f"{field}__{subfield}")
+
+        return names, lookups
+
+    def get_columnar_query(self, fieldset):
+        """
+        Return the column names of the fieldset and the values_list() lookups of the fastener columns they are
+        read from: nested fields are read from the dimension cache through the dimension's id.
+        """
+        names, lookups = self.get_columnar_lookups(fieldset)
+        return names, list(dict.fromkeys(
+            f"{lookup.partition('__')[0]}_id" if '__' in lookup else lookup for lookup in lookups
+        ))
+
+    def get_columnar_rows(self, fieldset, rows):
+        """
+        Turn the rows read with the lookups of get_columnar_query() into rows of the fieldset's columns.
+        """
+        _, lookups = self.get_columnar_lookups(fieldset)
+        _, query_lookups = self.get_columnar_query(fieldset)
+        rows = list(rows)
+        positions = {lookup: position for position, lookup in enumerate(query_lookups)}
+        dimensions = {}
+        getters = []
+        for lookup in lookups:
+            field, _, subfield = lookup.partition('__')
+            if not subfield:
+                getters.append(lambda row, position=positions[lookup]: row[position])
+                continue
+            position = positions[f'{field}_id']
+            if field not in dimensions:
+                dimensions[field] = get_dimension_cache().rows(field, {row[position] for row in rows})
+            getters.append(lambda row, position=position, dimension=dimensions[field], subfield=subfield:
+                           getattr(dimension[row[position]], subfield))
+        return [tuple(getter(row) for getter in getters) for row in rows]
+
+    def get_columnar_data(self, queryset, fieldset):
+        """
+        Read the fieldset straight into column buffers with values_list(), skipping the serializer.
+        """
+        names, query_lookups = self.get_columnar_query(fieldset)
+        return ColumnarData.from_rows(names, self.get_columnar_rows(fieldset, queryset.values_list(*query_lookups)))
+
+    def snapshot_applicable(self):
+        """
+        Whether the request can be answered from the catalog snapshot: the snapshot is enabled and the
+        request neither asks for offers nor filters or sorts on a field the snapshot does not index.
+        """
+        if not settings.CATALOG_SNAPSHOT_ENABLED or self.offers_requested():
+            return False
+        filters = self.parse_filter(self.request.GET.getlist('filter'))
+        sort_fields = {field for field, _ in self.parse_sort(self.request.GET.get('sort'))}
+        return set(filters) <= self.SNAPSHOT_FILTER_KEYS and sort_fields <= self.SNAPSHOT_SORT_FIELDS
+
+    def get_record_fields(self, fieldset):
+        """
+        List the (field, subfields) the serializer would output for the fieldset, in serializer order.
+        Subfields are the ordered fields of a nested serializer, None for a plain field.
+        """
+        nested_serializers = self.get_nested_serializers()
+        fields = []
+        for field in self.get_serializer_class().Meta.fields:
+            if fieldset is not None and field not in fieldset:
+                continue
+            if field not in nested_serializers:
+                fields.append((field, None))
+                continue
+            subfields = fieldset and fieldset[field]
+            fields.append((field, [
+                subfield for subfield in nested_serializers[field].Meta.fields if not subfields or subfield in subfields
+            ]))
+        return fields
 
-            # Fetch the fasteners queryset with related objects
-            fasteners = Fastener.objects.select_related(
-                'thread_size', 'material', 'finish', 'category'
-            ).annotate(**annotation_dict).filter(**filter_dict)
+    def get_snapshot_data(self, fieldset, columnar):
+        """
+        Filter, sort and serialize the fasteners in memory from this process's catalog snapshot.
+        """
+        snapshot = get_snapshot()
+        rows = snapshot.query(
+            self.parse_filter(self.request.GET.getlist('filter')), self.parse_sort(self.request.GET.get('sort'))
+        )
+        if columnar:
+            names, lookups = self.get_columnar_lookups(fieldset)
+            return ColumnarData(names, (snapshot.column(lookup, rows) for lookup in lookups))
+        return snapshot.records(rows, self.get_record_fields(fieldset))
+
+    def read_list_cache(self, columnar):
+        """
+        Look the request up in the list result cache. Return (key, tag versions, cached data or None), or
+        (None, None, None) when the cache is disabled.
+        """
+        if not settings.LIST_CACHE_ENABLED:
+            return None, None, None
+        list_cache = get_list_cache()
+        key = list_cache.key(self.request.GET, 'columnar' if columnar else 'records')
+        data = list_cache.get(key)
+        if data is not None:
+            return key, None, data
+        sort_fields = {field for field, _ in self.parse_sort(self.request.GET.get('sort'))}
+        tags = entry_tags(
+            self.parse_filter(self.request.GET.getlist('filter')),
+            offers=self.offers_requested() or 'price' in sort_fields,
+            equivalent=self.equivalents_requested(),
+        )
+        return key, list_cache.tag_versions(tags), None
+
+    # Set when the list was read from a replica, which may lag behind the catalog version its ETag would carry
+    read_from_replica = False
+
+    def list_database(self, cache_key):
+        """
+        Return the database the list is read from on a cache miss and set read_from_replica. A result that
+        fills the list cache is read from the primary: stored under the current tag versions, a lagging
+        replica's result would be served until the next change to its tags.
+        """
+        primary = router.db_for_write(Fastener)
+        using = primary if cache_key is not None else router.db_for_read(Fastener)
+        self.read_from_replica = using != primary
+        return using
+
+    def write_list_cache(self, key, versions, data):
+        if key is not None:
+            get_list_cache().set(key, versions, data)
+
+    def validate_params(self):
+        """
+        Check the sort, filter, equivalent and fields parameters before the list is read from the snapshot,
+        the list cache or the database, and return the requested fieldset.
+        Raises ValueError if a filter, sort key or field is invalid.
+        """
+        self.parse_sort(self.request.GET.get('sort'))
+        filters = self.parse_filter(self.request.GET.getlist('filter'))
+        if self.equivalents_requested() and 'thread_size' not in filters:
+            raise ValueError("equivalent=true requires a thread_size filter.")
+        return self.get_fieldset(self.request.GET.get('fields'))
+
+    def build_queryset(self, fieldset):
+        """
+        Return the filtered and sorted fasteners queryset with the fieldset, for parameters checked by
+        validate_params(). Equivalent thread sizes and dimension names are only resolved here, when the list
+        is read from the database.
+        """
+        sort_param = self.request.GET.get('sort')
+        filter_params = self.request.GET.getlist('filter')
+
+        # Process filters
+        annotation_dict, filter_dict = self.get_filter(filter_params)
+        if self.equivalents_requested():
+            self.expand_thread_size_filter(annotation_dict, filter_dict)
+        self.resolve_dimension_filters(annotation_dict, filter_dict)
 
-            # Process sorting
-            fasteners = self.sort_queryset(fasteners, sort_param)
+        # Fetch the fasteners queryset with the related objects the fieldset needs
+        fasteners = self.apply_fieldset(
+            Fastener.objects.annotate(**annotation_dict).filter(**filter_dict), fieldset
+        )
+        if self.offers_requested():
+            fasteners = annotate_offer_summary(fasteners)
 
+        # Process sorting
+        return self.sort_queryset(fasteners, sort_param)
+
+
+class FastenerListView(FastenerListMixin, APIView):
+    """
+    GET /fasteners/ to retrieve all fasteners with optional sorting and filtering.
+    Supports sorting by 'thread_size', which sorts by diameter then pitch across metric and imperial sizes.
+    Other sortable fields include 'material', 'finish', 'category', 'product_id', and 'description'.
+    Usage example: /fasteners/?sort=thread_size:asc&filter=material:Steel&filter=finish:plain
+    Several sort keys can be combined, e.g. `sort=material:asc,thread_size:desc`; ties are broken by id.
+    A sparse fieldset can be requested with `fields=product_id,description,thread_size.name`; only the
+    tables and columns it needs are queried.
+    Besides JSON, the list can be rendered as MessagePack, CSV or an Arrow IPC stream, negotiated through
+    the Accept header or `format=msgpack|csv|arrow`. CSV and Arrow are built column by column from the query.
+    With `filter=thread_size:M6-1&equivalent=true` the list also includes fasteners of thread sizes from
+    either system whose diameter and pitch match within THREAD_EQUIVALENCE_TOLERANCE.
+    With `offers=true` every fastener also carries the cheapest in-stock price, the number of sellers
+    and the total quantity of its offers.
+    Responses carry an ETag tied to the catalog version, so `If-None-Match` is answered with 304
+    without touching the database. A list read from a replica carries none, as the replica may not have
+    caught up with that version yet.
+    With CATALOG_SNAPSHOT_ENABLED, requests without offers, price sorting, thread size or description
+    filters are answered from an in-memory snapshot of the catalog. Other results are cached with
+    LIST_CACHE_ENABLED, tagged by the dimension values they filter on. The X-Catalog-Source header tells
+    which was used.
+    """
+
+    renderer_classes = api_settings.DEFAULT_RENDERER_CLASSES + [MessagePackRenderer, CSVRenderer, ArrowRenderer]
+
+    @method_decorator(vary_on_headers('Accept'))
+    def get(self, request):
+        """
+        Handle the GET request, apply filtering and sorting, and return the result.
+        """
+        etag = quote_etag(fastener_list_etag(request))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = self.get_response(request)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED) and not self.read_from_replica:
+            response.headers['ETag'] = etag
+        return response
+
+    def get_response(self, request):
+        try:
+            fieldset = self.validate_params()
+            use_snapshot = self.snapshot_applicable()
         except ValueError as e:
             # Return an error response if sorting or filtering fails
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
-        # Serialize and return the sorted and filtered fasteners
-        serializer = FastenerSerializer(fasteners, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        columnar = request.accepted_renderer.format in self.COLUMNAR_FORMATS
+        if use_snapshot:
+            data = self.get_snapshot_data(fieldset, columnar)
+            return Response(data, status=status.HTTP_200_OK, headers={'X-Catalog-Source': 'snapshot'})
+
+        cache_key, tag_versions, data = self.read_list_cache(columnar)
+        if data is not None:
+            return Response(data, status=status.HTTP_200_OK, headers={'X-Catalog-Source': 'cache'})
+
+        fasteners = self.build_queryset(fieldset).using(self.list_database(cache_key))
+        if columnar:
+            data = self.get_columnar_data(fasteners, fieldset)
+        else:
+            # Serialize and return the sorted and filtered fasteners
+            data = self.get_serializer_class()(
+                self.attach_dimensions(fasteners, fieldset), many=True, fields=fieldset
+            ).data
+        self.write_list_cache(cache_key, tag_versions, data)
+        return Response(data, status=status.HTTP_200_OK, headers={'X-Catalog-Source': 'database'})
@@ -0,0 +1,100 @@
+import logging
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import quote_etag
+from django.views import View
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+from fastener_app.catalog_version import aget_catalog_version, catalog_etag
+from fastener_app.renderers import ArrowRenderer, ColumnarData, CSVRenderer, MessagePackRenderer
+from fastener_app.views.fastener import FastenerListMixin
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncFastenerListView(FastenerListMixin, View):
+    """
+    GET /async/fasteners/ serves the same list as FastenerListView (sorting, filtering, fieldsets,
+    offers mode, formats, ETags, the catalog snapshot and the list cache, with the same X-Catalog-Source
+    header) as an async view for ASGI deployments, so a request does not hold a worker thread while it
+    waits on the cache or Postgres.
+    The browsable API is not available here; the format is negotiated between JSON, MessagePack, CSV
+    and Arrow through the Accept header or `format=json|msgpack|csv|arrow`.
+    """
+
+    renderer_classes = [JSONRenderer, MessagePackRenderer, CSVRenderer, ArrowRenderer]
+
+    def select_renderer(self, request):
+        """
+        Return the renderer picked by the `format` parameter or the Accept header, or None if none matches.
+        """
+        format = request.GET.get('format')
+        if format:
+            return next((renderer() for renderer in self.renderer_classes if renderer.format == format), None)
+
+        media_type = request.get_preferred_type([renderer.media_type for renderer in self.renderer_classes])
+        return next((renderer() for renderer in self.renderer_classes if renderer.media_type == media_type), None)
+
+    def render(self, renderer, data, status_code, source=None):
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = HttpResponse(renderer.render(data, renderer.media_type), content_type=content_type,
+                                status=status_code)
+        if source is not None:
+            response.headers['X-Catalog-Source'] = source
+        return response
+
+    async def get(self, request):
+        """
+        Handle the GET request, apply filtering and sorting, and return the result.
+        """
+        renderer = self.select_renderer(request)
+        if renderer is None:
+            return self.render(
+                JSONRenderer(), {"error": "Could not satisfy the request Accept header."}, status.HTTP_406_NOT_ACCEPTABLE
+            )
+
+        etag = quote_etag(catalog_etag(await aget_catalog_version(), request.GET, renderer.media_type))
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = await self.get_response(renderer)
+        if response.status_code in (status.HTTP_200_OK, status.HTTP_304_NOT_MODIFIED) and not self.read_from_replica:
+            response.headers['ETag'] = etag
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    async def get_response(self, renderer):
+        try:
+            fieldset = self.validate_params()
+            use_snapshot = self.snapshot_applicable()
+        except ValueError as e:
+            # Return an error response if sorting or filtering fails
+            return self.render(renderer, {"error": str(e)}, status.HTTP_400_BAD_REQUEST)
+
+        columnar = renderer.format in self.COLUMNAR_FORMATS
+        if use_snapshot:
+            # Rebuilding a stale snapshot reads the catalog
+            data = await sync_to_async(self.get_snapshot_data)(fieldset, columnar)
+            return self.render(renderer, data, status.HTTP_200_OK, 'snapshot')
+
+        cache_key, tag_versions, data = await sync_to_async(self.read_list_cache)(columnar)
+        if data is not None:
+            return self.render(renderer, data, status.HTTP_200_OK, 'cache')
+
+        # Resolving dimension filters may load a dimension table, and checking the replicas' lag may query them
+        fasteners = await sync_to_async(self.build_queryset)(fieldset)
+        fasteners = fasteners.using(await sync_to_async(self.list_database)(cache_key))
+        if columnar:
+            names, lookups = self.get_columnar_query(fieldset)
+            rows = [row async for row in fasteners.values_list(*lookups)]
+            rows = await sync_to_async(self.get_columnar_rows)(fieldset, rows)
+            data = ColumnarData.from_rows(names, rows)
+        else:
+            # Nested dimensions come from the dimension cache, so serializing does not hit the database
+            fasteners = [fastener async for fastener in fasteners]
+            fasteners = await sync_to_async(self.attach_dimensions)(fasteners, fieldset)
+            data = self.get_serializer_class()(fasteners, many=True, fields=fieldset).data
+        await sync_to_async(self.write_list_cache)(cache_key, tag_versions, data)
+        return self.render(renderer, data, status.HTTP_200_OK, 'database')
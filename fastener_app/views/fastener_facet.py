@@ -0,0 +1,37 @@
+import logging
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from fastener_app.facets import get_facet_counts
+from fastener_app.views.fastener import FastenerFilterMixin
+
+logger = logging.getLogger(__name__)
+
+
+class FastenerFacetView(FastenerFilterMixin, APIView):
+    """
+    GET /fasteners/facets/ to retrieve fastener counts per material, finish, category and thread size.
+    Accepts the same filter parameters as GET /fasteners/.
+    Counts are summed from the pre-aggregated facet_count table when every filter targets a dimension
+    stored in it, otherwise they are aggregated live from the fastener table.
+    Usage example: /fasteners/facets/?filter=material:Steel&filter=finish:plain
+    """
+
+    # Filter keys that can be answered from the facet_count table
+    AGGREGATED_FILTER_KEYS = {'thread_size', 'material', 'finish', 'category'}
+
+    def get(self, request):
+        filter_params = request.GET.getlist('filter')
+
+        try:
+            annotation_dict, filter_dict = self.get_filter(filter_params)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        filter_keys = {filter_item.split(':')[0] for filter_item in filter_params}
+        live = not filter_keys <= self.AGGREGATED_FILTER_KEYS
+        if live:
+            logger.debug(f"Falling back to live facet aggregation for filters: {filter_params}")
+
+        facets = get_facet_counts(annotation_dict, filter_dict, live=live)
+        return Response(facets, status=status.HTTP_200_OK, headers={'X-Facet-Source': 'live' if live else 'aggregate'})
@@ -1,12 +1,22 @@
-import csv
 import io
 import logging
+from collections import Counter
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
 from rest_framework.parsers import MultiPartParser
+from django.db import transaction
 from django.shortcuts import get_object_or_404
-from fastener_app.models import Seller, Fastener, SellerFastener
+from django.utils import timezone
+from fastener_app.catalog_version import bump_catalog_version
+from fastener_app.facets import adjust_facet_counts, facet_key
+from fastener_app.list_cache import change_tags, invalidate_tags
+from fastener_app.mappings import compiled_mapping, current_mapping_version
+from fastener_app.models import IngestRun, Seller, Fastener, SellerFastener
+from fastener_app.offers import refresh_best_offers
+from fastener_app.price_history import record_price_history
+from fastener_app.reconciliation import RETIRE_ACTIONS, RETIRE_ZERO, retire_stale_offers
+from fastener_app.seller_stats import refresh_seller_stats
 from fastener_app.standardizers import (
     standardize_description,
     standardize_thread_size,
@@ -20,9 +30,14 @@ logger = logging.getLogger(__name__)
 
 
 class FastenerIngestView(APIView):
+    """
+    POST /fasteners/<seller_id>/ with a CSV `file` to upsert the seller's offers.
+    With `mode=full` the file is the seller's whole catalog: afterwards the seller's offers missing from it are
+    retired, by zeroing their quantity or with `retire=delete` by deleting them.
+    """
     parser_classes = [MultiPartParser]
 
-    def handle_fastener(self, standardized_data):
+    def handle_fastener(self, standardized_data, facet_deltas, changed_keys):
         # Dynamically retrieve fields from Fastener model's _meta
         fastener_fields = [
             field.name for field in Fastener._meta.get_fields()
@@ -31,8 +46,6 @@ class FastenerIngestView(APIView):
 
         # Build defaults dictionary using dictionary comprehension
         defaults = {field: standardized_data[field] for field in fastener_fields if field in standardized_data}
-        all_fasteners = Fastener.objects.all()
-        print(all_fasteners)
 
         # Create or update Fastener
         fastener, created = Fastener.objects.get_or_create(
@@ -40,18 +53,27 @@ class FastenerIngestView(APIView):
             defaults=defaults
         )
 
+        attnames = [Fastener._meta.get_field(field).attname for field in fastener_fields]
         if not created:
+            old_key = facet_key(fastener)
+            facet_deltas[old_key] -= 1
+            old_values = [getattr(fastener, attname) for attname in attnames]
             # Update existing Fastener using setattr
             for field in fastener_fields:
                 if field in standardized_data:
                     setattr(fastener, field, standardized_data[field])
             fastener.save()
+            if [getattr(fastener, attname) for attname in attnames] != old_values:
+                # Cached lists of the fastener's old dimension values may list it
+                changed_keys.update((old_key, facet_key(fastener)))
             logger.debug(f"Updated Fastener: {fastener.product_id}")
         else:
+            changed_keys.add(facet_key(fastener))
             logger.debug(f"Created Fastener: {fastener.product_id}")
+        facet_deltas[facet_key(fastener)] += 1
         return fastener
 
-    def handle_fastener_seller(self, seller, fastener, row, index):
+    def handle_fastener_seller(self, seller, fastener, row, index, ingest_run):
         # Handle price and quantity with validation
         try:
             price = float(row.get('price', '0.00'))
@@ -71,7 +93,8 @@ class FastenerIngestView(APIView):
             fastener=fastener,
             defaults={
                 'price': price,
-                'quantity': quantity
+                'quantity': quantity,
+                'last_ingest_run': ingest_run,
             }
         )
         logger.debug(f"Updated SellerFastener for Fastener: {fastener.product_id}")
@@ -83,30 +106,80 @@ class FastenerIngestView(APIView):
         if not file:
             return Response({"error": "No file provided."}, status=status.HTTP_400_BAD_REQUEST)
 
-        try:
-            csv_file = io.TextIOWrapper(file.file, encoding='utf-8')
-            reader = csv.DictReader(csv_file)
-
-            for index, row in enumerate(reader, start=1):
-                logger.debug(f"Processing row {index}: {row}")
-                standardized_data = {}
-                # Use the seller's csv_mapping to map raw CSV columns to model fields
-                csv_mapping = seller.csv_mapping  # e.g., {'field_1': 'product_id', ...}
-                mapped_data = {model_field: row.get(csv_field, '').strip() for csv_field, model_field in csv_mapping.items()}
-
-                # Standardize the mapped data
-                standardize_description(mapped_data, standardized_data)
-                standardize_thread_size(mapped_data, standardized_data)
-                standardize_material(mapped_data, standardized_data)
-                standardize_finish(mapped_data, standardized_data)
-                standardize_category(mapped_data, standardized_data)
-                standardize_product_id(mapped_data, standardized_data)
+        mode = request.data.get('mode', IngestRun.DELTA)
+        if mode not in (IngestRun.DELTA, IngestRun.FULL):
+            return Response({"error": f"Invalid mode '{mode}'. Use 'delta' or 'full'."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        retire = request.data.get('retire', RETIRE_ZERO)
+        if retire not in RETIRE_ACTIONS:
+            return Response({"error": f"Invalid retire action '{retire}'. Use 'zero' or 'delete'."},
+                            status=status.HTTP_400_BAD_REQUEST)
 
-                fastener = self.handle_fastener(standardized_data)
-                self.handle_fastener_seller(seller, fastener, mapped_data, index)
+        # Pin the mapping version current at the start, so a concurrent mapping edit cannot affect this upload
+        ingest_run = IngestRun.objects.create(seller=seller, mapping_version=current_mapping_version(seller), mode=mode)
+        mapping = compiled_mapping(ingest_run.mapping_version)
 
-            return Response({"status": "CSV data ingested successfully."}, status=status.HTTP_201_CREATED)
+        try:
+            csv_file = io.TextIOWrapper(file.file, encoding='utf-8')
+            facet_deltas = Counter()
+            fastener_ids = set()
+            # Facet keys of the fasteners this upload created or changed, and of those whose offers it wrote
+            changed_keys, offer_keys = set(), set()
+
+            with transaction.atomic():
+                # Map raw CSV columns to model fields with the pinned mapping, e.g. {'field_1': 'product_id', ...}
+                for index, mapped_data in enumerate(mapping.map_rows(csv_file), start=1):
+                    logger.debug(f"Processing row {index}: {mapped_data}")
+                    standardized_data = {}
+
+                    # Standardize the mapped data
+                    standardize_description(mapped_data, standardized_data)
+                    standardize_thread_size(mapped_data, standardized_data)
+                    standardize_material(mapped_data, standardized_data)
+                    standardize_finish(mapped_data, standardized_data)
+                    standardize_category(mapped_data, standardized_data)
+                    standardize_product_id(mapped_data, standardized_data)
+
+                    fastener = self.handle_fastener(standardized_data, facet_deltas, changed_keys)
+                    self.handle_fastener_seller(seller, fastener, mapped_data, index, ingest_run)
+                    fastener_ids.add(fastener.id)
+                    offer_keys.add(facet_key(fastener))
+                    ingest_run.row_count = index
+
+                # Append the prices and quantities this upload changed to the price history
+                record_price_history(seller.id, fastener_ids)
+                # Keep the pre-aggregated facet counts in sync with the ingested fasteners
+                adjust_facet_counts(facet_deltas)
+                # Refresh the best offers of the fasteners this upload touched
+                refresh_best_offers(fastener_ids)
+                # And the offer counts, stock and price distribution of the seller
+                refresh_seller_stats([seller.id])
+                # Invalidate conditional GETs on the catalog once the upload is visible
+                transaction.on_commit(bump_catalog_version)
+                # And the cached lists tagged with the dimension values this upload touched
+                transaction.on_commit(lambda: invalidate_tags(
+                    change_tags(changed_keys) | change_tags(offer_keys, offers_only=True)
+                ))
+
+            if mode == IngestRun.FULL:
+                # Retire the offers this upload did not write, in batches committed after the upload
+                ingest_run.retired_count = retire_stale_offers(seller.id, ingest_run.id, retire)
+                if ingest_run.retired_count:
+                    refresh_seller_stats([seller.id])
+                    bump_catalog_version()
+
+            self.finish_run(ingest_run, IngestRun.SUCCEEDED)
+            return Response({"status": "CSV data ingested successfully.", "ingest_run": ingest_run.id,
+                             "rows": ingest_run.row_count, "retired": ingest_run.retired_count},
+                            status=status.HTTP_201_CREATED)
 
         except Exception as e:
             logger.error(f"Error ingesting CSV data: {e}")
+            self.finish_run(ingest_run, IngestRun.FAILED)
             return Response({"error": "Failed to ingest CSV data."}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+    @staticmethod
+    def finish_run(ingest_run, run_status):
+        ingest_run.status = run_status
+        ingest_run.finished_at = timezone.now()
+        ingest_run.save(update_fields=['status', 'row_count', 'retired_count', 'finished_at'])
@@ -0,0 +1,34 @@
+import logging
+from django.shortcuts import get_object_or_404
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from fastener_app.models import Fastener
+from fastener_app.offers import get_offers
+from fastener_app.serializers import FastenerOffersSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class FastenerOfferView(APIView):
+    """
+    GET /fasteners/<fastener_id>/offers/ to retrieve every seller's offer for a fastener, cheapest first,
+    with the cheapest in-stock price, the number of sellers and the total quantity.
+    """
+
+    def get(self, request, fastener_id):
+        fastener = get_object_or_404(
+            Fastener.objects.select_related('thread_size', 'material', 'finish', 'category'), id=fastener_id
+        )
+        offers = list(get_offers(fastener.id))
+
+        # Every offer row carries the same window aggregates
+        summary = offers[0] if offers else None
+        serializer = FastenerOffersSerializer({
+            'fastener': fastener,
+            'min_price': summary.min_price if summary else None,
+            'seller_count': summary.seller_count if summary else 0,
+            'total_quantity': summary.total_quantity if summary else 0,
+            'offers': offers,
+        })
+        return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,83 @@
+import logging
+from django.shortcuts import get_object_or_404
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from fastener_app.models import Fastener
+from fastener_app.price_history import price_as_of, price_series
+from fastener_app.serializers import PriceHistorySerializer
+
+logger = logging.getLogger(__name__)
+
+
+class PriceHistoryParamsMixin:
+    """
+    Parsing of the seller and datetime query parameters of the price history views.
+    """
+
+    @staticmethod
+    def parse_seller(value):
+        if value is None:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValueError(f"Invalid seller '{value}'.")
+
+    @staticmethod
+    def parse_moment(name, value):
+        """
+        Parse an ISO 8601 datetime, naive values being in the current time zone.
+        """
+        if value is None:
+            return None
+        moment = parse_datetime(value)
+        if moment is None:
+            raise ValueError(f"Invalid datetime '{value}' for '{name}'.")
+        if timezone.is_naive(moment):
+            moment = timezone.make_aware(moment)
+        return moment
+
+
+class FastenerPriceHistoryView(PriceHistoryParamsMixin, APIView):
+    """
+    GET /fasteners/<fastener_id>/price-history/ to retrieve the price and quantity changes of a fastener's
+    offers in time order, optionally of one seller and within a time range.
+    Usage example: /fasteners/12/price-history/?seller=3&since=2026-01-01T00:00:00Z&until=2026-07-01T00:00:00Z
+    """
+
+    def get(self, request, fastener_id):
+        fastener = get_object_or_404(Fastener, id=fastener_id)
+        try:
+            seller_id = self.parse_seller(request.GET.get('seller'))
+            since = self.parse_moment('since', request.GET.get('since'))
+            until = self.parse_moment('until', request.GET.get('until'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        history = price_series(fastener.id, seller_id=seller_id, since=since, until=until)
+        return Response(PriceHistorySerializer(history, many=True).data)
+
+
+class FastenerPriceAsOfView(PriceHistoryParamsMixin, APIView):
+    """
+    GET /fasteners/<fastener_id>/price-history/as-of?seller=<seller_id>&at=<datetime> to retrieve the price
+    and quantity of a seller's offer as they were at a point in time.
+    """
+
+    def get(self, request, fastener_id):
+        try:
+            seller_id = self.parse_seller(request.GET.get('seller'))
+            moment = self.parse_moment('at', request.GET.get('at'))
+            if seller_id is None or moment is None:
+                raise ValueError("Both 'seller' and 'at' are required.")
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        entry = price_as_of(seller_id, fastener_id, moment)
+        if entry is None:
+            return Response({"error": "No price recorded for this offer at that time."},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response(PriceHistorySerializer(entry).data)
@@ -0,0 +1,94 @@
+import logging
+from rest_framework.parsers import JSONParser
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.views import APIView
+from fastener_app.reservations import InsufficientStock, release_stock, reserve_stock
+from fastener_app.serializers import StockLinesSerializer, StockUpdatesSerializer
+from fastener_app.stock_buffer import get_stock_buffer
+
+logger = logging.getLogger(__name__)
+
+
+class StockLinesMixin:
+    """
+    Validation of the `lines` body shared by the reserve and release views.
+    """
+    parser_classes = [JSONParser]
+
+    @staticmethod
+    def parse_lines(data):
+        """
+        Return the lines of the body as (seller_id, fastener_id, quantity) tuples, or None with the
+        serializer errors.
+        """
+        serializer = StockLinesSerializer(data=data)
+        if not serializer.is_valid():
+            return None, serializer.errors
+        return [(line['seller'], line['fastener'], line['quantity']) for line in serializer.validated_data['lines']], None
+
+    @staticmethod
+    def stock_data(stock):
+        return {"lines": [
+            {"seller": seller_id, "fastener": fastener_id, "quantity": quantity}
+            for (seller_id, fastener_id), quantity in stock.items()
+        ]}
+
+
+class OfferReserveView(StockLinesMixin, APIView):
+    """
+    POST /offers/reserve with {"lines": [{"seller": 1, "fastener": 2, "quantity": 3}, ...]} to take stock
+    from the offers, all lines or none, in one conditional UPDATE. Returns the remaining quantity of each
+    offer, or 409 with the requested and available quantity of the lines that could not be covered.
+    """
+
+    def post(self, request):
+        lines, errors = self.parse_lines(request.data)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            remaining = reserve_stock(lines)
+        except InsufficientStock as e:
+            return Response({"error": str(e), "lines": [
+                {"seller": seller_id, "fastener": fastener_id, "requested": requested, "available": available}
+                for seller_id, fastener_id, requested, available in e.lines
+            ]}, status=status.HTTP_409_CONFLICT)
+        return Response(self.stock_data(remaining))
+
+
+class OfferReleaseView(StockLinesMixin, APIView):
+    """
+    POST /offers/release with the lines of an earlier reservation to give their stock back, all lines or none.
+    Returns the new quantity of each offer.
+    """
+
+    def post(self, request):
+        lines, errors = self.parse_lines(request.data)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            stock = release_stock(lines)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(self.stock_data(stock))
+
+
+class OfferStockView(APIView):
+    """
+    POST /offers/stock with {"updates": [{"seller": 1, "fastener": 2, "quantity": 30}, ...]} to set the stock
+    of offers. Updates are coalesced per offer in this worker's write-behind buffer, the last one winning, and
+    written in batches; the response (202) reports how many were accepted and how many offers are pending.
+    """
+    parser_classes = [JSONParser]
+
+    def post(self, request):
+        serializer = StockUpdatesSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        updates = [(update['seller'], update['fastener'], update['quantity'])
+                   for update in serializer.validated_data['updates']]
+        pending = get_stock_buffer().add(updates)
+        return Response({"accepted": len(updates), "pending": pending}, status=status.HTTP_202_ACCEPTED)
@@ -3,7 +3,10 @@ from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.parsers import JSONParser
 from django.db import transaction
-from fastener_app.serializers import SellerSerializer
+from django.shortcuts import get_object_or_404
+from fastener_app.mappings import current_mapping_version, update_csv_mapping
+from fastener_app.models import Seller
+from fastener_app.serializers import SellerMappingVersionSerializer, SellerSerializer
 
 
 class SellerCreateView(APIView):
@@ -26,3 +29,24 @@ class SellerCreateView(APIView):
         else:
             # Return validation errors
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+
+class SellerMappingView(APIView):
+    """
+    GET /sellers/<seller_id>/csv-mapping to retrieve the seller's current mapping version,
+    PUT to replace the mapping with a new version. Uploads already running keep the version they started with.
+    """
+    parser_classes = [JSONParser]
+
+    def get(self, request, seller_id):
+        seller = get_object_or_404(Seller, id=seller_id)
+        return Response(SellerMappingVersionSerializer(current_mapping_version(seller)).data)
+
+    def put(self, request, seller_id):
+        get_object_or_404(Seller, id=seller_id)
+        serializer = SellerMappingVersionSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        mapping_version = update_csv_mapping(seller_id, serializer.validated_data['csv_mapping'])
+        return Response(SellerMappingVersionSerializer(mapping_version).data, status=status.HTTP_201_CREATED)
@@ -0,0 +1,69 @@
+import logging
+import pyarrow as pa
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from fastener_app.models import Seller, SellerFastener, SellerStats
+from fastener_app.renderers import ArrowRenderer, CSVRenderer, stream_arrow, stream_csv
+from fastener_app.serializers import SellerStatsSerializer
+
+logger = logging.getLogger(__name__)
+
+
+class SellerOfferExportView(APIView):
+    """
+    GET /sellers/<seller_id>/offers/export to download every offer of a seller with its fastener,
+    as CSV (default) or an Arrow IPC stream (`?format=arrow` or the Accept header).
+    Offers are read through a server-side cursor and streamed chunk by chunk, so memory use does not
+    grow with the seller's catalog.
+    """
+    renderer_classes = [CSVRenderer, ArrowRenderer]
+
+    # Column name, values_list() lookup and Arrow type of each exported column
+    EXPORT_COLUMNS = [
+        ('product_id', 'fastener__product_id', pa.string()),
+        ('description', 'fastener__description', pa.string()),
+        ('thread_size.name', 'fastener__thread_size__name', pa.string()),
+        ('material.name', 'fastener__material__name', pa.string()),
+        ('finish.name', 'fastener__finish__name', pa.string()),
+        ('category.name', 'fastener__category__name', pa.string()),
+        ('price', 'price', pa.decimal128(10, 2)),
+        ('quantity', 'quantity', pa.int64()),
+        ('last_updated', 'last_updated', pa.timestamp('us', tz='UTC')),
+    ]
+    CHUNK_SIZE = 10000
+
+    def get(self, request, seller_id):
+        seller = get_object_or_404(Seller, id=seller_id)
+        names = [name for name, _, _ in self.EXPORT_COLUMNS]
+        rows = SellerFastener.objects.filter(seller=seller).order_by('fastener_id').values_list(
+            *(lookup for _, lookup, _ in self.EXPORT_COLUMNS)
+        ).iterator(chunk_size=self.CHUNK_SIZE)
+
+        renderer = request.accepted_renderer
+        if renderer.format == 'arrow':
+            schema = pa.schema([(name, arrow_type) for name, _, arrow_type in self.EXPORT_COLUMNS])
+            content = stream_arrow(schema, rows, self.CHUNK_SIZE)
+        else:
+            content = stream_csv(names, rows, self.CHUNK_SIZE)
+
+        response = StreamingHttpResponse(content, content_type=renderer.media_type)
+        response['Content-Disposition'] = f'attachment; filename="seller-{seller.id}-offers.{renderer.format}"'
+        return response
+
+
+class SellerStatsView(APIView):
+    """
+    GET /sellers/<seller_id>/stats to retrieve the number of offers, total stock and price distribution
+    of a seller, read from the seller_stats row that ingest keeps up to date.
+    """
+
+    def get(self, request, seller_id):
+        seller = get_object_or_404(Seller.objects.select_related('stats'), id=seller_id)
+        try:
+            stats = seller.stats
+        except SellerStats.DoesNotExist:
+            # A seller without offers
+            stats = SellerStats(seller=seller)
+        return Response(SellerStatsSerializer(stats).data)
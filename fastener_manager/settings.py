@@ -27,6 +27,8 @@ MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
+    'fastener_app.middleware.primary_replica_middleware',
+    'fastener_app.middleware.dimension_cache_middleware',
     # Other middleware...
 ]
 
@@ -79,6 +81,39 @@ DATABASES = {
 
 DB_SCHEMA = "fastener_manager"
 
+# Read replicas of the default database, e.g. DB_REPLICA_HOSTS=replica-1,replica-2.
+# Read-only requests are routed to a healthy replica, writes and ingest to the primary.
+DATABASE_REPLICAS = []
+for index, host in enumerate(filter(None, os.environ.get('DB_REPLICA_HOSTS', '').split(','))):
+    DATABASES[f'replica_{index}'] = {**DATABASES['default'], 'HOST': host}
+    DATABASE_REPLICAS.append(f'replica_{index}')
+
+DATABASE_ROUTERS = ['fastener_app.db_router.PrimaryReplicaRouter']
+REPLICA_MAX_LAG = float(os.environ.get('REPLICA_MAX_LAG', '5'))  # Seconds of lag before a replica is skipped
+REPLICA_LAG_CHECK_INTERVAL = 5  # Seconds between lag checks of a replica
+READ_YOUR_WRITES_SECONDS = 10  # Seconds a client's reads stay on the primary after it wrote
+
+# Relative difference in diameter and pitch under which two thread sizes are equivalent (0.02 = 2%)
+THREAD_EQUIVALENCE_TOLERANCE = float(os.environ.get('THREAD_EQUIVALENCE_TOLERANCE', '0.02'))
+
+# Answer GET /fasteners/ from an in-memory snapshot of the catalog kept by each worker process
+CATALOG_SNAPSHOT_ENABLED = os.environ.get('CATALOG_SNAPSHOT_ENABLED', 'False') == 'True'
+
+# Cache GET /fasteners/ results of up to LIST_CACHE_MAX_ROWS fasteners for LIST_CACHE_TIMEOUT seconds, invalidated
+# by the dimension values and offers that ingests and stock updates change
+LIST_CACHE_ENABLED = os.environ.get('LIST_CACHE_ENABLED', 'True') == 'True'
+LIST_CACHE_TIMEOUT = int(os.environ.get('LIST_CACHE_TIMEOUT', '600'))
+LIST_CACHE_MAX_ROWS = int(os.environ.get('LIST_CACHE_MAX_ROWS', '10000'))
+
+# Write-behind buffer of POST /offers/stock: flush once this many offers are pending or this many seconds
+# after the first pending update, journaling accepted updates to the directory (if set) until they are written
+STOCK_BUFFER_MAX_SIZE = int(os.environ.get('STOCK_BUFFER_MAX_SIZE', '5000'))
+STOCK_BUFFER_MAX_DELAY = float(os.environ.get('STOCK_BUFFER_MAX_DELAY', '2'))
+STOCK_BUFFER_JOURNAL_DIR = os.environ.get('STOCK_BUFFER_JOURNAL_DIR', '')
+
+# Largest request body read into memory: bulk seller onboarding posts tens of thousands of sellers (~350 B each)
+DATA_UPLOAD_MAX_MEMORY_SIZE = int(os.environ.get('DATA_UPLOAD_MAX_MEMORY_SIZE', str(20 * 2 ** 20)))
+
 # Cache configuration (Redis)
 CACHES = {
     'default': {
@@ -27,6 +27,24 @@ DATABASES = {
 }
 DATABASES['default']['OPTIONS']['options'] = f"-c search_path={DB_SCHEMA},public"
 
+# A second connection to the test database standing in for a read replica. Reads are only routed
+# to it by tests that list it in DATABASE_REPLICAS.
+DATABASES['replica'] = {**DATABASES['default'], 'TEST': {'MIRROR': 'default'}}
+DATABASE_REPLICAS = []
+
+# Use an in-process cache so tests do not depend on a running Redis
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+
+# Tests read the list from the database unless they test its result cache
+LIST_CACHE_ENABLED = False
+
+# Tests flush the stock buffer explicitly rather than from its background thread
+STOCK_BUFFER_MAX_DELAY = None
+
 # Set a different secret key for testing
 SECRET_KEY = 'test-secret-key'
 